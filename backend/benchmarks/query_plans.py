@@ -0,0 +1,182 @@
+"""Query plans and timings of the hot router filters, without and with the query indexes
+
+    python -m benchmarks.query_plans [--url sqlite:///query_plans.db] [--companies 20]
+
+Point --url at a scratch database only: the tables are created and seeded with
+synthetic data, and the indexes are dropped and rebuilt between the two runs.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.engine import Connection
+
+from models.models import (
+    Base, Candidate, Interview, InterviewQuestion, InterviewSettings, Job, PublicInterviewLink, User, VideoResponse
+)
+
+# Indexes added by the add_query_indexes migration
+QUERY_INDEXES = [
+    index
+    for table in Base.metadata.sorted_tables
+    for index in table.indexes
+    if index.name in {
+        "ix_jobs_company_id_status",
+        "ix_interview_settings_job_id",
+        "ix_candidates_company_id_id",
+        "ix_candidates_company_id_status",
+        "ix_candidates_job_id_status",
+        "ix_interviews_job_id_status",
+        "ix_interviews_candidate_id",
+        "ix_interview_questions_interview_id_order_number",
+        "ix_video_responses_question_id",
+        "ix_video_responses_interview_id",
+        "ix_public_interview_links_job_id",
+    }
+]
+
+CANDIDATE_STATUSES = ["new", "reviewing", "interviewing", "hired", "rejected"]
+
+
+def queries(company_id: int, job_id: int, candidate_id: int, interview_id: int, question_id: int):
+    """Statements shaped like the ones the routers issue"""
+    return {
+        "candidates of a company (paginated)": select(Candidate.id).where(
+            Candidate.company_id == company_id
+        ).order_by(Candidate.id).limit(50),
+        "candidates of a company by status": select(Candidate.id).where(
+            Candidate.company_id == company_id, Candidate.status == "reviewing"
+        ).order_by(Candidate.id).limit(50),
+        "candidates of a job by status": select(Candidate.id).where(
+            Candidate.job_id == job_id, Candidate.status == "new"
+        ),
+        "jobs of a company by status": select(Job.id).where(
+            Job.company_id == company_id, Job.status == "active"
+        ),
+        "interviews of a job by status": select(Interview.id).where(
+            Interview.job_id == job_id, Interview.status == "completed"
+        ),
+        "interviews of a candidate": select(Interview.id).where(Interview.candidate_id == candidate_id),
+        "questions of an interview": select(InterviewQuestion.id).where(
+            InterviewQuestion.interview_id == interview_id
+        ).order_by(InterviewQuestion.order_number),
+        "response to a question": select(VideoResponse.id).where(VideoResponse.question_id == question_id),
+        "responses of an interview": select(VideoResponse.id).where(VideoResponse.interview_id == interview_id),
+        "public links of a job": select(PublicInterviewLink.id).where(PublicInterviewLink.job_id == job_id),
+        "interview settings of a job": select(InterviewSettings.id).where(InterviewSettings.job_id == job_id),
+    }
+
+
+def seed(connection: Connection, companies: int, jobs_per_company: int, candidates_per_job: int, questions: int):
+    connection.execute(insert(User), [
+        {"id": c, "email": f"company{c}@example.com", "password_hash": "x", "company_name": f"Company {c}"}
+        for c in range(1, companies + 1)
+    ])
+    job_rows, candidate_rows, interview_rows, question_rows, response_rows = [], [], [], [], []
+    settings_rows, link_rows = [], []
+    for company_id in range(1, companies + 1):
+        for _ in range(jobs_per_company):
+            job_id = len(job_rows) + 1
+            job_rows.append({
+                "id": job_id, "company_id": company_id, "title": f"Job {job_id}",
+                "status": "active" if job_id % 4 else "closed"
+            })
+            settings_rows.append({"id": job_id, "job_id": job_id})
+            link_rows.append({"id": job_id, "job_id": job_id, "name": "Careers page", "access_code": f"L{job_id}"})
+            for _ in range(candidates_per_job):
+                candidate_id = len(candidate_rows) + 1
+                candidate_rows.append({
+                    "id": candidate_id, "company_id": company_id, "job_id": job_id,
+                    "first_name": "Candidate", "last_name": str(candidate_id), "email": f"c{candidate_id}@example.com",
+                    "status": CANDIDATE_STATUSES[candidate_id % len(CANDIDATE_STATUSES)]
+                })
+                interview_id = candidate_id
+                interview_rows.append({
+                    "id": interview_id, "job_id": job_id, "candidate_id": candidate_id,
+                    "access_code": f"I{interview_id}", "status": "completed" if interview_id % 3 else "pending"
+                })
+                for order in range(1, questions + 1):
+                    question_id = len(question_rows) + 1
+                    question_rows.append({
+                        "id": question_id, "interview_id": interview_id, "question": "Why?",
+                        "question_type": "behavioral", "order_number": order
+                    })
+                    response_rows.append({
+                        "id": question_id, "interview_id": interview_id, "question_id": question_id, "transcript": "..."
+                    })
+    for model, rows in [
+        (Job, job_rows), (InterviewSettings, settings_rows), (PublicInterviewLink, link_rows),
+        (Candidate, candidate_rows), (Interview, interview_rows),
+        (InterviewQuestion, question_rows), (VideoResponse, response_rows),
+    ]:
+        connection.execute(insert(model), rows)
+
+
+def explain(connection: Connection, statement) -> str:
+    sql = str(statement.compile(connection, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return "; ".join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    return " / ".join(row[0].strip() for row in connection.execute(text(f"EXPLAIN {sql}")))
+
+
+def timing(connection: Connection, statement, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        connection.execute(statement).all()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+
+def report(connection: Connection, statements, repeat: int):
+    connection.execute(text("ANALYZE"))
+    return {
+        name: (explain(connection, statement), timing(connection, statement, repeat))
+        for name, statement in statements.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Scratch database URL (default: a temporary SQLite file)")
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--jobs-per-company", type=int, default=10)
+    parser.add_argument("--candidates-per-job", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'query_plans.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        seed(connection, args.companies, args.jobs_per_company, args.candidates_per_job, args.questions)
+
+    # Probe rows in the middle of the data set
+    company_id = args.companies // 2 or 1
+    job_id = (company_id - 1) * args.jobs_per_company + 1
+    candidate_id = (job_id - 1) * args.candidates_per_job + 1
+    statements = queries(company_id, job_id, candidate_id, candidate_id, (candidate_id - 1) * args.questions + 1)
+
+    with engine.begin() as connection:
+        for index in QUERY_INDEXES:
+            index.drop(connection)
+        before = report(connection, statements, args.repeat)
+        for index in QUERY_INDEXES:
+            index.create(connection)
+        after = report(connection, statements, args.repeat)
+
+    for name, (plan_before, ms_before) in before.items():
+        plan_after, ms_after = after[name]
+        print(name)
+        print(f"  before  {ms_before:8.3f} ms  {plan_before}")
+        print(f"  after   {ms_after:8.3f} ms  {plan_after}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
@@ -11,11 +11,23 @@ import os
 from dotenv import load_dotenv
 from pathlib import Path
 import openai
+import secrets
 
 from models import models
-from database import engine, get_db
-from routers import users, jobs, candidates, interviews, auth, videos, interview_ai, audio
+from database import async_pool_monitor, dispose_async_engine, engine, get_db
+from routers import users, jobs, candidates, interviews, auth, videos, interview_ai, audio, tasks
 from config import settings
+from utils import llm_gateway
+from utils.counters import link_counters
+from utils.db_pool import pool_monitor
+from utils.llm_cache import llm_cache
+from utils.openai_utils import single_flight
+from utils.tts_cache import tts_cache
+from utils.pdf_utils import shutdown_executor as shutdown_pdf_executor
+from utils.task_queue import TaskWorker, queue_stats
+from utils.search import ensure_search_index
+from utils.ttl_cache import response_cache
+import utils.task_handlers  # registers task handlers
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +39,7 @@ if not openai.api_key:
 
 # Create database tables if they don't exist
 models.Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
 
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = Path("uploads")
@@ -43,9 +56,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:8080"],  # Frontend origin
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],  # Explicitly list allowed methods
+    allow_methods=["GET", "HEAD", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],  # Explicitly list allowed methods
     allow_headers=["*"],  # Allows all headers
-    expose_headers=["*"],  # Expose all headers to the client
+    expose_headers=["*", "X-Next-Cursor", "Upload-Offset", "Upload-Length"],  # Wildcard is ignored for credentialed requests
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
@@ -61,12 +74,71 @@ app.include_router(interviews.router, prefix="/api/interviews", tags=["Interview
 app.include_router(videos.router, prefix="/api/videos", tags=["Videos"])
 app.include_router(interview_ai.router, prefix="/api/interview-ai", tags=["Interview AI"])
 app.include_router(audio.router, prefix="/api/audio", tags=["Audio"])
+app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
+
+# Runs queued tasks inside the API process; set TASK_QUEUE_INPROCESS_WORKERS=0
+# when dedicated workers are started with `python worker.py`
+task_worker = TaskWorker(concurrency=settings.TASK_QUEUE_INPROCESS_WORKERS)
+
+@app.on_event("startup")
+async def start_task_worker():
+    if settings.TASK_QUEUE_INPROCESS_WORKERS > 0:
+        task_worker.start()
+
+@app.on_event("shutdown")
+async def stop_task_worker():
+    await task_worker.stop()
+
+@app.on_event("startup")
+async def start_counter_flush():
+    link_counters.start()
+
+@app.on_event("shutdown")
+async def flush_counters():
+    await link_counters.stop()
+
+@app.on_event("shutdown")
+async def shutdown_llm_client():
+    await llm_gateway.close_client()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+def shutdown_pdf_extraction():
+    shutdown_pdf_executor()
 
 # Root endpoint for health check
 @app.get("/", tags=["Health"])
 def read_root():
     return {"status": "healthy", "version": "1.0.0"}
 
+def require_metrics_token(authorization: Optional[str] = Header(None)):
+    """Only monitoring that holds METRICS_TOKEN may read internal metrics"""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+@app.get("/metrics", tags=["Health"], dependencies=[Depends(require_metrics_token)])
+def read_metrics():
+    return {
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "single_flight": single_flight.stats(),
+        "tts_cache": tts_cache.stats(),
+        "task_queue": queue_stats(),
+        "response_cache": response_cache.stats(),
+        "link_counters": link_counters.stats(),
+        "db_pool": pool_monitor.stats(),
+        "db_pool_async": async_pool_monitor.stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
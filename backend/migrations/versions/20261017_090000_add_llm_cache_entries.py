@@ -0,0 +1,37 @@
+"""add_llm_cache_entries
+
+Revision ID: 3f1c2a7d9b40
+Revises: 9a397286eda6
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7d9b40'
+down_revision = '9a397286eda6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'llm_cache_entries',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(), nullable=True),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_accessed_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_llm_cache_entries_last_accessed_at', 'llm_cache_entries', ['last_accessed_at'])
+    op.create_index('ix_llm_cache_entries_expires_at', 'llm_cache_entries', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_llm_cache_entries_expires_at', table_name='llm_cache_entries')
+    op.drop_index('ix_llm_cache_entries_last_accessed_at', table_name='llm_cache_entries')
+    op.drop_table('llm_cache_entries')
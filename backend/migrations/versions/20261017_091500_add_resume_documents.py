@@ -0,0 +1,37 @@
+"""add_resume_documents
+
+Revision ID: 6b8e0d1f5a27
+Revises: 3f1c2a7d9b40
+Create Date: 2026-10-17 09:15:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b8e0d1f5a27'
+down_revision = '3f1c2a7d9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resume_documents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('extracted_text', sa.Text(), nullable=False),
+        sa.Column('structured_data', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_resume_documents_id', 'resume_documents', ['id'])
+    op.create_index('ix_resume_documents_content_hash', 'resume_documents', ['content_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_resume_documents_content_hash', table_name='resume_documents')
+    op.drop_index('ix_resume_documents_id', table_name='resume_documents')
+    op.drop_table('resume_documents')
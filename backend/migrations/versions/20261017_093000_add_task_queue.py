@@ -0,0 +1,46 @@
+"""add_task_queue
+
+Revision ID: 8c2d4e6f1a93
+Revises: 6b8e0d1f5a27
+Create Date: 2026-10-17 09:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2d4e6f1a93'
+down_revision = '6b8e0d1f5a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_queue',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('company_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_queue_status_run_after', 'task_queue', ['status', 'run_after'])
+    op.create_index(op.f('ix_task_queue_company_id'), 'task_queue', ['company_id'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_queue_company_id'), table_name='task_queue')
+    op.drop_index('ix_task_queue_status_run_after', table_name='task_queue')
+    op.drop_table('task_queue')
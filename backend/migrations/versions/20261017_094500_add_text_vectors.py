@@ -0,0 +1,42 @@
+"""add_text_vectors
+
+Revision ID: 2e7a9c4b6d18
+Revises: 8c2d4e6f1a93
+Create Date: 2026-10-17 09:45:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e7a9c4b6d18'
+down_revision = '8c2d4e6f1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'text_vectors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('dim', sa.Integer(), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('entity_type', 'entity_id', name='uq_text_vectors_entity')
+    )
+    op.create_index('ix_text_vectors_id', 'text_vectors', ['id'])
+    op.create_index('ix_text_vectors_company_id', 'text_vectors', ['company_id'])
+    op.create_index('ix_text_vectors_updated_at', 'text_vectors', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_text_vectors_updated_at', table_name='text_vectors')
+    op.drop_index('ix_text_vectors_company_id', table_name='text_vectors')
+    op.drop_index('ix_text_vectors_id', table_name='text_vectors')
+    op.drop_table('text_vectors')
@@ -0,0 +1,70 @@
+"""add_candidate_search_index
+
+Revision ID: 5d1f3b8e2c64
+Revises: 2e7a9c4b6d18
+Create Date: 2026-10-17 10:00:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1f3b8e2c64'
+down_revision = '2e7a9c4b6d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(skills, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(resume_text, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(work_experience, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(education, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX IF NOT EXISTS ix_candidates_search_vector ON candidates USING GIN (search_vector)")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                resume_text, skills, work_experience, education,
+                content='candidates', content_rowid='id'
+            )
+        """)
+        op.execute("INSERT INTO candidates_fts(candidates_fts) VALUES ('rebuild')")
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+                INSERT INTO candidates_fts(rowid, resume_text, skills, work_experience, education)
+                VALUES (new.id, new.resume_text, new.skills, new.work_experience, new.education);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+                INSERT INTO candidates_fts(candidates_fts, rowid, resume_text, skills, work_experience, education)
+                VALUES ('delete', old.id, old.resume_text, old.skills, old.work_experience, old.education);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE ON candidates BEGIN
+                INSERT INTO candidates_fts(candidates_fts, rowid, resume_text, skills, work_experience, education)
+                VALUES ('delete', old.id, old.resume_text, old.skills, old.work_experience, old.education);
+                INSERT INTO candidates_fts(rowid, resume_text, skills, work_experience, education)
+                VALUES (new.id, new.resume_text, new.skills, new.work_experience, new.education);
+            END
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_candidates_search_vector")
+        op.execute("ALTER TABLE candidates DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS candidates_fts_insert")
+        op.execute("DROP TABLE IF EXISTS candidates_fts")
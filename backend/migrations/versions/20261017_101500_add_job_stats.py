@@ -0,0 +1,43 @@
+"""add_job_stats
+
+Revision ID: 7a4c1e9d3b52
+Revises: 5d1f3b8e2c64
+Create Date: 2026-10-17 10:15:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4c1e9d3b52'
+down_revision = '5d1f3b8e2c64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are filled in lazily by recomputing a job's counts on first read
+    op.create_table(
+        'job_stats',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('candidates_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('candidates_new', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('candidates_reviewing', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('candidates_interviewing', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('candidates_hired', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('candidates_rejected', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('interviews_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('interviews_pending', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('interviews_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_job_stats_company_id', 'job_stats', ['company_id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_stats_company_id', table_name='job_stats')
+    op.drop_table('job_stats')
@@ -0,0 +1,46 @@
+"""add_query_indexes
+
+Revision ID: 9b2e6f4a1c73
+Revises: 7a4c1e9d3b52
+Create Date: 2026-10-17 10:30:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2e6f4a1c73'
+down_revision = '7a4c1e9d3b52'
+branch_labels = None
+depends_on = None
+
+
+# Matched to the router filters: company-scoped listings with optional status,
+# per-job candidate and interview lookups, and the per-interview question and
+# response joins
+INDEXES = [
+    ('ix_jobs_company_id_status', 'jobs', ['company_id', 'status']),
+    ('ix_interview_settings_job_id', 'interview_settings', ['job_id']),
+    ('ix_candidates_company_id_id', 'candidates', ['company_id', 'id']),
+    ('ix_candidates_company_id_status', 'candidates', ['company_id', 'status']),
+    ('ix_candidates_job_id_status', 'candidates', ['job_id', 'status']),
+    ('ix_interviews_job_id_status', 'interviews', ['job_id', 'status']),
+    ('ix_interviews_candidate_id', 'interviews', ['candidate_id']),
+    ('ix_interview_questions_interview_id_order_number', 'interview_questions', ['interview_id', 'order_number']),
+    ('ix_video_responses_question_id', 'video_responses', ['question_id']),
+    ('ix_video_responses_interview_id', 'video_responses', ['interview_id']),
+    ('ix_public_interview_links_job_id', 'public_interview_links', ['job_id']),
+]
+
+
+def upgrade():
+    # Built concurrently on Postgres so the tables stay writable meanwhile
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,94 @@
+"""cascade_job_deletes
+
+Revision ID: 3f8d2a6c9e41
+Revises: 9b2e6f4a1c73
+Create Date: 2026-10-17 10:45:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8d2a6c9e41'
+down_revision = '9b2e6f4a1c73'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, referred table, previous ON DELETE) of every foreign key below a job
+FOREIGN_KEYS = [
+    ('interview_settings', 'job_id', 'jobs', None),
+    ('candidates', 'job_id', 'jobs', None),
+    ('interviews', 'job_id', 'jobs', None),
+    ('interviews', 'candidate_id', 'candidates', None),
+    ('interview_questions', 'interview_id', 'interviews', None),
+    ('video_responses', 'interview_id', 'interviews', None),
+    ('video_responses', 'question_id', 'interview_questions', None),
+    ('public_interview_links', 'job_id', 'jobs', 'CASCADE'),
+    ('job_stats', 'job_id', 'jobs', None),
+]
+
+# SQLite reports its foreign keys unnamed; batch mode names them by this convention
+SQLITE_NAMING_CONVENTION = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+
+
+def _postgresql_foreign_key_name(bind, table, column, referred_table):
+    if op.get_context().as_sql:
+        # Offline mode cannot inspect; assume Postgres' default constraint name
+        return f'{table}_{column}_fkey'
+    for foreign_key in sa.inspect(bind).get_foreign_keys(table):
+        if foreign_key['constrained_columns'] == [column] and foreign_key['referred_table'] == referred_table:
+            return foreign_key['name']
+    return f'{table}_{column}_fkey'
+
+
+def _set_ondelete(ondelete_for):
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        constraints = []
+        for table, column, referred_table, previous in FOREIGN_KEYS:
+            ondelete = ondelete_for(previous)
+            action = f' ON DELETE {ondelete}' if ondelete else ''
+            name = _postgresql_foreign_key_name(bind, table, column, referred_table)
+            # NOT VALID skips the full-table check under the exclusive lock
+            op.execute(
+                f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, '
+                f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referred_table} (id){action} NOT VALID'
+            )
+            constraints.append((table, name))
+        # Committing first releases those locks; VALIDATE only takes a lock
+        # that lets writes continue while it scans
+        with op.get_context().autocommit_block():
+            for table, name in constraints:
+                op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+    elif bind.dialect.name == 'sqlite':
+        tables = []
+        for table, _, _, _ in FOREIGN_KEYS:
+            if table not in tables:
+                tables.append(table)
+        for table in tables:
+            # Recreating the table drops its triggers (e.g. the candidate search index)
+            triggers = bind.execute(
+                sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"),
+                {'table': table}
+            ).scalars().all()
+            with op.batch_alter_table(table, recreate='always', naming_convention=SQLITE_NAMING_CONVENTION) as batch_op:
+                for fk_table, column, referred_table, previous in FOREIGN_KEYS:
+                    if fk_table != table:
+                        continue
+                    name = f'fk_{table}_{column}_{referred_table}'
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                    batch_op.create_foreign_key(name, referred_table, [column], ['id'], ondelete=ondelete_for(previous))
+            for trigger in triggers:
+                op.execute(trigger)
+
+
+def upgrade():
+    _set_ondelete(lambda previous: 'CASCADE')
+
+
+def downgrade():
+    _set_ondelete(lambda previous: previous)
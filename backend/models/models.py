@@ -1,4 +1,10 @@
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON, Table
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, JSON, Table,
+    UniqueConstraint
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -64,18 +70,23 @@ class Job(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_jobs_company_id_status", "company_id", "status"),
+    )
+
     # Relationships
+    # Children are removed by ON DELETE CASCADE, so deleting a job never loads them
     company = relationship("User", back_populates="jobs")
-    candidates = relationship("Candidate", back_populates="job")
-    interviews = relationship("Interview", back_populates="job")
-    settings = relationship("InterviewSettings", back_populates="job", uselist=False)
-    public_links = relationship("PublicInterviewLink", back_populates="job", cascade="all, delete-orphan")
+    candidates = relationship("Candidate", back_populates="job", passive_deletes="all")
+    interviews = relationship("Interview", back_populates="job", passive_deletes="all")
+    settings = relationship("InterviewSettings", back_populates="job", uselist=False, passive_deletes="all")
+    public_links = relationship("PublicInterviewLink", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
 
 class InterviewSettings(Base):
     __tablename__ = "interview_settings"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     include_technical = Column(Boolean, default=True)
     include_behavioral = Column(Boolean, default=True)
     include_problem_solving = Column(Boolean, default=True)
@@ -85,6 +96,10 @@ class InterviewSettings(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_interview_settings_job_id", "job_id"),
+    )
+
     # Relationships
     job = relationship("Job", back_populates="settings")
 
@@ -93,7 +108,7 @@ class Candidate(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    job_id = Column(Integer, ForeignKey("jobs.id"))
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"))
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     email = Column(String, nullable=False)
@@ -112,17 +127,24 @@ class Candidate(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Company listings are paginated on id
+        Index("ix_candidates_company_id_id", "company_id", "id"),
+        Index("ix_candidates_company_id_status", "company_id", "status"),
+        Index("ix_candidates_job_id_status", "job_id", "status"),
+    )
+
     # Relationships
     company = relationship("User", back_populates="candidates")
     job = relationship("Job", back_populates="candidates")
-    interviews = relationship("Interview", back_populates="candidate")
+    interviews = relationship("Interview", back_populates="candidate", passive_deletes="all")
 
 class Interview(Base):
     __tablename__ = "interviews"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
     status = Column(String, default="pending")  # pending, completed, cancelled
     access_code = Column(String, unique=True, index=True, nullable=False)
     scheduled_at = Column(DateTime)
@@ -132,32 +154,41 @@ class Interview(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_interviews_job_id_status", "job_id", "status"),
+        Index("ix_interviews_candidate_id", "candidate_id"),
+    )
+
     # Relationships
     job = relationship("Job", back_populates="interviews")
     candidate = relationship("Candidate", back_populates="interviews")
-    questions = relationship("InterviewQuestion", back_populates="interview", cascade="all, delete-orphan")
-    video_responses = relationship("VideoResponse", back_populates="interview", cascade="all, delete-orphan")
+    questions = relationship("InterviewQuestion", back_populates="interview", cascade="all, delete-orphan", passive_deletes=True)
+    video_responses = relationship("VideoResponse", back_populates="interview", cascade="all, delete-orphan", passive_deletes=True)
 
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False)
     question = Column(Text, nullable=False)
     question_type = Column(String, nullable=False)  # technical, behavioral, problem_solving, custom
     order_number = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=func.now())
 
+    __table_args__ = (
+        Index("ix_interview_questions_interview_id_order_number", "interview_id", "order_number"),
+    )
+
     # Relationships
     interview = relationship("Interview", back_populates="questions")
-    video_response = relationship("VideoResponse", back_populates="question", uselist=False)
+    video_response = relationship("VideoResponse", back_populates="question", uselist=False, passive_deletes="all")
 
 class VideoResponse(Base):
     __tablename__ = "video_responses"
 
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
-    question_id = Column(Integer, ForeignKey("interview_questions.id"), nullable=False)
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"), nullable=False)
     video_url = Column(String)
     transcript = Column(Text)
     score = Column(Float)
@@ -165,6 +196,11 @@ class VideoResponse(Base):
     duration = Column(Integer)  # in seconds
     created_at = Column(DateTime, default=func.now())
 
+    __table_args__ = (
+        Index("ix_video_responses_question_id", "question_id"),
+        Index("ix_video_responses_interview_id", "interview_id"),
+    )
+
     # Relationships
     interview = relationship("Interview", back_populates="video_responses")
     question = relationship("InterviewQuestion", back_populates="video_response")
@@ -173,7 +209,7 @@ class PublicInterviewLink(Base):
     __tablename__ = "public_interview_links"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     access_code = Column(String, unique=True, index=True, nullable=False)
     is_active = Column(Boolean, default=True)
@@ -184,5 +220,85 @@ class PublicInterviewLink(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_public_interview_links_job_id", "job_id"),
+    )
+
     # Relationships
     job = relationship("Job", back_populates="public_links")
+
+class ResumeDocument(Base):
+    __tablename__ = "resume_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    extracted_text = Column(Text, nullable=False)
+    structured_data = Column(Text)  # JSON returned by the structuring step
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    last_accessed_at = Column(DateTime, default=func.now(), index=True)
+    expires_at = Column(DateTime, index=True)
+
+class QueuedTask(Base):
+    __tablename__ = "task_queue"
+
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON)
+    # Company allowed to read the task; system tasks (e.g. file cleanup) have none
+    company_id = Column(Integer, index=True)
+    status = Column(String, default="queued", nullable=False)  # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=func.now())
+    locked_by = Column(String)
+    locked_at = Column(DateTime)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_task_queue_status_run_after", "status", "run_after"),
+    )
+
+class TextVector(Base):
+    __tablename__ = "text_vectors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(16), nullable=False)  # candidate, job
+    entity_id = Column(Integer, nullable=False)
+    company_id = Column(Integer, nullable=False, index=True)
+    text_hash = Column(String(64), nullable=False)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # Sparse hashed n-gram term frequencies: int32 buckets, then float16 weights
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("entity_type", "entity_id", name="uq_text_vectors_entity"),
+    )
+
+class JobStats(Base):
+    __tablename__ = "job_stats"
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    company_id = Column(Integer, nullable=False, index=True)
+    candidates_total = Column(Integer, default=0, nullable=False)
+    candidates_new = Column(Integer, default=0, nullable=False)
+    candidates_reviewing = Column(Integer, default=0, nullable=False)
+    candidates_interviewing = Column(Integer, default=0, nullable=False)
+    candidates_hired = Column(Integer, default=0, nullable=False)
+    candidates_rejected = Column(Integer, default=0, nullable=False)
+    interviews_total = Column(Integer, default=0, nullable=False)
+    interviews_pending = Column(Integer, default=0, nullable=False)
+    interviews_completed = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,17 +1,30 @@
 import base64
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from utils import openai_utils
 
 router = APIRouter()
 
+# Content types for the audio formats the TTS service can stream
+AUDIO_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+}
+
 class TextToSpeechData(BaseModel):
     text: str
 
+class StreamTextToSpeechData(TextToSpeechData):
+    format: str = "mp3"
+
 @router.post("/text-to-speech")
 async def text_to_speech(text_to_speech_data: TextToSpeechData):
     try:
-        speech_file = openai_utils.text_to_speech(text=text_to_speech_data.text)
+        speech_file = await openai_utils.text_to_speech(text=text_to_speech_data.text)
         audio_base64 = ""
         if speech_file:
             audio_base64 = base64.b64encode(speech_file.read()).decode("utf-8")
@@ -19,3 +32,40 @@ async def text_to_speech(text_to_speech_data: TextToSpeechData):
         return {"audio_base64": audio_base64}
     except Exception:
         raise HTTPException(status_code=500, detail="unexpected error occurred")
+
+@router.post("/text-to-speech/stream")
+async def stream_text_to_speech(text_to_speech_data: StreamTextToSpeechData):
+    """Stream synthesized speech as binary audio so playback can start on the first chunk"""
+    media_type = AUDIO_MEDIA_TYPES.get(text_to_speech_data.format)
+    if not media_type:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported audio format. Use one of: {', '.join(AUDIO_MEDIA_TYPES)}"
+        )
+
+    audio_stream = openai_utils.stream_text_to_speech(
+        text=text_to_speech_data.text,
+        response_format=text_to_speech_data.format
+    )
+
+    # Pull the first chunk before responding so upstream failures still
+    # produce a proper error status instead of a truncated 200
+    try:
+        first_chunk = await audio_stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except Exception:
+        await audio_stream.aclose()
+        raise HTTPException(status_code=500, detail="unexpected error occurred")
+
+    async def body():
+        if first_chunk:
+            yield first_chunk
+        async for chunk in audio_stream:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-store"}
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Query, UploadFile, File, Form, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import os
@@ -10,12 +10,22 @@ from datetime import datetime
 import json
 
 from database import get_db
-from schemas.candidates import CandidateCreate, CandidateResponse, CandidateUpdate, ResumeAnalysis
+from schemas.candidates import CandidateCreate, CandidateResponse, CandidateSearchResponse, CandidateUpdate, ResumeAnalysis
 from schemas.interviews import InterviewCreate, InterviewResponse
-from models.models import User, Candidate, Job, Interview, InterviewQuestion, InterviewSettings
+from models.models import User, Candidate, Job, Interview, InterviewQuestion, InterviewSettings, QueuedTask
 from utils.auth import get_current_user
 from utils.file_utils import generate_unique_filename, RESUME_DIR
-from utils.openai_utils import analyze_resume_match, generate_interview_questions, extract_resume_details
+from utils.job_stats import invalidate_job_stats
+from utils.openai_utils import analyze_resume_match, generate_interview_questions
+from utils.resume_utils import candidate_from_analysis, get_resume_details, resume_analysis_response
+from utils.bulk_ingest import bulk_status, remove_saved_files, save_bulk_upload
+from utils.tts_presynthesis import presynthesize_interview_audio
+from utils.task_queue import enqueue, task_accepted
+from utils.pagination import (
+    load_columns, paginate, projected_response, schema_columns, select_fields, set_next_cursor
+)
+from utils.search import search_candidates
+from utils.vector_index import best_jobs_for_candidate, index_candidate, remove_vectors
 
 router = APIRouter()
 
@@ -59,8 +69,12 @@ async def create_candidate(
 
 @router.get("/", response_model=List[CandidateResponse])
 async def get_candidates(
+    response: Response,
     status: Optional[str] = Query(None),
     job_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at MAX_PAGE_SIZE; without limit or cursor every row is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -83,9 +97,42 @@ async def get_candidates(
             )
         query = query.filter(Candidate.job_id == job_id)
     
-    candidates = query.all()
+    # Only load the requested columns; resume text and parsed details stay in the database
+    columns = select_fields(Candidate, CandidateResponse, fields)
+    query = query.options(load_columns(Candidate, columns or schema_columns(Candidate, CandidateResponse)))
+    candidates, next_cursor = paginate(query, Candidate.id, limit, cursor)
+    
+    if columns:
+        return projected_response(
+            [{column: getattr(candidate, column) for column in columns} for candidate in candidates],
+            next_cursor
+        )
+    set_next_cursor(response, next_cursor)
     return candidates
 
+@router.get("/search", response_model=CandidateSearchResponse)
+async def search_candidates_endpoint(
+    q: str = Query(..., min_length=1, description='Search terms; supports "exact phrases", OR and -exclusions'),
+    job_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    skills: Optional[List[str]] = Query(None, description="Only candidates with all of these skills"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over candidate resumes, skills, experience and education"""
+    return search_candidates(
+        db,
+        current_user.id,
+        q,
+        job_id=job_id,
+        status=status,
+        skills=skills,
+        page=page,
+        page_size=page_size
+    )
+
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: int,
@@ -104,6 +151,39 @@ async def get_candidate(
         )
     return candidate
 
+@router.get("/{candidate_id}/matching-jobs")
+async def get_matching_jobs(
+    candidate_id: int,
+    k: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Find the company's jobs that best match a candidate's resume"""
+    candidate = db.query(Candidate).filter(
+        Candidate.id == candidate_id,
+        Candidate.company_id == current_user.id
+    ).first()
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    
+    matches = best_jobs_for_candidate(db, candidate, k=k)
+    return {
+        "candidate_id": candidate_id,
+        "jobs": [
+            {
+                "job_id": job.id,
+                "title": job.title,
+                "department": job.department,
+                "status": job.status,
+                "relevance_score": score
+            }
+            for job, score in matches
+        ]
+    }
+
 @router.put("/{candidate_id}", response_model=CandidateResponse)
 async def update_candidate(
     candidate_id: int,
@@ -148,6 +228,7 @@ async def update_candidate(
             )
         candidate.job_id = candidate_update.job_id
     
+    index_candidate(db, candidate)
     db.commit()
     db.refresh(candidate)
     return candidate
@@ -169,8 +250,12 @@ async def delete_candidate(
             detail="Candidate not found"
         )
     
-    # Delete associated interviews
-    db.query(Interview).filter(Interview.candidate_id == candidate_id).delete()
+    # Delete associated interviews; bulk deletes bypass the stats listener
+    interviews = db.query(Interview).filter(Interview.candidate_id == candidate_id)
+    invalidate_job_stats(db, [job_id for (job_id,) in interviews.with_entities(Interview.job_id).distinct()])
+    interviews.delete()
+    
+    remove_vectors(db, "candidate", [candidate_id])
     
     # Delete the candidate
     db.delete(candidate)
@@ -203,8 +288,8 @@ async def upload_resume(
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
-        # Extract resume text and details
-        resume_text = await extract_resume_details(file_path)
+        # Extract resume text and details (reused if this file was seen before)
+        resume_text, _ = await get_resume_details(db, file_path)
         resume_data = json.loads(resume_text)
         
         # Split name into first and last name
@@ -251,6 +336,8 @@ async def upload_resume(
             candidate.education = json.dumps(resume_data.get("education", []))
             candidate.skills = json.dumps(resume_data.get("skills", {}))
         
+        db.flush()
+        index_candidate(db, candidate)
         db.commit()
         db.refresh(candidate)
         
@@ -271,6 +358,72 @@ async def upload_resume(
             detail=f"Error uploading resume: {str(e)}"
         )
 
+@router.post("/bulk-upload", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_upload_resumes(
+    files: List[UploadFile] = File(...),
+    job_id: int = Form(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Upload many resumes (PDFs or zip archives of PDFs) for a job and ingest them in the background"""
+    job = db.query(Job).filter(
+        Job.id == job_id,
+        Job.company_id == current_user.id
+    ).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    try:
+        saved = await save_bulk_upload(files)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error reading uploaded files: {str(e)}"
+        )
+    
+    try:
+        task = enqueue(db, "bulk_ingest", {
+            "job_id": job_id,
+            "company_id": current_user.id,
+            "files": saved
+        }, company_id=current_user.id)
+    except Exception:
+        remove_saved_files(saved)
+        raise
+    
+    return {
+        "handle": task.id,
+        "status_url": f"/api/candidates/bulk-upload/{task.id}",
+        "total": len(saved)
+    }
+
+@router.get("/bulk-upload/{handle}")
+async def get_bulk_upload_status(
+    handle: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get progress and per-file status of a bulk resume upload"""
+    task = db.query(QueuedTask).filter(
+        QueuedTask.id == handle,
+        QueuedTask.kind == "bulk_ingest",
+        QueuedTask.company_id == current_user.id
+    ).first()
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bulk upload not found"
+        )
+    return bulk_status(db, task)
+
 @router.post("/resume-upload-url")
 async def get_resume_upload_url(
     filename: str,
@@ -288,6 +441,7 @@ async def get_resume_upload_url(
 async def analyze_resume(
     resume_url: str = Body(...),
     job_id: int = Body(...),
+    background: bool = Query(False, description="Queue the analysis and return a task id"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -309,10 +463,18 @@ async def analyze_resume(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Resume file not found"
             )
+
+        if background:
+            task = enqueue(db, "resume_analysis", {
+                "resume_url": resume_url,
+                "job_id": job_id,
+                "company_id": current_user.id
+            }, company_id=current_user.id)
+            return task_accepted(task)
         
-        # Extract resume details using AI
+        # Extract resume details using AI, reusing stored text and results for known files
         try:
-            resume_details = await extract_resume_details(resume_path)
+            resume_details, _ = await get_resume_details(db, resume_path)
             resume_data = json.loads(resume_details)
         except json.JSONDecodeError as e:
             raise HTTPException(
@@ -344,64 +506,15 @@ async def analyze_resume(
                 detail=f"Failed to analyze resume match: {str(e)}"
             )
 
-        # Split name into first and last name
-        name_parts = resume_data.get("name", "").split(" ", 1)
-        first_name = name_parts[0] if name_parts else ""
-        last_name = name_parts[1] if len(name_parts) > 1 else ""
-
         # Create candidate with extracted details
-        candidate_data = {
-            "first_name": first_name,
-            "last_name": last_name,
-            "email": resume_data.get("email", ""),
-            "phone": resume_data.get("phone", ""),
-            "location": resume_data.get("location", ""),
-            "linkedin_url": resume_data.get("linkedin", ""),
-            "portfolio_url": resume_data.get("portfolio", ""),
-            "resume_url": resume_url,
-            "resume_text": resume_data.get("resume_text", ""),
-            "work_experience": json.dumps(resume_data.get("work_experience", [])),
-            "education": json.dumps(resume_data.get("education", [])),
-            "skills": json.dumps(resume_data.get("skills", {})),
-            "resume_match_score": match_data.get("match_score", 0),
-            "resume_match_feedback": match_data.get("feedback", ""),
-            "job_id": job_id,
-            "company_id": current_user.id,
-            "status": "new",
-            "created_at": datetime.utcnow()
-        }
-
-        # Create new candidate
-        db_candidate = Candidate(**candidate_data)
+        db_candidate = candidate_from_analysis(resume_url, resume_data, match_data, job_id, current_user.id)
         db.add(db_candidate)
+        db.flush()
+        index_candidate(db, db_candidate)
         db.commit()
         db.refresh(db_candidate)
 
-        return {
-            "candidate": {
-                "id": db_candidate.id,
-                "name": f"{db_candidate.first_name} {db_candidate.last_name}",
-                "email": db_candidate.email,
-                "phone": db_candidate.phone,
-                "location": db_candidate.location,
-                "linkedin_url": db_candidate.linkedin_url,
-                "portfolio_url": db_candidate.portfolio_url,
-                "resume_url": db_candidate.resume_url,
-                "work_experience": json.loads(db_candidate.work_experience),
-                "education": json.loads(db_candidate.education),
-                "skills": json.loads(db_candidate.skills),
-                "resume_match_score": db_candidate.resume_match_score,
-                "resume_match_feedback": db_candidate.resume_match_feedback,
-                "status": db_candidate.status,
-                "created_at": db_candidate.created_at
-            },
-            "match_analysis": {
-                "match_score": match_data.get("match_score", 0),
-                "strengths": match_data.get("strengths", []),
-                "improvements": match_data.get("improvements", []),
-                "feedback": match_data.get("feedback", "")
-            }
-        }
+        return resume_analysis_response(db_candidate, match_data)
 
     except HTTPException:
         raise
@@ -468,6 +581,7 @@ async def analyze_candidate_resume(
 async def invite_candidate_to_interview(
     candidate_id: int,
     job_id: int,
+    background_tasks: BackgroundTasks,
     scheduled_at: Optional[datetime] = Body(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -548,7 +662,7 @@ async def invite_candidate_to_interview(
             job_description=job.description,
             resume_text=resume_text,
             question_types=question_types,
-            count=5  # Generate 5 questions by default
+            max_questions=5  # Generate 5 questions by default
         )
         
         # Add questions to the interview
@@ -571,6 +685,9 @@ async def invite_candidate_to_interview(
     candidate.status = "interviewing"
     db.commit()
     
+    # Render question audio ahead of time so the live interview never waits on TTS
+    background_tasks.add_task(presynthesize_interview_audio, interview.id)
+    
     # Create an interview URL that can be shared with the candidate
     base_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
     interview_url = f"{base_url}/interview/{access_code}"
@@ -1,17 +1,18 @@
 import base64
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List, Optional, Union, Dict
-import openai
 from datetime import datetime
 from pydantic import BaseModel
 import os
 import tempfile
 import logging
 from dotenv import load_dotenv
-import httpx
 from utils.audio_utils import prepare_audio_file
-from database import get_db
+from utils import llm_gateway
+from database import get_async_db
 from models.models import Interview, InterviewQuestion, Candidate, Job
 from utils.openai_utils import (
     generate_interview_questions,
@@ -31,12 +32,6 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-openai_client = openai.AsyncOpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    http_client=httpx.AsyncClient()
-)
-
 # Create audio directory if it doesn't exist
 AUDIO_DIR = "audio_files"
 os.makedirs(AUDIO_DIR, exist_ok=True)
@@ -72,49 +67,62 @@ class ProcessResponseRequest(BaseModel):
 class TTSRequest(BaseModel):
     text: str
 
+async def get_interview_with_job(db: AsyncSession, interview_id: Union[str, int]) -> Interview:
+    """Load an interview with its job and candidate in one query"""
+    try:
+        interview_id = int(interview_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    result = await db.execute(
+        select(Interview).options(
+            joinedload(Interview.job),
+            joinedload(Interview.candidate)
+        ).where(Interview.id == interview_id)
+    )
+    interview = result.scalars().first()
+    if not interview:
+        logger.error(f"Interview not found: {interview_id}")
+        raise HTTPException(status_code=404, detail="Interview not found")
+    if not interview.job:
+        logger.error(f"Job not found for interview {interview_id}")
+        raise HTTPException(status_code=404, detail="Job not found")
+    # End the read transaction so the connection is back in the pool while the LLM call runs
+    await db.commit()
+    return interview
+
 @router.post("/generate-question")
-def generate_question(
+async def generate_question(
     job_description: str = Body(...),
     resume_text: str = Body(...),
     question_types: List[str] = Body(...),
     max_questions: int = Body(...),
     interview_id: Union[str, int] = Body(...),
     conversation_history: Optional[List[dict]] = Body(default=None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate the next interview question"""
     try:
         logger.info(f"Generating question for interview {interview_id}")
         
-        # Convert interview_id to string if it's an integer
-        interview_id_str = str(interview_id)
-        
         # Get interview details
-        interview = db.query(Interview).filter(Interview.id == interview_id_str).first()
-        if not interview:
-            logger.error(f"Interview not found: {interview_id_str}")
-            raise HTTPException(status_code=404, detail="Interview not found")
-
-        job = db.query(Job).filter(Job.id == interview.job_id).first()
-        if not job:
-            logger.error(f"Job not found for interview {interview_id_str}")
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        candidate = db.query(Candidate).filter(Candidate.id == interview.candidate_id).first()
-        if not candidate:
-            logger.error(f"Candidate not found for interview {interview_id_str}")
+        interview = await get_interview_with_job(db, interview_id)
+        job = interview.job
+        if not interview.candidate:
+            logger.error(f"Candidate not found for interview {interview_id}")
             raise HTTPException(status_code=404, detail="Candidate not found")
 
+        generation_args = {
+            "job_title": job.title,
+            "job_description": job_description,
+            "resume_text": resume_text,
+            "question_types": question_types,
+            "max_questions": max_questions,
+            "conversation_history": conversation_history
+        }
         logger.info(f"Generating questions for job: {job.title}")
         # Generate question
-        questions = generate_interview_questions(
-            job_title=job.title,
-            job_description=job_description,
-            resume_text=resume_text,
-            question_types=question_types,
-            max_questions=max_questions,
-            conversation_history=conversation_history
-        )
+        questions = await generate_interview_questions(**generation_args)
 
         if not questions:
             logger.error("No questions generated")
@@ -132,30 +140,21 @@ def generate_question(
         )
 
 @router.post("/process-response")
-def process_response(
+async def process_response(
     request: ProcessResponseRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Process the candidate's response"""
     try:
-        # Convert interview_id to string if it's an integer
-        interview_id_str = str(request.interviewId)
-        
         # Get interview details
-        interview = db.query(Interview).filter(Interview.id == interview_id_str).first()
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
-
-        job = db.query(Job).filter(Job.id == interview.job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        candidate = db.query(Candidate).filter(Candidate.id == interview.candidate_id).first()
+        interview = await get_interview_with_job(db, request.interviewId)
+        job = interview.job
+        candidate = interview.candidate
         if not candidate:
             raise HTTPException(status_code=404, detail="Candidate not found")
 
         # Process response
-        result = process_interview_response(
+        result = await process_interview_response(
             response=request.response,
             job_title=job.title,
             job_description=job.description,
@@ -169,28 +168,19 @@ def process_response(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/evaluate-response")
-def evaluate_response(
+async def evaluate_response(
     question: str = Body(...),
     response_text: str = Body(...),
     interview_id: Union[str, int] = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Evaluate the candidate's response"""
     try:
-        # Convert interview_id to string if it's an integer
-        interview_id_str = str(interview_id)
-        
         # Get interview details
-        interview = db.query(Interview).filter(Interview.id == interview_id_str).first()
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
-        
-        job = db.query(Job).filter(Job.id == interview.job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        job = (await get_interview_with_job(db, interview_id)).job
         
         # Evaluate response
-        result = evaluate_interview_response(
+        result = await evaluate_interview_response(
             question=question,
             response_text=response_text,
             job_title=job.title
@@ -214,28 +204,19 @@ def transcribe_audio(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze-video")
-def analyze_video(
+async def analyze_video(
     question: str = Body(...),
     transcript: str = Body(...),
     interview_id: Union[str, int] = Body(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze video response"""
     try:
-        # Convert interview_id to string if it's an integer
-        interview_id_str = str(interview_id)
-        
         # Get interview details
-        interview = db.query(Interview).filter(Interview.id == interview_id_str).first()
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
-        
-        job = db.query(Job).filter(Job.id == interview.job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
+        job = (await get_interview_with_job(db, interview_id)).job
+
         # Analyze video
-        result = analyze_video_response(
+        result = await analyze_video_response(
             question=question,
             transcript=transcript,
             job_description=job.description
@@ -246,29 +227,20 @@ def analyze_video(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-followup")
-def generate_followup(
+async def generate_followup(
     question: str = Body(...),
     response: str = Body(...),
     interview_id: Union[str, int] = Body(...),
     is_last_question: bool = Body(default=False),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate follow-up question"""
     try:
-        # Convert interview_id to string if it's an integer
-        interview_id_str = str(interview_id)
-        
         # Get interview details
-        interview = db.query(Interview).filter(Interview.id == interview_id_str).first()
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
-        
-        job = db.query(Job).filter(Job.id == interview.job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        job = (await get_interview_with_job(db, interview_id)).job
         
         # Generate follow-up
-        result = generate_followup_question(
+        result = await generate_followup_question(
             question=question,
             response=response,
             job_title=job.title,
@@ -281,8 +253,7 @@ def generate_followup(
 
 @router.post("/transcribe")
 async def transcribe_audio(
-    audio_file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    audio_file: UploadFile = File(...)
 ):
     """Transcribe audio using OpenAI's Whisper model"""
     try:
@@ -307,11 +278,7 @@ async def transcribe_audio(
         audio_file_obj.name = audio_file.filename
         
         # Send to Whisper for transcription
-        result = await openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file_obj,
-            language="en"
-        )
+        result = await llm_gateway.transcribe(audio_file_obj, language="en")
         
         if not result or not result.text:
             raise HTTPException(status_code=500, detail="Failed to transcribe audio")
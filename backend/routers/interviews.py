@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from datetime import datetime, timedelta
 import random
 import string
 
-from database import get_db
+from database import get_async_db, get_db
 from schemas.interviews import (
     InterviewCreate, InterviewResponse, InterviewUpdate,
     InterviewQuestionCreate, InterviewQuestionResponse,
@@ -13,7 +15,15 @@ from schemas.interviews import (
 )
 from models.models import User, Interview, InterviewQuestion, Candidate, Job, PublicInterviewLink
 from utils.auth import get_current_user
+from utils.counters import link_counters
+from utils.public_links import (
+    format_job_details, invalidate_public_link, resolve_active_public_link
+)
 from utils.openai_utils import generate_interview_questions
+from utils.pagination import (
+    load_columns, paginate, projected_response, schema_columns, select_fields, set_next_cursor
+)
+from utils.tts_presynthesis import INTERVIEW_GREETING, presynthesize_interview_audio, get_interview_audio_status
 
 router = APIRouter()
 
@@ -22,57 +32,10 @@ def generate_access_code(length=8):
     characters = string.ascii_uppercase + string.digits
     return ''.join(random.choice(characters) for _ in range(length))
 
-def format_compensation(job):
-    # Debug logging
-    print("Compensation data:", {
-        "show_salary": job.show_salary,
-        "salary_min": job.salary_min,
-        "salary_max": job.salary_max
-    })
-    
-    if not job.show_salary:
-        return "Not specified"
-    if job.salary_min and job.salary_max:
-        return f"${job.salary_min:,} - ${job.salary_max:,}"
-    elif job.salary_min:
-        return f"From ${job.salary_min:,}"
-    elif job.salary_max:
-        return f"Up to ${job.salary_max:,}"
-    return "Not specified"
-
-def format_job_details(job):
-    # Debug logging
-    print("Job data:", {
-        "id": job.id,
-        "title": job.title,
-        "description": job.description,
-        "requirements": job.requirements,
-        "benefits": job.benefits,
-        "salary_min": job.salary_min,
-        "salary_max": job.salary_max,
-        "show_salary": job.show_salary
-    })
-    
-    return {
-        "id": job.id,
-        "title": job.title,
-        "company": {
-            "id": job.company.id,
-            "name": job.company.company_name,
-            "logo": job.company.company_logo
-        },
-        "location": job.location or "Not specified",
-        "type": job.type or "Not specified",
-        "description": job.description or "No description available",
-        "requirements": job.requirements or "No specific requirements listed",
-        "benefits": job.benefits or "No benefits listed",
-        "compensation": format_compensation(job),
-        "created_at": job.created_at
-    }
-
 @router.post("/", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_interview(
     interview: InterviewCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -129,13 +92,20 @@ async def create_interview(
     # Fetch the interview with questions
     db_interview = db.query(Interview).filter(Interview.id == db_interview.id).first()
     
+    # Render question audio ahead of time so the live interview never waits on TTS
+    background_tasks.add_task(presynthesize_interview_audio, db_interview.id)
+    
     return db_interview
 
 @router.get("/", response_model=List[InterviewResponse])
 async def get_interviews(
+    response: Response,
     status: Optional[str] = Query(None),
     job_id: Optional[int] = Query(None),
     candidate_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at MAX_PAGE_SIZE; without limit or cursor every row is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -149,8 +119,42 @@ async def get_interviews(
     if candidate_id:
         query = query.filter(Interview.candidate_id == candidate_id)
     
-    interviews = query.all()
-    return interviews
+    columns = select_fields(Interview, InterviewResponse, fields)
+    if columns:
+        interviews, next_cursor = paginate(query.options(load_columns(Interview, columns)), Interview.id, limit, cursor)
+        return projected_response(
+            [{column: getattr(interview, column) for column in columns} for interview in interviews],
+            next_cursor
+        )
+    
+    # Questions and candidate summaries are loaded for the whole page in two extra queries
+    query = query.options(
+        load_columns(Interview, schema_columns(Interview, InterviewResponse)),
+        selectinload(Interview.questions),
+        selectinload(Interview.candidate).load_only(
+            Candidate.id, Candidate.first_name, Candidate.last_name, Candidate.email
+        )
+    )
+    interviews, next_cursor = paginate(query, Interview.id, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return [
+        {
+            **{column: getattr(interview, column) for column in schema_columns(Interview, InterviewResponse)},
+            "questions": interview.questions,
+            "candidate": {
+                "id": interview.candidate.id,
+                "first_name": interview.candidate.first_name,
+                "last_name": interview.candidate.last_name,
+                "email": interview.candidate.email
+            } if interview.candidate else None
+        }
+        for interview in interviews
+    ]
+
+@router.get("/greeting")
+async def get_interview_greeting():
+    """Opening line the interviewer speaks first; its audio is pre-synthesized with the questions"""
+    return {"text": INTERVIEW_GREETING}
 
 @router.get("/{interview_id}", response_model=InterviewResponse)
 async def get_interview(
@@ -233,6 +237,7 @@ async def delete_interview(
 async def add_interview_questions(
     interview_id: int,
     questions: List[InterviewQuestionCreate],
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -268,6 +273,8 @@ async def add_interview_questions(
     for question in db_questions:
         db.refresh(question)
     
+    background_tasks.add_task(presynthesize_interview_audio, interview_id)
+    
     return db_questions
 
 @router.post("/generate-questions")
@@ -369,13 +376,52 @@ async def get_interview_questions(
     
     return questions
 
+@router.get("/{interview_id}/audio-status")
+async def get_interview_audio_readiness(
+    interview_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get whether pre-synthesized audio is ready for each interview question"""
+    interview = db.query(Interview).join(Job).filter(
+        Interview.id == interview_id,
+        Job.company_id == current_user.id
+    ).first()
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    return get_interview_audio_status(db, interview_id)
+
+@router.get("/by-access-code/{access_code}/audio-status")
+async def get_interview_audio_readiness_by_access_code(
+    access_code: str,
+    db: Session = Depends(get_db)
+):
+    """Get audio readiness for the candidate-facing interview"""
+    interview = db.query(Interview).filter(Interview.access_code == access_code).first()
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    return get_interview_audio_status(db, interview.id)
+
 @router.get("/by-access-code/{access_code}", response_model=InterviewResponse)
 async def get_interview_by_access_code(
     access_code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get interview by access code"""
-    interview = db.query(Interview).filter(Interview.access_code == access_code).first()
+    result = await db.execute(
+        select(Interview).options(joinedload(Interview.candidate)).where(
+            Interview.access_code == access_code
+        )
+    )
+    interview = result.scalars().first()
     if not interview:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -399,6 +445,11 @@ async def get_interview_by_access_code(
     
     return response
 
+def _link_counts(link: PublicInterviewLink) -> dict:
+    """Stored link counters plus increments this process has not flushed yet"""
+    pending = link_counters.pending(link.id)
+    return {field: (getattr(link, field) or 0) + pending[field] for field in link_counters.fields}
+
 @router.post("/public/{job_id}", response_model=PublicInterviewLinkResponse, status_code=status.HTTP_201_CREATED)
 async def create_public_link(
     job_id: int,
@@ -496,9 +547,7 @@ async def get_public_links(
             "access_code": link.access_code,
             "is_active": link.is_active,
             "expires_at": link.expires_at,
-            "visits": link.visits,
-            "started_interviews": link.started_interviews,
-            "completed_interviews": link.completed_interviews,
+            **_link_counts(link),
             "created_at": link.created_at,
             "updated_at": link.updated_at,
             "job": format_job_details(job)
@@ -537,6 +586,7 @@ async def delete_public_link(
     
     db.delete(link)
     db.commit()
+    invalidate_public_link(link_id)
     return {"detail": "Link deleted"}
 
 @router.patch("/public/{job_id}/{link_id}", response_model=PublicInterviewLinkResponse)
@@ -580,6 +630,7 @@ async def toggle_public_link_status(
     link.is_active = is_active
     db.commit()
     db.refresh(link)
+    invalidate_public_link(link_id)
     
     # Format response with job details
     return {
@@ -589,9 +640,7 @@ async def toggle_public_link_status(
         "access_code": link.access_code,
         "is_active": link.is_active,
         "expires_at": link.expires_at,
-        "visits": link.visits,
-        "started_interviews": link.started_interviews,
-        "completed_interviews": link.completed_interviews,
+        **_link_counts(link),
         "created_at": link.created_at,
         "updated_at": link.updated_at,
         "job": format_job_details(job)
@@ -600,78 +649,25 @@ async def toggle_public_link_status(
 @router.get("/public/access/{access_code}", response_model=PublicInterviewLinkResponse)
 async def get_public_link_by_access_code(
     access_code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a public interview link by access code"""
-    link = db.query(PublicInterviewLink).filter(
-        PublicInterviewLink.access_code == access_code
-    ).first()
-    if not link:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Link not found"
-        )
-    
-    # Check if link is active
-    if not link.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Link is inactive"
-        )
-    
-    # Check if link has expired
-    if link.expires_at and link.expires_at < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Link has expired"
-        )
-    
-    # Get job details with all fields
-    job = db.query(Job).filter(Job.id == link.job_id).first()
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
+    link = await resolve_active_public_link(db, access_code)
     
-    # Debug: Print all job fields
-    print("Job fields:", {
-        "id": job.id,
-        "title": job.title,
-        "description": job.description,
-        "requirements": job.requirements,
-        "benefits": job.benefits,
-        "salary_min": job.salary_min,
-        "salary_max": job.salary_max,
-        "show_salary": job.show_salary,
-        "location": job.location,
-        "type": job.type
-    })
+    # Buffered and written as an atomic increment by the counter flush
+    link_counters.incr(link["id"], "visits")
     
-    # Get company details
-    company = db.query(User).filter(User.id == job.company_id).first()
-    if not company:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Company not found"
-        )
-    
-    # Increment visits
-    link.visits += 1
-    db.commit()
-    
-    # Format the response according to the schema
+    pending = link_counters.pending(link["id"])
     return {
-        "id": link.id,
-        "job_id": link.job_id,
-        "name": link.name,
-        "access_code": link.access_code,
-        "is_active": link.is_active,
-        "expires_at": link.expires_at,
-        "visits": link.visits,
-        "started_interviews": link.started_interviews,
-        "completed_interviews": link.completed_interviews,
-        "created_at": link.created_at,
-        "updated_at": link.updated_at,
-        "job": format_job_details(job)
+        **link,
+        **{field: (link[field] or 0) + pending[field] for field in link_counters.fields}
     }
+
+@router.post("/public/access/{access_code}/started", status_code=status.HTTP_204_NO_CONTENT)
+async def record_public_interview_started(
+    access_code: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Count an interview started from a public link"""
+    link = await resolve_active_public_link(db, access_code)
+    link_counters.incr(link["id"], "started_interviews")
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Body
+from sqlalchemy.orm import Session, contains_eager
 from typing import List, Optional
 from datetime import datetime
 
@@ -15,10 +15,28 @@ from models.models import (
     PublicInterviewLink, InterviewSettings
 )
 from utils.auth import get_current_user
+from config import settings
 from utils.openai_utils import generate_job_description, generate_interview_questions, generate_job_requirements, generate_job_benefits
+from utils.dashboard import dashboard_summary
+from utils.file_utils import schedule_upload_cleanup
+from utils.job_stats import job_stats_for, stats_dict
+from utils.pagination import (
+    load_columns, paginate, projected_response, schema_columns, select_fields, set_next_cursor
+)
+from utils.public_links import invalidate_job_public_links
+from utils.ranking import rank_job_candidates, ranked_candidate_dict, shortlist_job_candidates
+from utils.task_queue import enqueue, task_accepted
+from utils.ttl_cache import response_cache
+from utils.vector_index import best_candidates_for_job, index_job, remove_vectors
 
 router = APIRouter()
 
+# Cache tag covering every public job board response
+PUBLIC_JOBS_TAG = "public_jobs"
+
+def invalidate_public_jobs() -> None:
+    response_cache.invalidate(PUBLIC_JOBS_TAG)
+
 # Job CRUD operations
 @router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
@@ -43,14 +61,21 @@ async def create_job(
         status="active" if job.published else "draft"
     )
     db.add(db_job)
+    db.flush()
+    index_job(db, db_job)
     db.commit()
     db.refresh(db_job)
+    invalidate_public_jobs()
     return db_job
 
 @router.get("/", response_model=List[JobResponse])
 async def get_jobs(
+    response: Response,
     status: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at MAX_PAGE_SIZE; without limit or cursor every row is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -62,18 +87,53 @@ async def get_jobs(
     if department:
         query = query.filter(Job.department == department)
     
-    jobs = query.all()
+    columns = select_fields(Job, JobResponse, fields)
+    query = query.options(load_columns(Job, columns or schema_columns(Job, JobResponse)))
+    jobs, next_cursor = paginate(query, Job.id, limit, cursor)
+    
+    if columns:
+        return projected_response(
+            [{column: getattr(job, column) for column in columns} for job in jobs],
+            next_cursor
+        )
+    set_next_cursor(response, next_cursor)
     return jobs
 
 @router.get("/public", response_model=List[PublicJobResponse])
 async def get_public_jobs(
+    response: Response,
     company_id: Optional[int] = Query(None),
     department: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped at MAX_PAGE_SIZE; without limit or cursor every row is returned"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     db: Session = Depends(get_db)
 ):
     """Get all published jobs (public endpoint)"""
-    query = db.query(Job).join(User).filter(Job.status == "active")
+    cache_key = ("public_jobs", company_id, department, location, limit, cursor, fields)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        cached = _list_public_jobs(db, company_id, department, location, limit, cursor, fields)
+        response_cache.set(cache_key, cached, tags=[PUBLIC_JOBS_TAG])
+    result, next_cursor = cached
+    
+    if fields:
+        return projected_response(result, next_cursor)
+    set_next_cursor(response, next_cursor)
+    return result
+
+def _list_public_jobs(
+    db: Session,
+    company_id: Optional[int],
+    department: Optional[str],
+    location: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str]
+):
+    # Company names come from the same query instead of one lookup per job
+    query = db.query(Job).join(Job.company).filter(Job.status == "active")
     
     if company_id:
         query = query.filter(Job.company_id == company_id)
@@ -82,32 +142,54 @@ async def get_public_jobs(
     if location:
         query = query.filter(Job.location == location)
     
-    jobs = query.all()
+    selected = select_fields(Job, PublicJobResponse, fields, computed=["company_name"])
+    columns = [c for c in selected or schema_columns(Job, PublicJobResponse) if c in Job.__table__.columns]
+    query = query.options(
+        load_columns(Job, list(dict.fromkeys(columns + ["company_id", "show_salary"]))),
+        contains_eager(Job.company).load_only(User.id, User.company_name)
+    )
+    jobs, next_cursor = paginate(query, Job.id, limit, cursor)
     
     # Convert to PublicJobResponse format
     result = []
     for job in jobs:
-        company = db.query(User).filter(User.id == job.company_id).first()
-        company_name = company.company_name if company else "Unknown Company"
-        
-        result.append({
-            "id": job.id,
-            "title": job.title,
-            "company_name": company_name,
-            "department": job.department,
-            "location": job.location,
-            "type": job.type,
-            "experience": job.experience,
-            "salary_min": job.salary_min if job.show_salary else None,
-            "salary_max": job.salary_max if job.show_salary else None,
-            "show_salary": job.show_salary,
-            "description": job.description,
-            "requirements": job.requirements,
-            "benefits": job.benefits,
-            "created_at": job.created_at
-        })
-    
-    return result
+        item = {column: getattr(job, column) for column in columns}
+        item["company_name"] = job.company.company_name if job.company else "Unknown Company"
+        if not job.show_salary:
+            item.update({key: None for key in ("salary_min", "salary_max") if key in item})
+        if selected:
+            item = {key: item[key] for key in selected}
+        result.append(item)
+    return result, next_cursor
+
+@router.get("/stats")
+async def get_all_job_stats(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get statistics for every job of the company"""
+    jobs = db.query(Job.id, Job.company_id, Job.title, Job.status).filter(
+        Job.company_id == current_user.id
+    ).order_by(Job.id).all()
+    stats = job_stats_for(db, jobs)
+
+    return [
+        {
+            "job_id": job.id,
+            "job_title": job.title,
+            "status": job.status,
+            **stats_dict(stats[job.id])
+        }
+        for job in jobs
+    ]
+
+@router.get("/dashboard/summary")
+async def get_dashboard_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Status counts, average scores and public link funnels for all jobs in one request"""
+    return dashboard_summary(db, current_user.id)
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
@@ -130,15 +212,21 @@ async def get_public_job(
     db: Session = Depends(get_db)
 ):
     """Get a specific job by ID (public endpoint)"""
-    job = db.query(Job).filter(Job.id == job_id, Job.status == "active").first()
+    cache_key = ("public_job", job_id)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    job = db.query(Job).outerjoin(Job.company).options(
+        contains_eager(Job.company).load_only(User.id, User.company_name)
+    ).filter(Job.id == job_id, Job.status == "active").first()
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    company = db.query(User).filter(User.id == job.company_id).first()
-    company_name = company.company_name if company else "Unknown Company"
+    company_name = job.company.company_name if job.company else "Unknown Company"
     
     result = {
         "id": job.id,
@@ -157,6 +245,7 @@ async def get_public_job(
         "created_at": job.created_at
     }
     
+    response_cache.set(cache_key, result, tags=[PUBLIC_JOBS_TAG])
     return result
 
 @router.put("/{job_id}", response_model=JobResponse)
@@ -203,8 +292,11 @@ async def update_job(
         job.status = job_update.status
     
     job.updated_at = datetime.utcnow()
+    index_job(db, job)
     db.commit()
     db.refresh(job)
+    invalidate_public_jobs()
+    invalidate_job_public_links(job_id)
     return job
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -222,42 +314,33 @@ async def delete_job(
         )
     
     try:
-        # Delete video responses first (deepest in the relationship tree)
-        db.query(VideoResponse).filter(
-            VideoResponse.interview_id.in_(
-                db.query(Interview.id).filter(Interview.job_id == job_id)
-            )
-        ).delete(synchronize_session=False)
-        
-        # Delete interview questions
-        db.query(InterviewQuestion).filter(
-            InterviewQuestion.interview_id.in_(
-                db.query(Interview.id).filter(Interview.job_id == job_id)
-            )
-        ).delete(synchronize_session=False)
-        
-        # Delete interviews
-        db.query(Interview).filter(Interview.job_id == job_id).delete(synchronize_session=False)
-        
-        # Delete candidates
-        db.query(Candidate).filter(Candidate.job_id == job_id).delete(synchronize_session=False)
-        
-        # Delete interview settings
-        db.query(InterviewSettings).filter(InterviewSettings.job_id == job_id).delete(synchronize_session=False)
+        # Files on disk outlive their rows, so note them before the rows go
+        candidates = db.query(Candidate.id, Candidate.resume_url).filter(Candidate.job_id == job_id).all()
+        video_urls = db.query(VideoResponse.video_url).join(Interview).filter(
+            Interview.job_id == job_id,
+            VideoResponse.video_url.isnot(None)
+        )
+        upload_urls = [resume_url for _, resume_url in candidates] + [video_url for (video_url,) in video_urls]
         
-        # Delete public interview links
-        db.query(PublicInterviewLink).filter(PublicInterviewLink.job_id == job_id).delete(synchronize_session=False)
+        # Vectors are keyed by entity rather than foreign key
+        remove_vectors(db, "candidate", [candidate_id for candidate_id, _ in candidates])
+        remove_vectors(db, "job", [job_id])
         
-        # Finally, delete the job
+        # Candidates, interviews, questions, responses, settings, public links
+        # and the stats row go with the job through ON DELETE CASCADE
         db.delete(job)
         db.commit()
-        return None
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting job: {str(e)}"
         )
+    
+    schedule_upload_cleanup(db, upload_urls)
+    invalidate_public_jobs()
+    invalidate_job_public_links(job_id)
+    return None
 
 # Job Interview Settings
 @router.post("/{job_id}/interview-settings", response_model=InterviewSettingsResponse)
@@ -420,6 +503,7 @@ async def generate_job_description_api(
 @router.get("/{job_id}/stats")
 async def get_job_stats(
     job_id: int,
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -432,40 +516,85 @@ async def get_job_stats(
             detail="Job not found"
         )
     
-    # Get count of candidates by status
-    candidates_query = db.query(Candidate).filter(Candidate.job_id == job_id)
-    total_candidates = candidates_query.count()
-    new_candidates = candidates_query.filter(Candidate.status == "new").count()
-    reviewing_candidates = candidates_query.filter(Candidate.status == "reviewing").count()
-    interviewing_candidates = candidates_query.filter(Candidate.status == "interviewing").count()
-    hired_candidates = candidates_query.filter(Candidate.status == "hired").count()
-    rejected_candidates = candidates_query.filter(Candidate.status == "rejected").count()
-    
-    # Get count of interviews by status
-    interviews_query = db.query(Interview).filter(Interview.job_id == job_id)
-    total_interviews = interviews_query.count()
-    pending_interviews = interviews_query.filter(Interview.status == "pending").count()
-    completed_interviews = interviews_query.filter(Interview.status == "completed").count()
+    # Counts are maintained incrementally; refresh recomputes them from the source tables
+    stats = job_stats_for(db, [job], refresh=refresh)[job.id]
     
     return {
         "job_id": job_id,
         "job_title": job.title,
         "created_at": job.created_at,
-        "candidates": {
-            "total": total_candidates,
-            "new": new_candidates,
-            "reviewing": reviewing_candidates,
-            "interviewing": interviewing_candidates,
-            "hired": hired_candidates,
-            "rejected": rejected_candidates
-        },
-        "interviews": {
-            "total": total_interviews,
-            "pending": pending_interviews,
-            "completed": completed_interviews
-        }
+        **stats_dict(stats)
     }
 
+@router.get("/{job_id}/ranked-candidates")
+async def get_ranked_candidates(
+    job_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rank a job's candidates by local text relevance, without any AI calls"""
+    job = db.query(Job).filter(Job.id == job_id, Job.company_id == current_user.id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    ranked = rank_job_candidates(db, job, limit=limit)
+    return {
+        "job_id": job_id,
+        "candidates": [ranked_candidate_dict(candidate, score) for candidate, score in ranked]
+    }
+
+@router.get("/{job_id}/matching-candidates")
+async def get_matching_candidates(
+    job_id: int,
+    k: int = Query(10, ge=1, le=100),
+    applicants_only: bool = Query(False, description="Only consider candidates who applied to this job"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Find the company's candidates whose resumes best match a job"""
+    job = db.query(Job).filter(Job.id == job_id, Job.company_id == current_user.id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    matches = best_candidates_for_job(db, job, k=k, applicants_only=applicants_only)
+    return {
+        "job_id": job_id,
+        "candidates": [
+            {**ranked_candidate_dict(candidate, score), "job_id": candidate.job_id}
+            for candidate, score in matches
+        ]
+    }
+
+@router.post("/{job_id}/shortlist")
+async def shortlist_candidates(
+    job_id: int,
+    top_k: int = Query(settings.RANKING_SHORTLIST_SIZE, ge=1, le=100),
+    background: bool = Query(False, description="Queue the matching and return a task id"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Run the AI resume match on the top-K locally ranked candidates of a job"""
+    job = db.query(Job).filter(Job.id == job_id, Job.company_id == current_user.id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if background:
+        return task_accepted(enqueue(
+            db, "job_shortlist", {"job_id": job_id, "top_k": top_k}, company_id=current_user.id
+        ))
+    
+    return await shortlist_job_candidates(db, job, top_k)
+
 @router.post("/generate-requirements")
 async def generate_job_requirements_api(
     data: dict = Body(...),
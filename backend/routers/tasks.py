@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models.models import QueuedTask, User
+from utils.auth import get_current_user
+from utils.task_queue import task_to_dict
+
+router = APIRouter()
+
+@router.get("/{task_id}")
+async def get_task(
+    task_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status and, once finished, the result of a queued task"""
+    task = db.query(QueuedTask).filter(
+        QueuedTask.id == task_id,
+        QueuedTask.company_id == current_user.id
+    ).first()
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    return task_to_dict(task)
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import Optional, Dict, Any, List
+import asyncio
 import os
 import shutil
 import json
@@ -16,9 +20,16 @@ import httpx
 from utils.audio_utils import prepare_audio_file
 from utils.file_utils import generate_unique_filename
 
-from database import get_db
+from database import get_async_db
 from models.models import User, Interview, InterviewQuestion, VideoResponse, Job, Candidate
-from utils.auth import get_current_user
+from utils.auth import get_current_user_async
+from utils.chunked_upload import (
+    abort_upload, chunk_too_large, create_upload, finalize_upload, get_upload, upload_status, write_chunk
+)
+from config import settings
+from utils.public_links import resolve_active_public_link
+from utils.task_queue import enqueue_async, task_accepted
+from utils.transcripts import stream_interview_transcripts, stream_transcript_entries, to_ndjson_async
 from utils.openai_utils import (
     transcribe_audio,
     analyze_video_response,
@@ -31,9 +42,25 @@ router = APIRouter()
 UPLOAD_DIR = Path("uploads/videos")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+async def get_company_question(db: AsyncSession, question_id: int, current_user: User) -> Optional[InterviewQuestion]:
+    """The question, if it belongs to one of the current user's jobs"""
+    result = await db.execute(
+        select(InterviewQuestion).join(Interview).join(Job).where(
+            InterviewQuestion.id == question_id,
+            Job.company_id == current_user.id
+        )
+    )
+    return result.scalars().first()
+
+async def get_question_response(db: AsyncSession, question_id: int) -> Optional[VideoResponse]:
+    result = await db.execute(
+        select(VideoResponse).where(VideoResponse.question_id == question_id)
+    )
+    return result.scalars().first()
+
 @router.post("/upload-url")
 async def get_video_upload_url(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ):
     """Generate a URL for uploading a video (local development version)"""
     file_key = generate_unique_filename("videos", "mp4")
@@ -50,7 +77,7 @@ async def get_video_upload_url(
 async def upload_file(
     file_path: str,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ):
     """Handle direct file uploads for local development"""
     try:
@@ -69,19 +96,123 @@ async def upload_file(
             detail=f"Could not upload file: {str(e)}"
         )
 
+def _upload_offset_headers(manifest: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "Upload-Offset": str(manifest["offset"]),
+        "Upload-Length": str(manifest["length"]),
+        "Cache-Control": "no-store"
+    }
+
+async def get_upload_owner(
+    interview_access_code: str = Header(..., description="Access code of the candidate's interview or public interview link"),
+    db: AsyncSession = Depends(get_async_db)
+) -> str:
+    """Candidates have no login; uploads belong to the interview or public link whose code they hold"""
+    interview = (await db.execute(
+        select(Interview.id, Interview.status).where(Interview.access_code == interview_access_code)
+    )).first()
+    if interview:
+        if interview.status in ("completed", "cancelled"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Interview is closed"
+            )
+        return f"interview:{interview.id}"
+    link = await resolve_active_public_link(db, interview_access_code)
+    return f"public_link:{link['id']}"
+
+async def _read_chunk(request: Request) -> bytes:
+    """Request body, refused as soon as it grows past the chunk limit"""
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > settings.VIDEO_UPLOAD_MAX_CHUNK_BYTES:
+        raise chunk_too_large()
+    # Chunked transfer encoding has no Content-Length, so count as it arrives
+    data = bytearray()
+    async for part in request.stream():
+        data.extend(part)
+        if len(data) > settings.VIDEO_UPLOAD_MAX_CHUNK_BYTES:
+            raise chunk_too_large()
+    return bytes(data)
+
+@router.post("/uploads", status_code=status.HTTP_201_CREATED)
+async def create_video_upload(
+    response: Response,
+    length: int = Body(..., embed=True, description="Total size of the video in bytes"),
+    filename: Optional[str] = Body(None, embed=True),
+    owner: str = Depends(get_upload_owner)
+):
+    """Start a resumable upload of a candidate's answer video
+
+    Every request carries the candidate's `Interview-Access-Code`. Send the
+    video in chunks with PATCH to `upload_url`, each carrying the
+    `Upload-Offset` it starts at and an `Upload-Checksum` (e.g. `sha256 <base64>`).
+    After an interruption, HEAD `upload_url` returns the offset to continue from.
+    """
+    manifest = await asyncio.to_thread(create_upload, owner, length, filename)
+    response.headers["Location"] = upload_status(manifest)["upload_url"]
+    return upload_status(manifest)
+
+@router.head("/uploads/{upload_id}")
+async def get_video_upload_offset(
+    upload_id: str,
+    owner: str = Depends(get_upload_owner)
+):
+    """Offset to resume a video upload from"""
+    manifest = get_upload(owner, upload_id)
+    return Response(headers=_upload_offset_headers(manifest))
+
+@router.get("/uploads/{upload_id}")
+async def get_video_upload(
+    upload_id: str,
+    response: Response,
+    owner: str = Depends(get_upload_owner)
+):
+    """Progress of a video upload"""
+    manifest = get_upload(owner, upload_id)
+    response.headers.update(_upload_offset_headers(manifest))
+    return upload_status(manifest)
+
+@router.patch("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_video_upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    upload_checksum: str = Header(...),
+    owner: str = Depends(get_upload_owner)
+):
+    """Write one chunk of a video upload at its offset"""
+    data = await _read_chunk(request)
+    manifest = await asyncio.to_thread(
+        write_chunk, owner, upload_id, upload_offset, data, upload_checksum
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers=_upload_offset_headers(manifest))
+
+@router.post("/uploads/{upload_id}/finalize")
+async def finalize_video_upload(
+    upload_id: str,
+    owner: str = Depends(get_upload_owner)
+):
+    """Complete a video upload and return its URL"""
+    return await asyncio.to_thread(finalize_upload, owner, upload_id)
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_video_upload(
+    upload_id: str,
+    owner: str = Depends(get_upload_owner)
+):
+    """Abandon a video upload and discard what was received"""
+    await asyncio.to_thread(abort_upload, owner, upload_id)
+
 @router.post("/{question_id}/response")
 async def submit_video_response(
     question_id: int,
     video_url: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit a video response for an interview question"""
     # Verify question belongs to user's company
-    question = db.query(InterviewQuestion).join(Interview).join(Job).filter(
-        InterviewQuestion.id == question_id,
-        Job.company_id == current_user.id
-    ).first()
+    question = await get_company_question(db, question_id, current_user)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,15 +220,13 @@ async def submit_video_response(
         )
     
     # Check if a response already exists
-    existing_response = db.query(VideoResponse).filter(
-        VideoResponse.question_id == question_id
-    ).first()
+    existing_response = await get_question_response(db, question_id)
     
     if existing_response:
         # Update existing response
         existing_response.video_url = video_url
-        db.commit()
-        db.refresh(existing_response)
+        await db.commit()
+        await db.refresh(existing_response)
         response = existing_response
     else:
         # Create new response
@@ -106,8 +235,8 @@ async def submit_video_response(
             video_url=video_url
         )
         db.add(response)
-        db.commit()
-        db.refresh(response)
+        await db.commit()
+        await db.refresh(response)
     
     return {
         "id": response.id,
@@ -118,14 +247,12 @@ async def submit_video_response(
 async def update_transcript(
     question_id: int,
     transcript: str = Body(..., embed=True),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update the transcript for a video response"""
     # Find the response
-    response = db.query(VideoResponse).filter(
-        VideoResponse.question_id == question_id
-    ).first()
+    response = await get_question_response(db, question_id)
     
     if not response:
         raise HTTPException(
@@ -136,8 +263,8 @@ async def update_transcript(
     # Update the transcript
     response.transcript = transcript
     response.was_edited = True
-    db.commit()
-    db.refresh(response)
+    await db.commit()
+    await db.refresh(response)
     
     return {
         "id": response.id,
@@ -150,16 +277,13 @@ async def analyze_response(
     question_id: int,
     video_url: str,
     transcript: str = Body(..., embed=True),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    background: bool = Query(False, description="Queue the analysis and return a task id"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze a video response and provide feedback"""
     # Verify question belongs to user's company
-    question_query = db.query(InterviewQuestion).join(Interview).join(Job)
-    question = question_query.filter(
-        InterviewQuestion.id == question_id,
-        Job.company_id == current_user.id
-    ).first()
+    question = await get_company_question(db, question_id, current_user)
     
     if not question:
         raise HTTPException(
@@ -168,10 +292,23 @@ async def analyze_response(
         )
     
     # Get the job description for context
-    job = db.query(Job).join(Interview).filter(
-        Interview.id == question.interview_id
-    ).first()
+    job = (await db.execute(
+        select(Job).join(Interview).where(Interview.id == question.interview_id)
+    )).scalars().first()
+
+    if background:
+        task = await enqueue_async(db, "video_analysis", {
+            "question_id": question_id,
+            "question": question.question,
+            "video_url": video_url,
+            "transcript": transcript,
+            "job_description": job.description if job else ""
+        }, company_id=current_user.id)
+        return task_accepted(task)
     
+    # Release the connection for the duration of the LLM call
+    await db.commit()
+
     # Analyze the response
     analysis = await analyze_video_response(
         question=question.question,
@@ -180,9 +317,7 @@ async def analyze_response(
     )
     
     # Update or create response in database
-    existing_response = db.query(VideoResponse).filter(
-        VideoResponse.question_id == question_id
-    ).first()
+    existing_response = await get_question_response(db, question_id)
     
     if existing_response:
         existing_response.transcript = transcript
@@ -195,8 +330,8 @@ async def analyze_response(
             "red_flags": analysis.get("red_flags", []),
             "outstanding_qualities": analysis.get("outstanding_qualities", [])
         })
-        db.commit()
-        db.refresh(existing_response)
+        await db.commit()
+        await db.refresh(existing_response)
         response = existing_response
     else:
         response = VideoResponse(
@@ -214,8 +349,8 @@ async def analyze_response(
             })
         )
         db.add(response)
-        db.commit()
-        db.refresh(response)
+        await db.commit()
+        await db.refresh(response)
     
     return {
         "id": response.id,
@@ -230,14 +365,17 @@ async def get_followup_question(
     question_id: int,
     response_text: str = Body(..., embed=True),
     is_last_question: bool = Body(False, embed=True),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate a follow-up question or comment based on candidate response"""
     # Verify question exists
-    question = db.query(InterviewQuestion).join(Interview).join(Job).filter(
-        InterviewQuestion.id == question_id
-    ).first()
+    result = await db.execute(
+        select(InterviewQuestion).join(Interview).join(Job).options(
+            joinedload(InterviewQuestion.interview).joinedload(Interview.job)
+        ).where(InterviewQuestion.id == question_id)
+    )
+    question = result.scalars().first()
     
     if not question:
         raise HTTPException(
@@ -248,6 +386,8 @@ async def get_followup_question(
     # Get the job title
     job_title = question.interview.job.title if question.interview and question.interview.job else "this position"
     
+    await db.commit()
+
     # Generate the follow-up
     follow_up = await generate_followup_question(
         question=question.question,
@@ -263,24 +403,19 @@ async def get_followup_question(
 @router.get("/{question_id}/responses")
 async def get_response(
     question_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get responses for a question"""
     # Verify question belongs to user's company
-    question = db.query(InterviewQuestion).join(Interview).join(Job).filter(
-        InterviewQuestion.id == question_id,
-        Job.company_id == current_user.id
-    ).first()
+    question = await get_company_question(db, question_id, current_user)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
     
-    response = db.query(VideoResponse).filter(
-        VideoResponse.question_id == question_id
-    ).first()
+    response = await get_question_response(db, question_id)
     
     if not response:
         raise HTTPException(
@@ -302,14 +437,21 @@ async def get_response(
 @router.get("/transcript/{interview_id}")
 async def get_full_transcript(
     interview_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get the full transcript for an interview"""
-    # Verify interview exists
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id
-    ).first()
+    """Get the full transcript for an interview
+
+    `format=ndjson` streams one line per question, for very long interviews.
+    """
+    # Verify interview belongs to user's company
+    interview = (await db.execute(
+        select(Interview.id).join(Job).where(
+            Interview.id == interview_id,
+            Job.company_id == current_user.id
+        )
+    )).first()
     
     if not interview:
         raise HTTPException(
@@ -317,28 +459,49 @@ async def get_full_transcript(
             detail="Interview not found"
         )
     
-    # Get all questions for this interview
-    questions = db.query(InterviewQuestion).filter(
-        InterviewQuestion.interview_id == interview_id
-    ).order_by(InterviewQuestion.order_number).all()
+    # Questions, responses, scores and feedback come back in one joined query
+    entries = stream_transcript_entries(db, Interview.id == interview_id)
+    if format == "ndjson":
+        return StreamingResponse(to_ndjson_async(entries), media_type="application/x-ndjson")
     
-    # Get responses for each question
     transcript = []
-    for question in questions:
-        response = db.query(VideoResponse).filter(
-            VideoResponse.question_id == question.id
-        ).first()
-        
-        transcript.append({
-            "question_id": question.id,
-            "question": question.question,
-            "order": question.order_number,
-            "response_text": response.transcript if response else None,
-            "score": response.score if response else None,
-            "feedback": response.ai_feedback if response else None
-        })
+    async for entry in entries:
+        entry.pop("interview_id")
+        transcript.append(entry)
     
     return {
         "interview_id": interview_id,
         "transcript": transcript
     }
+
+@router.get("/transcripts/job/{job_id}")
+async def export_job_transcripts(
+    job_id: int,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Export the transcripts of every interview for a job
+
+    `format=ndjson` streams one line per interview instead of a single document.
+    """
+    job = (await db.execute(
+        select(Job.id).where(
+            Job.id == job_id,
+            Job.company_id == current_user.id
+        )
+    )).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    interviews = stream_interview_transcripts(db, Interview.job_id == job_id)
+    if format == "ndjson":
+        return StreamingResponse(to_ndjson_async(interviews), media_type="application/x-ndjson")
+    
+    return {
+        "job_id": job_id,
+        "interviews": [interview async for interview in interviews]
+    }
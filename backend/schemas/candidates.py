@@ -48,6 +48,24 @@ class CandidateResponse(CandidateBase):
     class Config:
         orm_mode = True
 
+class CandidateSearchResult(CandidateResponse):
+    score: float
+
+class SkillFacet(BaseModel):
+    value: str
+    count: int
+
+class CandidateSearchFacets(BaseModel):
+    skills: List[SkillFacet]
+
+class CandidateSearchResponse(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    results: List[CandidateSearchResult]
+    facets: CandidateSearchFacets
+
 class ResumeAnalysis(BaseModel):
     match: float
     feedback: str
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import os
+import zipfile
+
+import json
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from models.models import Base, Candidate, Job, QueuedTask, User
+from utils import bulk_ingest
+from utils.bulk_ingest import bulk_status, ingest_files, save_bulk_upload
+from utils.file_utils import RESUME_DIR
+
+
+def zip_upload(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename="resumes.zip")
+
+def test_zip_members_are_extracted_under_generated_names(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload = zip_upload({"a/ada.pdf": b"%PDF-1", "../grace.pdf": b"%PDF-2", "notes.txt": b"skip"})
+    files = asyncio.run(save_bulk_upload([upload, UploadFile(file=io.BytesIO(b"%PDF-3"), filename="alan.pdf")]))
+
+    assert [f["filename"] for f in files] == ["ada.pdf", "grace.pdf", "alan.pdf"]
+    assert sorted(open(f["path"], "rb").read() for f in files) == [b"%PDF-1", b"%PDF-2", b"%PDF-3"]
+    assert all(os.path.dirname(f["path"]) == RESUME_DIR for f in files)
+
+@pytest.mark.parametrize("setting, value", [
+    ("BULK_INGEST_MAX_FILES", 2),
+    ("BULK_INGEST_MAX_FILE_BYTES", 1000),
+    ("BULK_INGEST_MAX_BYTES", 5000),
+])
+def test_limits_are_checked_before_anything_is_extracted(tmp_path, monkeypatch, setting, value):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, setting, value)
+    # Compresses to a few bytes each but inflates to 3000 bytes
+    upload = zip_upload({f"{i}.pdf": b"\0" * 3000 for i in range(3)})
+
+    with pytest.raises(ValueError):
+        asyncio.run(save_bulk_upload([upload]))
+    assert not os.path.exists(RESUME_DIR) or os.listdir(RESUME_DIR) == []
+
+def test_an_interrupted_ingestion_resumes_where_it_stopped(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    job = Job(title="Backend", description="", company_id=user.id)
+    db.add(job)
+    db.flush()
+    # Ingested by an earlier attempt before its worker died
+    db.add(Candidate(first_name="Ada", last_name="Doe", email="ada@example.com", company_id=user.id,
+                     job_id=job.id, resume_url="uploads/resumes/ada.pdf"))
+    payload = {"job_id": job.id, "company_id": user.id, "files": [
+        {"filename": name, "path": f"uploads/resumes/{name}"} for name in ("ada.pdf", "grace.pdf", "broken.pdf")
+    ]}
+    task = QueuedTask(kind="bulk_ingest", payload=payload, company_id=user.id, status="running", attempts=2, max_attempts=3)
+    db.add(task)
+    db.commit()
+
+    assert [f["status"] for f in bulk_status(db, task)["files"]] == ["succeeded", "pending", "pending"]
+
+    extracted = []
+    async def get_resume_details(db, path):
+        extracted.append(path)
+        if path.endswith("broken.pdf"):
+            raise ValueError("Unreadable PDF")
+        return json.dumps({"name": "Grace Hopper", "email": "grace@example.com", "resume_text": "COBOL"}), False
+    monkeypatch.setattr(bulk_ingest, "get_resume_details", get_resume_details)
+
+    task.result = asyncio.run(ingest_files(payload, session_factory))
+    task.status = "succeeded"
+    db.commit()
+
+    assert extracted == ["uploads/resumes/grace.pdf", "uploads/resumes/broken.pdf"]
+    assert db.query(Candidate).filter(Candidate.job_id == job.id).count() == 2
+    status = bulk_status(db, task)
+    assert [f["status"] for f in status["files"]] == ["succeeded", "succeeded", "failed"]
+    assert (status["succeeded"], status["failed"], status["progress"]) == (2, 1, 100.0)
@@ -0,0 +1,88 @@
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Candidate, Interview, InterviewQuestion, Job, User, VideoResponse
+from utils.db_pool import enable_sqlite_foreign_keys
+from utils.file_utils import delete_upload_files, upload_path
+
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cascade.db'}")
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def test_deleting_a_job_cascades_in_the_database(tmp_path):
+    db = make_session(tmp_path)
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    jobs = [Job(title=title, description="", company_id=user.id) for title in ("Backend", "Design")]
+    db.add_all(jobs)
+    db.flush()
+    for job in jobs:
+        candidate = Candidate(first_name="Ada", last_name="Doe", email="ada@example.com", company_id=user.id, job_id=job.id)
+        db.add(candidate)
+        db.flush()
+        interview = Interview(job_id=job.id, candidate_id=candidate.id, access_code=f"code-{job.id}")
+        db.add(interview)
+        db.flush()
+        question = InterviewQuestion(interview_id=interview.id, question="Why?", question_type="behavioral", order_number=1)
+        db.add(question)
+        db.flush()
+        db.add(VideoResponse(interview_id=interview.id, question_id=question.id))
+    db.commit()
+
+    db.delete(jobs[0])
+    db.commit()
+
+    for model in (Candidate, Interview, InterviewQuestion, VideoResponse):
+        assert db.query(model).count() == 1
+    assert db.query(Candidate.job_id).scalar() == jobs[1].id
+
+def test_upload_paths_stay_inside_the_upload_directory():
+    root = os.path.realpath("uploads")
+    assert upload_path("/uploads/videos/a.mp4") == os.path.join(root, "videos", "a.mp4")
+    assert upload_path("/resumes/a.pdf") == os.path.join(root, "resumes", "a.pdf")
+    assert upload_path("uploads/resumes/a.pdf") == os.path.join(root, "resumes", "a.pdf")
+    assert upload_path("/uploads/logos/a.png") is None
+    assert upload_path("/uploads/videos/../../etc/passwd") is None
+    assert upload_path("https://cdn.example.com/a.mp4") is None
+    assert upload_path(None) is None
+
+def test_delete_upload_files_counts_missing_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = make_session(tmp_path)
+    os.makedirs("uploads/videos")
+    with open("uploads/videos/a.mp4", "w") as video:
+        video.write("video")
+
+    result = delete_upload_files(db, ["/uploads/videos/a.mp4", "/uploads/videos/b.mp4", "/uploads/../x"])
+    assert result == {"removed": 1, "missing": 1, "skipped": 1}
+    assert not os.path.exists("uploads/videos/a.mp4")
+
+def test_uploads_other_rows_use_are_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = make_session(tmp_path)
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    job = Job(title="Backend", description="", company_id=user.id)
+    db.add(job)
+    db.flush()
+    db.add(Candidate(first_name="Ada", last_name="Doe", email="ada@example.com", company_id=user.id,
+                     job_id=job.id, resume_url="uploads/resumes/shared.pdf"))
+    db.commit()
+    os.makedirs("uploads/resumes")
+    os.makedirs("uploads/logos")
+    for path in ("uploads/resumes/shared.pdf", "uploads/resumes/own.pdf", "uploads/logos/logo.png"):
+        with open(path, "w") as upload:
+            upload.write("file")
+
+    result = delete_upload_files(db, ["/uploads/resumes/shared.pdf", "/uploads/resumes/own.pdf", "/uploads/logos/logo.png"])
+    assert result == {"removed": 1, "missing": 0, "skipped": 2}
+    assert os.path.exists("uploads/resumes/shared.pdf")
+    assert not os.path.exists("uploads/resumes/own.pdf")
+    assert os.path.exists("uploads/logos/logo.png")
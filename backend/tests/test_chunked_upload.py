@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from utils.chunked_upload import (
+    HTTP_CHECKSUM_MISMATCH, abort_upload, create_upload, finalize_upload, get_upload,
+    purge_expired_uploads, write_chunk
+)
+
+
+def checksum(data, algorithm="sha256"):
+    return f"{algorithm} {base64.b64encode(hashlib.new(algorithm, data).digest()).decode()}"
+
+def test_interrupted_upload_resumes_from_its_offset(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = os.urandom(10_000)
+    upload = create_upload("interview:1", len(data), "answer.webm")
+    upload_id = upload["upload_id"]
+    assert upload["file_key"].endswith(".webm")
+
+    write_chunk("interview:1", upload_id, 0, data[:4000], checksum(data[:4000]))
+    # The client lost the response and only knows what the server reports
+    offset = get_upload("interview:1", upload_id)["offset"]
+    assert offset == 4000
+
+    with pytest.raises(HTTPException) as error:
+        write_chunk("interview:1", upload_id, 0, data[:4000], checksum(data[:4000]))
+    assert error.value.status_code == 409
+    assert error.value.headers["Upload-Offset"] == "4000"
+
+    with pytest.raises(HTTPException) as error:
+        finalize_upload("interview:1", upload_id)
+    assert error.value.status_code == 409
+
+    write_chunk("interview:1", upload_id, offset, data[offset:], checksum(data[offset:], "md5"))
+    result = finalize_upload("interview:1", upload_id)
+    assert result["size"] == len(data)
+    with open(result["video_url"].lstrip("/"), "rb") as video:
+        assert video.read() == data
+    assert os.listdir("upload_parts") == []
+
+def test_chunks_are_verified_before_writing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_id = create_upload("interview:1", 100)["upload_id"]
+
+    with pytest.raises(HTTPException) as error:
+        write_chunk("interview:1", upload_id, 0, b"x" * 10, checksum(b"y" * 10))
+    assert error.value.status_code == HTTP_CHECKSUM_MISMATCH
+    with pytest.raises(HTTPException) as error:
+        write_chunk("interview:1", upload_id, 0, b"x" * 10, "crc32 AAAA")
+    assert error.value.status_code == 400
+    with pytest.raises(HTTPException) as error:
+        write_chunk("interview:1", upload_id, 0, b"x" * 200, checksum(b"x" * 200))
+    assert error.value.status_code == 413
+    assert get_upload("interview:1", upload_id)["offset"] == 0
+
+def test_uploads_are_private_and_expire(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_id = create_upload("interview:1", 100)["upload_id"]
+    for upload_id_or_path in (upload_id, "../../etc/passwd"):
+        with pytest.raises(HTTPException) as error:
+            get_upload("interview:2", upload_id_or_path)
+        assert error.value.status_code == 404
+
+    assert purge_expired_uploads(datetime.utcnow() + timedelta(days=2)) == 1
+    assert os.listdir("upload_parts") == []
+
+    upload_id = create_upload("interview:1", 100)["upload_id"]
+    abort_upload("interview:1", upload_id)
+    assert os.listdir("upload_parts") == []
@@ -0,0 +1,56 @@
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Job, PublicInterviewLink, User
+from utils.counters import CounterBuffer
+
+
+def make_link(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    job = Job(title="Backend", description="", company_id=user.id)
+    db.add(job)
+    db.flush()
+    link = PublicInterviewLink(job_id=job.id, name="Careers page", access_code="abc", visits=3)
+    db.add(link)
+    db.commit()
+    return session_factory, db, link.id
+
+def test_concurrent_increments_are_flushed_atomically(tmp_path):
+    session_factory, db, link_id = make_link(tmp_path)
+    counters = CounterBuffer(PublicInterviewLink, ("visits", "started_interviews"), session_factory=session_factory)
+
+    def visit():
+        for _ in range(250):
+            counters.incr(link_id, "visits")
+    threads = [threading.Thread(target=visit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counters.incr(link_id, "started_interviews", 2)
+
+    assert counters.pending(link_id) == {"visits": 1000, "started_interviews": 2}
+    assert counters.flush() == 1
+    assert counters.pending(link_id) == {"visits": 0, "started_interviews": 0}
+    assert counters.flush() == 0
+
+    link = db.get(PublicInterviewLink, link_id)
+    assert (link.visits, link.started_interviews) == (1003, 2)
+    assert counters.stats()["flushed_increments"] == 1002
+
+def test_failed_flush_keeps_increments(tmp_path):
+    session_factory, _, link_id = make_link(tmp_path)
+    counters = CounterBuffer(PublicInterviewLink, ("visits",), session_factory=session_factory)
+    counters.incr(link_id, "visits")
+    PublicInterviewLink.__table__.drop(bind=session_factory.kw["bind"])
+    assert counters.flush() == 0
+    assert counters.pending(link_id) == {"visits": 1}
+    assert counters.stats()["failures"] == 1
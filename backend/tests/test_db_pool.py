@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from utils.db_pool import MonitoredQueuePool, PoolMonitor, engine_options
+
+
+def test_engine_options_skip_sqlite():
+    assert engine_options("sqlite:///./app.db") == {}
+    options = engine_options("postgresql://localhost/app")
+    assert options["poolclass"] is MonitoredQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= set(options)
+
+def test_monitor_reports_saturation_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MonitoredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    monitor = PoolMonitor()
+    monitor.attach(engine)
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        stats = monitor.stats()
+        assert stats["checked_out"] == 1
+        assert stats["saturation"] == 1.0
+    stats = monitor.stats()
+    assert (stats["checkouts"], stats["connects"], stats["timeouts"]) == (1, 1, 1)
+    assert stats["checkout_wait"]["max"] >= 0.05
@@ -0,0 +1,84 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Candidate, Interview, Job, JobStats, User
+from utils.dashboard import dashboard_summary
+from utils.job_stats import aggregate_job_stats, job_stats_for, stats_dict
+from utils.ttl_cache import response_cache
+
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def seed(db):
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    jobs = [Job(title=title, description="", company_id=user.id) for title in ("Backend", "Design")]
+    db.add_all(jobs)
+    db.flush()
+    candidates = [
+        Candidate(first_name=f"C{n}", last_name="Doe", email=f"c{n}@example.com",
+                  company_id=user.id, job_id=jobs[0].id, status=status)
+        for n, status in enumerate(["new", "new", "reviewing", "hired"])
+    ]
+    db.add_all(candidates)
+    db.commit()
+    return jobs, candidates
+
+def test_aggregate_counts_by_status(tmp_path):
+    db = make_session(tmp_path)
+    jobs, _ = seed(db)
+    counts = aggregate_job_stats(db, [job.id for job in jobs])
+    assert counts[jobs[0].id]["candidates_total"] == 4
+    assert counts[jobs[0].id]["candidates_new"] == 2
+    assert counts[jobs[1].id]["candidates_total"] == 0
+
+def test_flush_listener_keeps_rows_in_sync(tmp_path):
+    db = make_session(tmp_path)
+    jobs, candidates = seed(db)
+    job_stats_for(db, jobs)
+
+    candidates[0].status = "rejected"
+    candidates[1].job_id = jobs[1].id
+    db.delete(candidates[3])
+    db.add(Interview(job_id=jobs[0].id, candidate_id=candidates[2].id, access_code="abc"))
+    db.commit()
+
+    maintained = {job_id: stats_dict(row) for job_id, row in job_stats_for(db, jobs).items()}
+    recomputed = {job_id: stats_dict(row) for job_id, row in job_stats_for(db, jobs, refresh=True).items()}
+    assert maintained == recomputed
+    assert maintained[jobs[0].id]["candidates"]["rejected"] == 1
+    assert maintained[jobs[0].id]["interviews"] == {"total": 1, "pending": 1, "completed": 0}
+    assert maintained[jobs[1].id]["candidates"]["total"] == 1
+
+def test_recomputing_rows_leaves_the_callers_transaction_alone(tmp_path):
+    db = make_session(tmp_path)
+    jobs, candidates = seed(db)
+    candidates[0].first_name = "Uncommitted"
+
+    assert stats_dict(job_stats_for(db, jobs)[jobs[0].id])["candidates"]["total"] == 4
+    db.rollback()
+    assert candidates[0].first_name == "C0"
+    assert db.query(JobStats).count() == 2
+
+def test_dashboard_summary_is_cached_until_commit(tmp_path):
+    db = make_session(tmp_path)
+    jobs, candidates = seed(db)
+    response_cache.clear()
+    candidates[0].resume_match_score = 60
+    candidates[1].resume_match_score = 90
+    db.commit()
+
+    summary = dashboard_summary(db, jobs[0].company_id)
+    assert summary["totals"]["jobs"] == 2
+    assert summary["totals"]["candidates"]["total"] == 4
+    assert summary["jobs"][0]["avg_resume_match_score"] == 75.0
+    assert summary["jobs"][1]["public_links"]["visits"] == 0
+    assert dashboard_summary(db, jobs[0].company_id) is summary
+
+    candidates[2].status = "hired"
+    db.commit()
+    assert dashboard_summary(db, jobs[0].company_id)["totals"]["candidates"]["hired"] == 2
@@ -0,0 +1,36 @@
+import asyncio
+
+from utils.llm_cache import LLMCache, MemoryCacheBackend, make_cache_key
+
+
+def test_cache_key_is_stable_and_parameter_sensitive():
+    messages = [{"role": "user", "content": "Extract this resume"}]
+    key = make_cache_key("gpt-3.5-turbo", messages, {"temperature": 0.1})
+    assert key == make_cache_key("gpt-3.5-turbo", list(messages), {"temperature": 0.1})
+    assert key != make_cache_key("gpt-3.5-turbo", messages, {"temperature": 0.2})
+    assert key != make_cache_key("gpt-4", messages, {"temperature": 0.1})
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = LLMCache(MemoryCacheBackend(max_entries=2), ttl=None)
+
+    async def run():
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"
+        await cache.set("c", "3")
+        return await cache.get("b"), await cache.get("a"), await cache.get("c")
+
+    assert asyncio.run(run()) == (None, "1", "3")
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+def test_memory_backend_expires_entries():
+    cache = LLMCache(MemoryCacheBackend(max_entries=10), ttl=-1)
+
+    async def run():
+        await cache.set("a", "1")
+        return await cache.get("a")
+
+    assert asyncio.run(run()) is None
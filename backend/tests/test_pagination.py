@@ -0,0 +1,53 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from models.models import User
+from schemas.users import UserResponse
+from utils.pagination import decode_cursor, encode_cursor, paginate, select_fields
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(42)) == 42
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")
+
+def test_paginate_walks_all_rows_without_overlap(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    User.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([User(email=f"u{i}@x.com", password_hash="x") for i in range(7)])
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(db.query(User), User.id, 3, cursor)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            break
+    assert seen == sorted(seen) == list(range(1, 8))
+    db.close()
+
+def test_select_fields_validates_against_schema_columns():
+    assert select_fields(User, UserResponse, None) is None
+    assert select_fields(User, UserResponse, "email, id,email") == ["id", "email"]
+    with pytest.raises(HTTPException):
+        select_fields(User, UserResponse, "password_hash")
+
+def test_paginate_without_limit_or_cursor_returns_every_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DEFAULT_PAGE_SIZE", 2)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    User.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([User(email=f"u{i}@x.com", password_hash="x") for i in range(5)])
+    db.commit()
+
+    rows, cursor = paginate(db.query(User), User.id, None, None)
+    assert [row.id for row in rows] == [1, 2, 3, 4, 5]
+    assert cursor is None
+    rows, cursor = paginate(db.query(User), User.id, None, encode_cursor(1))
+    assert [row.id for row in rows] == [2, 3]
+    assert cursor is not None
+    db.close()
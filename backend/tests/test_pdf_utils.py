@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+from config import settings
+from utils import pdf_utils
+
+
+def fake_extract(path, max_pages):
+    time.sleep(30 if path == "stuck.pdf" else 0.8)
+    return f"text of {path}"
+
+def test_a_timeout_does_not_fail_other_extractions(monkeypatch):
+    monkeypatch.setattr(pdf_utils, "_extract_pdf_text", fake_extract)
+    monkeypatch.setattr(settings, "PDF_EXTRACTION_WORKERS", 3)
+    monkeypatch.setattr(settings, "PDF_EXTRACTION_TIMEOUT_SECONDS", 1.0)
+
+    async def extract_later(path):
+        # Still running on the pool when stuck.pdf times out
+        await asyncio.sleep(0.5)
+        return await pdf_utils.extract_pdf_text(path)
+
+    async def main():
+        return await asyncio.gather(
+            pdf_utils.extract_pdf_text("stuck.pdf"),
+            extract_later("a.pdf"),
+            extract_later("b.pdf"),
+            return_exceptions=True
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        pdf_utils.shutdown_executor()
+    assert isinstance(results[0], asyncio.TimeoutError)
+    assert results[1:] == ["text of a.pdf", "text of b.pdf"]
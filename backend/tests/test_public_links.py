@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Job, PublicInterviewLink, User
+from utils.public_links import format_compensation, invalidate_job_public_links, resolve_public_link
+from utils.ttl_cache import response_cache
+
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'links.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def test_format_compensation():
+    assert format_compensation(SimpleNamespace(show_salary=False, salary_min=1, salary_max=2)) == "Not specified"
+    assert format_compensation(SimpleNamespace(show_salary=True, salary_min=50000, salary_max=70000)) == "$50,000 - $70,000"
+    assert format_compensation(SimpleNamespace(show_salary=True, salary_min=None, salary_max=9000)) == "Up to $9,000"
+
+def test_resolve_public_link_is_cached_until_invalidated(tmp_path):
+    db = make_session(tmp_path)
+    response_cache.clear()
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    job = Job(title="Backend", description="", company_id=user.id)
+    db.add(job)
+    db.flush()
+    db.add(PublicInterviewLink(job_id=job.id, name="Careers page", access_code="abc", visits=0))
+    db.commit()
+
+    pytest.importorskip("aiosqlite")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'links.db'}")
+
+    async def resolve(access_code):
+        async with async_sessionmaker(async_engine)() as async_db:
+            return await resolve_public_link(async_db, access_code)
+
+    async def run():
+        payload = await resolve("abc")
+        assert payload["job"]["company"]["name"] == "Acme"
+        assert payload["is_active"] is True
+
+        job.title = "Platform"
+        db.commit()
+        assert (await resolve("abc"))["job"]["title"] == "Backend"
+        invalidate_job_public_links(job.id)
+        assert (await resolve("abc"))["job"]["title"] == "Platform"
+
+        with pytest.raises(HTTPException) as error:
+            await resolve("missing")
+        assert error.value.status_code == 404
+        await async_engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,30 @@
+import numpy as np
+
+from utils.ranking import hash_vector, rank_texts, tokenize
+
+
+def test_tokenize_keeps_technical_terms():
+    assert tokenize("Senior C++ / C# developer for Node.js") == ["senior", "c++", "c#", "developer", "node", "js"]
+
+def test_hash_vector_is_deterministic():
+    first = hash_vector("python django postgres", dim=256)
+    assert first.shape == (256,)
+    assert np.array_equal(first, hash_vector("python django postgres", dim=256))
+    assert not np.any(hash_vector("", dim=256))
+
+def test_rank_texts_orders_relevant_resumes_first():
+    job = "Backend engineer with Python, Django and PostgreSQL experience"
+    resumes = [
+        "Graphic designer skilled in Photoshop and Illustrator",
+        "Python developer building Django REST APIs on PostgreSQL",
+        "Java engineer working with Spring and Oracle",
+        "",
+    ]
+    scores = rank_texts(job, resumes)
+    assert scores.shape == (4,)
+    assert int(np.argmax(scores)) == 1
+    assert scores[3] == 0
+    assert np.all((scores >= 0) & (scores <= 1))
+
+def test_rank_texts_handles_no_candidates():
+    assert rank_texts("anything", []).shape == (0,)
@@ -0,0 +1,63 @@
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Candidate, Job, User
+from utils.search import _skill_names, ensure_search_index, search_candidates, to_fts5_query
+
+
+def test_to_fts5_query_quotes_terms_and_phrases():
+    assert to_fts5_query("kubernetes") == '"kubernetes"'
+    assert to_fts5_query("React + GraphQL") == '"React" AND "GraphQL"'
+    assert to_fts5_query('"machine learning" python') == '"machine learning" AND "python"'
+
+def test_to_fts5_query_supports_or_and_exclusions():
+    assert to_fts5_query("pytorch OR tensorflow docker") == '("pytorch" OR "tensorflow") AND "docker"'
+    assert to_fts5_query("react -java") == '"react" NOT "java"'
+    assert to_fts5_query("-java") == ""
+    assert to_fts5_query("+++") == ""
+
+def test_skill_names_flattens_lists_and_categories():
+    assert _skill_names('["Python", " SQL "]') == ["python", "sql"]
+    assert _skill_names('{"technical": ["Go"], "soft": ["Leadership"]}') == ["go", "leadership"]
+    assert _skill_names("not json") == []
+    assert _skill_names(None) == []
+
+def seed_candidates(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    db = sessionmaker(bind=engine)()
+    companies = [User(email=f"hr{n}@example.com", password_hash="x", company_name=f"Acme{n}") for n in range(2)]
+    db.add_all(companies)
+    db.flush()
+    jobs = [Job(title="Backend", description="", company_id=company.id) for company in companies]
+    db.add_all(jobs)
+    db.flush()
+    for name, company, resume_text, skills in [
+        ("Ada", 0, "Python services and a little Python tooling", ["Python", "SQL"]),
+        ("Grace", 0, "Mentioned python once", ["COBOL"]),
+        ("Alan", 0, "Go and Rust", ["Go"]),
+        ("Linus", 1, "Python everywhere", ["Python"]),
+    ]:
+        db.add(Candidate(first_name=name, last_name="Doe", email=f"{name}@example.com", company_id=companies[company].id,
+                         job_id=jobs[company].id, resume_text=resume_text, skills=json.dumps(skills)))
+    db.commit()
+    return db, companies
+
+def test_search_candidates_ranks_within_the_company(tmp_path):
+    db, companies = seed_candidates(tmp_path)
+    result = search_candidates(db, companies[0].id, "python")
+
+    # A skill match outranks a passing mention; the other company's candidate is never seen
+    assert [row["first_name"] for row in result["results"]] == ["Ada", "Grace"]
+    assert result["total"] == 2
+    assert sorted(facet["value"] for facet in result["facets"]["skills"]) == ["cobol", "python", "sql"]
+
+def test_search_candidates_skill_facet_matches_whole_skills(tmp_path):
+    db, companies = seed_candidates(tmp_path)
+    assert [row["first_name"] for row in search_candidates(db, companies[0].id, "python", skills=["python"])["results"]] == ["Ada"]
+    # LIKE wildcards in the filter are taken literally
+    assert search_candidates(db, companies[0].id, "python", skills=["Pyth_n"])["total"] == 0
+    assert search_candidates(db, companies[0].id, "python", skills=["%"])["total"] == 0
@@ -0,0 +1,38 @@
+import asyncio
+
+from utils.openai_utils import SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "description"
+
+    async def run():
+        return await asyncio.gather(*[flight.do("same-key", upstream) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["description"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream failed")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("key", upstream),
+            flight.do("key", upstream),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["in_flight"] == 0
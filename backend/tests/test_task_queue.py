@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import settings
+from models.models import QueuedTask
+from utils.task_queue import TaskWorker, enqueue, queue_stats, task_handler
+
+
+def make_session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}", connect_args={"check_same_thread": False})
+    QueuedTask.__table__.create(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def test_worker_runs_task_and_stores_result(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+
+    @task_handler("test_double")
+    async def double(payload):
+        return {"value": payload["value"] * 2}
+
+    db = session_factory()
+    task = enqueue(db, "test_double", {"value": 21}, company_id=7)
+
+    worker = TaskWorker(session_factory=session_factory)
+    assert asyncio.run(worker.run_one("test")) is True
+    assert asyncio.run(worker.run_one("test")) is False
+
+    db.expire_all()
+    stored = db.query(QueuedTask).filter(QueuedTask.id == task.id).first()
+    assert stored.status == "succeeded"
+    assert stored.attempts == 1
+    assert stored.result == {"value": 42}
+    assert stored.company_id == 7
+    assert queue_stats(session_factory) == {"succeeded": 1}
+    db.close()
+
+def test_failed_task_is_retried_then_marked_failed(tmp_path, monkeypatch):
+    session_factory = make_session_factory(tmp_path)
+    monkeypatch.setattr("utils.task_queue.retry_delay", lambda attempts: -1)
+
+    @task_handler("test_flaky")
+    async def flaky(payload):
+        raise RuntimeError("upstream unavailable")
+
+    db = session_factory()
+    task = enqueue(db, "test_flaky", {}, max_attempts=2)
+
+    worker = TaskWorker(session_factory=session_factory)
+    asyncio.run(worker.run_one("test"))
+    db.expire_all()
+    stored = db.query(QueuedTask).filter(QueuedTask.id == task.id).first()
+    assert stored.status == "queued"
+    assert "upstream unavailable" in stored.error
+
+    asyncio.run(worker.run_one("test"))
+    db.expire_all()
+    stored = db.query(QueuedTask).filter(QueuedTask.id == task.id).first()
+    assert stored.status == "failed"
+    assert stored.attempts == 2
+    assert stored.finished_at is not None
+    db.close()
+
+def test_unknown_task_kind_fails_without_retry(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+    db = session_factory()
+    task = enqueue(db, "does_not_exist", {})
+
+    asyncio.run(TaskWorker(session_factory=session_factory).run_one("test"))
+    db.expire_all()
+    stored = db.query(QueuedTask).filter(QueuedTask.id == task.id).first()
+    assert stored.status == "failed"
+    assert "No handler registered" in stored.error
+    db.close()
+
+def test_expired_lease_is_requeued_until_attempts_run_out(tmp_path):
+    session_factory = make_session_factory(tmp_path)
+    db = session_factory()
+    stale = datetime.utcnow() - timedelta(seconds=settings.TASK_LEASE_SECONDS + 1)
+    retried = enqueue(db, "does_not_exist", {}, run_after=datetime.utcnow() + timedelta(hours=1))
+    exhausted = enqueue(db, "does_not_exist", {}, max_attempts=2)
+    db.query(QueuedTask).update({"status": "running", "locked_at": stale, "locked_by": "dead"})
+    db.query(QueuedTask).filter(QueuedTask.id == exhausted.id).update({"attempts": 2})
+    db.commit()
+
+    assert asyncio.run(TaskWorker(session_factory=session_factory).run_one("test")) is False
+    db.expire_all()
+    assert db.get(QueuedTask, retried.id).status == "queued"
+    stored = db.get(QueuedTask, exhausted.id)
+    assert stored.status == "failed"
+    assert "lease expired" in stored.error
+    db.close()
+
+def test_running_task_keeps_its_lease(tmp_path, monkeypatch):
+    session_factory = make_session_factory(tmp_path)
+    monkeypatch.setattr(settings, "TASK_LEASE_SECONDS", 0.15)
+    lease_ages = []
+
+    @task_handler("test_slow")
+    async def slow(payload):
+        for _ in range(4):
+            await asyncio.sleep(0.1)
+            db = session_factory()
+            lease_ages.append((datetime.utcnow() - db.get(QueuedTask, task.id).locked_at).total_seconds())
+            db.close()
+
+    db = session_factory()
+    task = enqueue(db, "test_slow", {})
+    asyncio.run(TaskWorker(session_factory=session_factory).run_one("test"))
+    assert max(lease_ages) < settings.TASK_LEASE_SECONDS
+    db.expire_all()
+    assert db.get(QueuedTask, task.id).status == "succeeded"
+    db.close()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import Base, Candidate, Interview, InterviewQuestion, Job, User, VideoResponse
+from utils import transcripts
+from utils.transcripts import stream_interview_transcripts, stream_transcript_entries, to_ndjson_async
+
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'transcripts.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def collect(tmp_path, stream, *criteria):
+    """Run a transcript stream against the test database through an async session"""
+    pytest.importorskip("aiosqlite")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'transcripts.db'}")
+
+    async def run():
+        try:
+            async with async_sessionmaker(async_engine)() as async_db:
+                return [item async for item in stream(async_db, *criteria)]
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+def seed(db):
+    user = User(email="hr@example.com", password_hash="x", company_name="Acme")
+    db.add(user)
+    db.flush()
+    job = Job(title="Backend Engineer", description="Python", company_id=user.id)
+    db.add(job)
+    db.flush()
+    interviews = []
+    for n in range(2):
+        candidate = Candidate(first_name=f"Ada{n}", last_name="Lovelace", email=f"ada{n}@example.com",
+                              company_id=user.id, job_id=job.id)
+        db.add(candidate)
+        db.flush()
+        interview = Interview(job_id=job.id, candidate_id=candidate.id, status="completed", access_code=f"code{n}")
+        db.add(interview)
+        db.flush()
+        for order in (1, 0):
+            question = InterviewQuestion(interview_id=interview.id, question=f"Q{order}",
+                                         question_type="technical", order_number=order)
+            db.add(question)
+            db.flush()
+            if order == 0:
+                db.add(VideoResponse(interview_id=interview.id, question_id=question.id,
+                                     transcript="first", score=8.0, feedback="clear"))
+                db.add(VideoResponse(interview_id=interview.id, question_id=question.id, transcript="retake"))
+        interviews.append(interview)
+    db.commit()
+    return job, interviews
+
+def test_entries_are_ordered_and_keep_first_response(tmp_path):
+    db = make_session(tmp_path)
+    _, interviews = seed(db)
+    entries = collect(tmp_path, stream_transcript_entries, Interview.id == interviews[0].id)
+    assert [entry["order"] for entry in entries] == [0, 1]
+    assert entries[0]["response_text"] == "first"
+    assert entries[0]["feedback"] == "clear"
+    assert entries[1]["response_text"] is None
+
+def test_interview_transcripts_group_by_interview(tmp_path, monkeypatch):
+    # Interviews span several fetched partitions
+    monkeypatch.setattr(transcripts, "STREAM_BATCH_SIZE", 2)
+    db = make_session(tmp_path)
+    job, interviews = seed(db)
+    exported = collect(tmp_path, stream_interview_transcripts, Interview.job_id == job.id)
+    assert [item["interview_id"] for item in exported] == [interview.id for interview in interviews]
+    assert exported[0]["candidate_name"] == "Ada0 Lovelace"
+    assert [len(item["transcript"]) for item in exported] == [2, 2]
+
+def test_ndjson_has_one_line_per_item(tmp_path):
+    db = make_session(tmp_path)
+    _, interviews = seed(db)
+
+    async def ndjson(async_db, *criteria):
+        async for line in to_ndjson_async(stream_transcript_entries(async_db, *criteria)):
+            yield line
+
+    lines = collect(tmp_path, ndjson, Interview.id == interviews[1].id)
+    assert all(line.endswith("\n") for line in lines)
+    assert [json.loads(line)["question"] for line in lines] == ["Q0", "Q1"]
@@ -0,0 +1,34 @@
+from utils.ttl_cache import TTLCache
+
+
+def test_get_returns_fresh_entries_and_expires_stale_ones():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("fresh", 1)
+    cache.set("stale", 2, ttl=-1)
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_invalidate_drops_only_tagged_entries():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("jobs:1", "a", tags=["public_jobs"])
+    cache.set("jobs:2", "b", tags=["public_jobs", "company:2"])
+    cache.set("other", "c", tags=["company:3"])
+    cache.invalidate("public_jobs")
+    assert cache.get("jobs:1") is None
+    assert cache.get("jobs:2") is None
+    assert cache.get("other") == "c"
+    assert cache.stats()["invalidations"] == 2
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1, tags=["t"])
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    cache.invalidate("t")
+    assert cache.get("a") is None
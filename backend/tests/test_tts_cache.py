@@ -0,0 +1,30 @@
+import asyncio
+import os
+import time
+
+from utils.tts_cache import TTSCache
+
+
+def test_key_depends_on_voice_model_and_instructions():
+    key = TTSCache.make_key("Tell me about yourself", "coral", "gpt-4o-mini-tts", "Speak as an interviewer")
+    assert key == TTSCache.make_key("Tell me about yourself", "coral", "gpt-4o-mini-tts", "Speak as an interviewer")
+    assert key != TTSCache.make_key("Tell me about yourself", "alloy", "gpt-4o-mini-tts", "Speak as an interviewer")
+    assert key != TTSCache.make_key("Tell me about yourself", "coral", "tts-1", "Speak as an interviewer")
+    assert key != TTSCache.make_key("Tell me about yourself", "coral", "gpt-4o-mini-tts", None)
+
+def test_round_trip_and_size_bounded_eviction(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=250)
+
+    async def run():
+        await cache.put("aa01", b"x" * 100)
+        old_path = cache.path_for("aa01")
+        os.utime(old_path, (time.time() - 60, time.time() - 60))
+        await cache.put("bb02", b"y" * 100)
+        assert await cache.get("bb02") == b"y" * 100
+        await cache.put("cc03", b"z" * 100)
+
+    asyncio.run(run())
+    assert not cache.contains("aa01")
+    assert cache.contains("bb02")
+    assert cache.contains("cc03")
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,73 @@
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.models import TextVector
+from utils.ranking import sparse_hash_vector
+from utils.vector_index import VectorIndex, decode_vector, encode_vector
+
+
+def vector(text):
+    return sparse_hash_vector(text, 512)
+
+def make_index():
+    index = VectorIndex("candidate", dim=512)
+    index.put(1, 10, vector("python django postgresql backend"))
+    index.put(2, 10, vector("photoshop illustrator graphic design"))
+    index.put(3, 10, vector("python data science pandas"))
+    index.put(4, 20, vector("python django postgresql backend"))
+    return index
+
+def test_search_is_scoped_to_company_and_ordered():
+    index = make_index()
+    hits = index.search(10, vector("django backend developer"))
+    assert [entity_id for entity_id, _ in hits][0] == 1
+    assert {entity_id for entity_id, _ in hits} == {1, 2, 3}
+    assert index.search(30, vector("django")) == []
+
+def test_search_respects_k_and_entity_filter():
+    index = make_index()
+    query = vector("python")
+    assert len(index.search(10, query, k=2)) == 2
+    assert [entity_id for entity_id, _ in index.search(10, query, entity_ids=[2, 3])] == [3, 2]
+    assert 1 not in {entity_id for entity_id, _ in index.search(10, query, exclude_id=1)}
+
+def test_put_overwrites_moves_and_removes_rows():
+    index = make_index()
+    index.put(2, 10, vector("django backend engineer"))
+    index.put(3, 20, vector("python data science pandas"))
+    index.remove(1)
+    hits = index.search(10, vector("django backend"))
+    assert [entity_id for entity_id, _ in hits] == [2]
+    assert len(index) == 3
+
+def test_stored_vectors_round_trip_compactly():
+    buckets, weights = vector("python django postgresql backend developer")
+    data = encode_vector((buckets, weights))
+    assert len(data) == 6 * len(buckets)
+    decoded_buckets, decoded_weights = decode_vector(data)
+    assert np.array_equal(decoded_buckets, buckets)
+    assert np.allclose(decoded_weights, weights, rtol=1e-3)
+
+def test_sync_loads_companies_lazily_and_drops_vectors_deleted_elsewhere(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'vectors.db'}")
+    TextVector.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for entity_id, company_id, text in [(1, 10, "python backend"), (2, 10, "python data"), (3, 20, "design")]:
+        db.add(TextVector(entity_type="candidate", entity_id=entity_id, company_id=company_id,
+                          text_hash="x", dim=512, vector=encode_vector(vector(text))))
+    db.commit()
+
+    index = VectorIndex("candidate", dim=512, max_companies=1)
+    index.sync(db, 10)
+    assert len(index) == 2
+    # Another worker deletes a vector; nothing tells this process
+    db.query(TextVector).filter(TextVector.entity_id == 1).delete()
+    db.commit()
+    index.sync(db, 10)
+    assert [entity_id for entity_id, _ in index.search(10, vector("python"))] == [2]
+
+    index.sync(db, 20)
+    assert len(index) == 1
+    assert index.search(10, vector("python")) == []
+    db.close()
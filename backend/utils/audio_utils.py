@@ -2,14 +2,10 @@ import logging
 from io import BytesIO
 import asyncio
 import io
-import openai
-from config import settings
+from utils import llm_gateway
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-
 async def prepare_audio_file(audio_content: bytes, filename: str) -> tuple[bytes, str]:
     """Prepare audio file for OpenAI's Whisper API"""
     try:
@@ -38,11 +34,7 @@ async def transcribe_audio(audio_blob: bytes, filename: str) -> str:
         audio_file.name = filename
         
         # Send to Whisper for transcription
-        result = await openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            language="en"
-        )
+        result = await llm_gateway.transcribe(audio_file, language="en")
         
         if not result or not result.text:
             logger.error("No transcription result received from OpenAI")
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import zipfile
+from typing import Any, BinaryIO, Callable, Dict, List, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Candidate, QueuedTask
+from utils.file_utils import generate_unique_filename, RESUME_DIR
+from utils.resume_utils import candidate_from_analysis, get_resume_details
+
+logger = logging.getLogger(__name__)
+
+
+def _default_session_factory():
+    # Imported lazily so uploads can be checked without a database (e.g. in tests)
+    from database import SessionLocal
+    return SessionLocal
+
+
+def _upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+def _plan_upload(upload: UploadFile) -> List[Tuple[str, int, Callable[[], BinaryIO]]]:
+    """(filename, size, opener) of every resume in an upload, read from headers only
+
+    Zip members are listed from the central directory, so nothing is
+    extracted before the limits are checked; zipfile then refuses to inflate
+    a member past the size its header declares.
+    """
+    filename = upload.filename or "resume.pdf"
+    if not filename.lower().endswith(".zip"):
+        return [(filename, _upload_size(upload), lambda: upload.file)]
+
+    archive = zipfile.ZipFile(upload.file)
+    return [
+        (os.path.basename(info.filename), info.file_size, lambda info=info: archive.open(info))
+        for info in archive.infolist()
+        # Generated names are used on disk, so archive paths are never trusted
+        if not info.is_dir() and info.filename.lower().endswith(".pdf")
+    ]
+
+
+def _check_limits(planned: List[Tuple[str, int, Callable[[], BinaryIO]]]) -> None:
+    if len(planned) > settings.BULK_INGEST_MAX_FILES:
+        raise ValueError(f"A bulk upload may contain at most {settings.BULK_INGEST_MAX_FILES} resumes")
+    for filename, size, _ in planned:
+        if size > settings.BULK_INGEST_MAX_FILE_BYTES:
+            raise ValueError(f"{filename} is larger than {settings.BULK_INGEST_MAX_FILE_BYTES} bytes")
+    if sum(size for _, size, _ in planned) > settings.BULK_INGEST_MAX_BYTES:
+        raise ValueError(f"A bulk upload may contain at most {settings.BULK_INGEST_MAX_BYTES} bytes of resumes")
+
+
+def _save_planned(planned: List[Tuple[str, int, Callable[[], BinaryIO]]]) -> List[Dict[str, str]]:
+    """Store every planned resume in the resume directory, removing them all on failure"""
+    os.makedirs(RESUME_DIR, exist_ok=True)
+    files = []
+    try:
+        for filename, _, opener in planned:
+            extension = filename.split(".")[-1] if "." in filename else "pdf"
+            path = os.path.join(RESUME_DIR, generate_unique_filename("resumes", extension))
+            files.append({"filename": filename, "path": path})
+            with opener() as source, open(path, "wb") as buffer:
+                shutil.copyfileobj(source, buffer)
+    except Exception:
+        remove_saved_files(files)
+        raise
+    return files
+
+
+def remove_saved_files(files: List[Dict[str, str]]) -> None:
+    for f in files:
+        if os.path.exists(f["path"]):
+            os.remove(f["path"])
+
+
+async def save_bulk_upload(uploads: List[UploadFile]) -> List[Dict[str, str]]:
+    """Check and store the resumes of a bulk upload; returns their filenames and stored paths"""
+    planned = []
+    for upload in uploads:
+        planned.extend(await asyncio.to_thread(_plan_upload, upload))
+    _check_limits(planned)
+    return await asyncio.to_thread(_save_planned, planned)
+
+
+def _existing_candidates(db: Session, job_id: int, paths: List[str]) -> Dict[str, int]:
+    """Candidate ids of the resumes already ingested, by stored path"""
+    rows = db.query(Candidate.resume_url, Candidate.id).filter(
+        Candidate.job_id == job_id,
+        Candidate.resume_url.in_(paths)
+    )
+    return {path: candidate_id for path, candidate_id in rows}
+
+
+def bulk_status(db: Session, task: QueuedTask) -> Dict[str, Any]:
+    """Progress and per-file status of a bulk ingestion task
+
+    Candidates are committed in batches as the task runs, so progress is read
+    from the candidates table until the task stores its per-file result.
+    """
+    payload = task.payload or {}
+    if task.result and "files" in task.result:
+        files = task.result["files"]
+    else:
+        ingested = _existing_candidates(db, payload["job_id"], [f["path"] for f in payload["files"]])
+        files = [
+            {
+                "filename": f["filename"],
+                "status": "succeeded" if f["path"] in ingested else "pending",
+                "candidate_id": ingested.get(f["path"]),
+                "error": None
+            }
+            for f in payload["files"]
+        ]
+    total = len(files)
+    succeeded = sum(1 for f in files if f["status"] == "succeeded")
+    failed = sum(1 for f in files if f["status"] == "failed")
+    return {
+        "id": task.id,
+        "job_id": payload["job_id"],
+        "status": task.status,
+        "total": total,
+        "processed": succeeded + failed,
+        "succeeded": succeeded,
+        "failed": failed,
+        "progress": round((succeeded + failed) / total * 100, 1) if total else 100.0,
+        "error": task.error,
+        "created_at": task.created_at,
+        "finished_at": task.finished_at,
+        "files": files
+    }
+
+
+def _insert_candidates(session_factory, pending: List[tuple]) -> None:
+    """Insert a batch of candidates in one transaction and record their ids"""
+    db = session_factory()
+    try:
+        candidates = [candidate for _, candidate in pending]
+        db.add_all(candidates)
+        db.commit()
+        for file_entry, candidate in pending:
+            file_entry["candidate_id"] = candidate.id
+            file_entry["status"] = "succeeded"
+    except Exception as e:
+        db.rollback()
+        for file_entry, _ in pending:
+            file_entry["status"] = "failed"
+            file_entry["error"] = f"Failed to save candidate: {str(e)}"
+    finally:
+        db.close()
+
+
+async def ingest_files(payload: Dict[str, Any], session_factory=None) -> Dict[str, Any]:
+    """Extract and structure every resume of a bulk upload with bounded concurrency
+
+    Resumes that already have a candidate (from an earlier, interrupted
+    attempt of the same task) are not ingested again.
+    """
+    session_factory = session_factory or _default_session_factory()
+    job_id, company_id = payload["job_id"], payload["company_id"]
+    files = [
+        {"filename": f["filename"], "path": f["path"], "status": "pending", "candidate_id": None, "error": None}
+        for f in payload["files"]
+    ]
+    db = session_factory()
+    try:
+        ingested = _existing_candidates(db, job_id, [f["path"] for f in files])
+    finally:
+        db.close()
+    for file_entry in files:
+        if file_entry["path"] in ingested:
+            file_entry["status"] = "succeeded"
+            file_entry["candidate_id"] = ingested[file_entry["path"]]
+
+    semaphore = asyncio.Semaphore(settings.BULK_INGEST_CONCURRENCY)
+    pending: List[tuple] = []
+
+    async def flush():
+        batch = pending[:]
+        pending.clear()
+        await asyncio.to_thread(_insert_candidates, session_factory, batch)
+
+    async def process(file_entry: Dict[str, Any]):
+        async with semaphore:
+            db = session_factory()
+            try:
+                resume_details, _ = await get_resume_details(db, file_entry["path"])
+                # Not matched against the job, so the match fields stay empty
+                candidate = candidate_from_analysis(
+                    file_entry["path"], json.loads(resume_details), None, job_id, company_id
+                )
+            except Exception as e:
+                file_entry["status"] = "failed"
+                file_entry["error"] = str(e)
+                return
+            finally:
+                db.close()
+            pending.append((file_entry, candidate))
+            if len(pending) >= settings.BULK_INGEST_BATCH_SIZE:
+                await flush()
+
+    await asyncio.gather(*[process(f) for f in files if f["status"] == "pending"])
+    if pending:
+        await flush()
+
+    succeeded = sum(1 for f in files if f["status"] == "succeeded")
+    logger.info(f"Bulk ingest for job {job_id} finished: {succeeded}/{len(files)} succeeded")
+    return {
+        "files": [
+            {key: f[key] for key in ("filename", "status", "candidate_id", "error")}
+            for f in files
+        ]
+    }
@@ -0,0 +1,238 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from config import settings
+from utils.file_utils import VIDEO_DIR, generate_unique_filename
+
+CHECKSUM_ALGORITHMS = ("md5", "sha1", "sha256")
+VIDEO_EXTENSIONS = ("mp4", "webm", "mov", "mkv")
+HTTP_CHECKSUM_MISMATCH = 460  # As in the tus checksum extension
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Serializes chunk writes per upload within this process; the offset check
+# re-reads the manifest, so clients retrying against another worker stay safe
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock(upload_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(upload_id, threading.Lock())
+
+
+def _paths(upload_id: str):
+    base = os.path.join(settings.VIDEO_UPLOAD_PARTIAL_DIR, upload_id)
+    return f"{base}.part", f"{base}.json"
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Upload not found"
+    )
+
+
+def chunk_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Chunks may be at most {settings.VIDEO_UPLOAD_MAX_CHUNK_BYTES} bytes"
+    )
+
+
+def _read_manifest(upload_id: str, owner: str) -> Dict[str, Any]:
+    if not _UPLOAD_ID.match(upload_id):
+        raise _not_found()
+    _, manifest_path = _paths(upload_id)
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        raise _not_found()
+    if manifest["owner"] != owner or _expired(manifest):
+        raise _not_found()
+    return manifest
+
+
+def _write_manifest(manifest: Dict[str, Any]) -> None:
+    # Written beside the old one and swapped in, so a crash never leaves a torn manifest
+    _, manifest_path = _paths(manifest["upload_id"])
+    temporary_path = f"{manifest_path}.tmp"
+    with open(temporary_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temporary_path, manifest_path)
+
+
+def _expired(manifest: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    return datetime.fromisoformat(manifest["expires_at"]) < (now or datetime.utcnow())
+
+
+def _remove(upload_id: str) -> None:
+    for path in _paths(upload_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    with _locks_guard:
+        _locks.pop(upload_id, None)
+
+
+def upload_status(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "upload_id": manifest["upload_id"],
+        "offset": manifest["offset"],
+        "length": manifest["length"],
+        "expires_at": manifest["expires_at"],
+        "chunk_size": settings.VIDEO_UPLOAD_CHUNK_BYTES,
+        "upload_url": f"/api/videos/uploads/{manifest['upload_id']}"
+    }
+
+
+def purge_expired_uploads(now: Optional[datetime] = None) -> int:
+    """Drop partial uploads nobody resumed before they expired"""
+    removed = 0
+    for name in os.listdir(settings.VIDEO_UPLOAD_PARTIAL_DIR):
+        if not name.endswith(".json"):
+            continue
+        upload_id = name[:-len(".json")]
+        try:
+            with open(os.path.join(settings.VIDEO_UPLOAD_PARTIAL_DIR, name)) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            continue
+        if _expired(manifest, now):
+            _remove(upload_id)
+            removed += 1
+    return removed
+
+
+def create_upload(owner: str, length: int, filename: Optional[str] = None) -> Dict[str, Any]:
+    """Start an upload of `length` bytes; chunks are then written straight into a preallocated file
+
+    `owner` identifies who may continue the upload, e.g. `interview:<id>`.
+    """
+    if length <= 0 or length > settings.VIDEO_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload length must be between 1 and {settings.VIDEO_UPLOAD_MAX_BYTES} bytes"
+        )
+    os.makedirs(settings.VIDEO_UPLOAD_PARTIAL_DIR, exist_ok=True)
+    purge_expired_uploads()
+
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    upload_id = uuid.uuid4().hex
+    manifest = {
+        "upload_id": upload_id,
+        "owner": owner,
+        "length": length,
+        "offset": 0,
+        "file_key": generate_unique_filename("videos", extension if extension in VIDEO_EXTENSIONS else "mp4"),
+        "expires_at": (datetime.utcnow() + timedelta(hours=settings.VIDEO_UPLOAD_EXPIRY_HOURS)).isoformat()
+    }
+    part_path, _ = _paths(upload_id)
+    with open(part_path, "wb") as part_file:
+        part_file.truncate(length)
+    _write_manifest(manifest)
+    return manifest
+
+
+def get_upload(owner: str, upload_id: str) -> Dict[str, Any]:
+    return _read_manifest(upload_id, owner)
+
+
+def _verify_checksum(data: bytes, checksum: Optional[str]) -> None:
+    """Check a chunk against an `Upload-Checksum: <algorithm> <base64 digest>` header"""
+    try:
+        algorithm, encoded = (checksum or "").split(" ", 1)
+        expected = base64.b64decode(encoded, validate=True)
+    except (ValueError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload-Checksum must be '<algorithm> <base64 digest>'"
+        )
+    algorithm = algorithm.lower()
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported checksum algorithm; use one of {', '.join(CHECKSUM_ALGORITHMS)}"
+        )
+    if not hmac.compare_digest(hashlib.new(algorithm, data).digest(), expected):
+        raise HTTPException(
+            status_code=HTTP_CHECKSUM_MISMATCH,
+            detail="Checksum mismatch"
+        )
+
+
+def write_chunk(owner: str, upload_id: str, offset: int, data: bytes, checksum: Optional[str]) -> Dict[str, Any]:
+    """Write a verified chunk at `offset`, which must be the upload's current offset
+
+    Blocking; run it in a thread. A chunk whose data was written but whose
+    offset was not recorded is simply sent again, overwriting the same bytes.
+    """
+    if len(data) > settings.VIDEO_UPLOAD_MAX_CHUNK_BYTES:
+        raise chunk_too_large()
+    _verify_checksum(data, checksum)
+
+    with _lock(upload_id):
+        manifest = _read_manifest(upload_id, owner)
+        if offset != manifest["offset"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload-Offset does not match the current offset {manifest['offset']}",
+                headers={"Upload-Offset": str(manifest["offset"])}
+            )
+        if offset + len(data) > manifest["length"]:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Chunk extends past the declared upload length"
+            )
+
+        part_path, _ = _paths(upload_id)
+        with open(part_path, "r+b") as part_file:
+            part_file.seek(offset)
+            part_file.write(data)
+            part_file.flush()
+            os.fsync(part_file.fileno())
+        manifest["offset"] = offset + len(data)
+        _write_manifest(manifest)
+        return manifest
+
+
+def finalize_upload(owner: str, upload_id: str) -> Dict[str, Any]:
+    """Move a complete upload into the video directory; the data is not read again"""
+    with _lock(upload_id):
+        manifest = _read_manifest(upload_id, owner)
+        if manifest["offset"] != manifest["length"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is incomplete: {manifest['offset']} of {manifest['length']} bytes received",
+                headers={"Upload-Offset": str(manifest["offset"])}
+            )
+        part_path, _ = _paths(upload_id)
+        os.makedirs(VIDEO_DIR, exist_ok=True)
+        # A rename when both directories share a filesystem
+        shutil.move(part_path, os.path.join(VIDEO_DIR, manifest["file_key"]))
+    _remove(upload_id)
+    return {
+        "file_key": manifest["file_key"],
+        "video_url": f"/{VIDEO_DIR}/{manifest['file_key']}",
+        "size": manifest["length"]
+    }
+
+
+def abort_upload(owner: str, upload_id: str) -> None:
+    with _lock(upload_id):
+        _read_manifest(upload_id, owner)
+        _remove(upload_id)
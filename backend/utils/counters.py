@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy import bindparam, update
+
+from config import settings
+from models.models import PublicInterviewLink
+
+logger = logging.getLogger(__name__)
+
+
+def _default_session_factory():
+    # Imported lazily so counters can be flushed to other engines (e.g. in tests)
+    from database import SessionLocal
+    return SessionLocal
+
+
+class CounterBuffer:
+    """Write-behind integer counters for one table
+
+    Increments are summed in memory per process and written in batches as
+    `UPDATE ... SET field = field + n`, so concurrent workers never lose
+    increments and hot read paths do not write a row per request.
+    """
+
+    def __init__(
+        self,
+        model,
+        fields: Sequence[str],
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        session_factory=None
+    ):
+        self.model = model
+        self.fields = tuple(fields)
+        self.flush_interval = flush_interval or settings.COUNTER_FLUSH_INTERVAL_SECONDS
+        self.max_pending = max_pending or settings.COUNTER_FLUSH_MAX_PENDING
+        self.session_factory = session_factory
+        self._pending: Dict[Hashable, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_listeners: List[Callable[[List[Hashable]], None]] = []
+        self.flushes = 0
+        self.flushed_increments = 0
+        self.failures = 0
+
+    def incr(self, key: Hashable, field: str, n: int = 1) -> None:
+        if field not in self.fields:
+            raise ValueError(f"Unknown counter field '{field}'")
+        with self._lock:
+            self._pending[key][field] += n
+            full = len(self._pending) >= self.max_pending
+        wakeup, loop = self._wakeup, self._loop
+        if full and wakeup is not None:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def add_flush_listener(self, listener: Callable[[List[Hashable]], None]) -> None:
+        """Call `listener` with the flushed row keys after every successful flush"""
+        self._flush_listeners.append(listener)
+
+    def pending(self, key: Hashable) -> Dict[str, int]:
+        """Increments for a row that are not written yet, to add to values read from the database"""
+        with self._lock:
+            counts = self._pending.get(key)
+            return {field: counts[field] for field in self.fields} if counts else dict.fromkeys(self.fields, 0)
+
+    def flush(self) -> int:
+        """Write all buffered increments in one batched UPDATE; returns the number of rows touched"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+        if not pending:
+            return 0
+
+        table = self.model.__table__
+        statement = update(table).where(table.c.id == bindparam("row_id")).values(
+            {field: table.c[field] + bindparam(f"add_{field}") for field in self.fields}
+        )
+        params = [
+            {"row_id": key, **{f"add_{field}": counts[field] for field in self.fields}}
+            for key, counts in pending.items()
+        ]
+        if self.session_factory is None:
+            self.session_factory = _default_session_factory()
+        db = self.session_factory()
+        try:
+            db.connection().execute(statement, params)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.failures += 1
+            # Keep the increments for the next attempt
+            with self._lock:
+                for key, counts in pending.items():
+                    self._pending[key].update(counts)
+            logger.error(f"Flushing {self.model.__tablename__} counters failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+        self.flushes += 1
+        self.flushed_increments += sum(sum(counts.values()) for counts in pending.values())
+        for listener in self._flush_listeners:
+            listener(list(pending))
+        return len(pending)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered"""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending_rows = len(self._pending)
+        return {
+            "pending_rows": pending_rows,
+            "flushes": self.flushes,
+            "flushed_increments": self.flushed_increments,
+            "failures": self.failures
+        }
+
+
+link_counters = CounterBuffer(
+    PublicInterviewLink,
+    ("visits", "started_interviews", "completed_interviews")
+)
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Set
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from models.models import Candidate, Interview, Job, PublicInterviewLink
+from utils.job_stats import job_stats_for, stats_dict
+from utils.ttl_cache import response_cache
+
+FUNNEL_FIELDS = ("visits", "started_interviews")
+
+
+def company_tag(company_id: int) -> str:
+    return f"dashboard:company:{company_id}"
+
+
+def job_tag(job_id: int) -> str:
+    return f"dashboard:job:{job_id}"
+
+
+def _averages(db: Session, column, job_ids) -> Dict[int, float]:
+    model = column.class_
+    rows = db.query(model.job_id, func.avg(column)).filter(
+        model.job_id.in_(job_ids),
+        column.isnot(None)
+    ).group_by(model.job_id)
+    return {job_id: round(float(value), 2) for job_id, value in rows if value is not None}
+
+
+def build_dashboard_summary(db: Session, company_id: int) -> Dict[str, Any]:
+    """Counts, average scores and public link funnels for all of a company's jobs
+
+    Status counts come from the maintained job_stats rows; scores and link
+    funnels are one GROUP BY query each.
+    """
+    jobs = db.query(Job.id, Job.company_id, Job.title, Job.status).filter(
+        Job.company_id == company_id
+    ).order_by(Job.id).all()
+    job_ids = [job.id for job in jobs]
+    stats = job_stats_for(db, jobs)
+    resume_scores = _averages(db, Candidate.resume_match_score, job_ids)
+    interview_scores = _averages(db, Interview.overall_score, job_ids)
+    funnels = {
+        row.job_id: row
+        for row in db.query(
+            PublicInterviewLink.job_id,
+            func.count(PublicInterviewLink.id).label("links"),
+            *[func.coalesce(func.sum(getattr(PublicInterviewLink, field)), 0).label(field) for field in FUNNEL_FIELDS]
+        ).filter(PublicInterviewLink.job_id.in_(job_ids)).group_by(PublicInterviewLink.job_id)
+    }
+
+    items = []
+    totals = {"jobs": len(jobs), "candidates": {}, "interviews": {}, "public_links": {}}
+    for job in jobs:
+        counts = stats_dict(stats[job.id])
+        funnel = funnels.get(job.id)
+        public_links = {"links": funnel.links if funnel else 0}
+        public_links.update({field: int(getattr(funnel, field)) if funnel else 0 for field in FUNNEL_FIELDS})
+        items.append({
+            "job_id": job.id,
+            "job_title": job.title,
+            "status": job.status,
+            **counts,
+            "avg_resume_match_score": resume_scores.get(job.id),
+            "avg_interview_score": interview_scores.get(job.id),
+            "public_links": public_links
+        })
+        for group, values in list(counts.items()) + [("public_links", public_links)]:
+            for name, value in values.items():
+                totals[group][name] = totals[group].get(name, 0) + value
+
+    return {"company_id": company_id, "jobs": items, "totals": totals}
+
+
+def dashboard_summary(db: Session, company_id: int) -> Dict[str, Any]:
+    """Cached per company; invalidated when the company's jobs, candidates or interviews change"""
+    cache_key = ("dashboard_summary", company_id)
+    summary = response_cache.get(cache_key)
+    if summary is None:
+        summary = build_dashboard_summary(db, company_id)
+        tags = [company_tag(company_id)] + [job_tag(item["job_id"]) for item in summary["jobs"]]
+        response_cache.set(cache_key, summary, tags=tags)
+    return summary
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dashboard_tags(session: Session, flush_context, instances) -> None:
+    tags: Set[str] = session.info.setdefault("dashboard_tags", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Job, Candidate)) and obj.company_id is not None:
+            tags.add(company_tag(obj.company_id))
+        if isinstance(obj, (Candidate, Interview, PublicInterviewLink)) and obj.job_id is not None:
+            tags.add(job_tag(obj.job_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboards(session: Session) -> None:
+    # Only once the change is visible, so a concurrent read cannot cache the old state
+    tags = session.info.pop("dashboard_tags", None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dashboard_tags(session: Session) -> None:
+    session.info.pop("dashboard_tags", None)
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """Checkout wait, connection age and saturation figures for one connection pool"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self._ages = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.max_wait = 0.0
+        self._last_warning = 0.0
+        self.engine: Optional[Engine] = None
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+        if timed_out or seconds >= settings.DB_POOL_WAIT_WARNING_SECONDS:
+            self._warn(seconds)
+
+    def _warn(self, wait: float) -> None:
+        # At most one line per interval, so a saturated pool does not flood the logs
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_warning < settings.DB_POOL_WARNING_INTERVAL_SECONDS:
+                return
+            self._last_warning = now
+        stats = self.stats()
+        logger.warning(
+            f"Database pool saturated: waited {wait:.3f}s for a connection, "
+            f"{stats.get('checked_out', '?')}/{stats.get('capacity', '?')} checked out, "
+            f"{stats['timeouts']} checkout timeout(s) so far"
+        )
+
+    def attach(self, engine: Engine) -> None:
+        self.engine = engine
+        if isinstance(engine.pool, _MonitoredCheckout):
+            engine.pool.monitor = self
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            connection_record.info["created_at"] = time.monotonic()
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            created_at = connection_record.info.get("created_at")
+            with self._lock:
+                self.checkouts += 1
+                if created_at is not None:
+                    self._ages.append(time.monotonic() - created_at)
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        # Read through the engine, which replaces its pool on dispose()
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            waits = sorted(self._waits)
+            ages = list(self._ages)
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+            max_wait = self.max_wait
+        if not isinstance(pool, QueuePool):
+            return {"pool": type(pool).__name__ if pool else None, **counters}
+
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        return {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "capacity": capacity,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+            **counters,
+            "checkout_wait": {
+                "avg": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "p95": round(waits[int(len(waits) * 0.95)], 4) if waits else 0.0,
+                "max": round(max_wait, 4),
+            },
+            "connection_age": {
+                "avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+                "max": round(max(ages), 1) if ages else 0.0,
+            },
+        }
+
+
+pool_monitor = PoolMonitor()
+
+
+class _MonitoredCheckout:
+    """Pool mixin that reports how long each checkout waited for a free connection"""
+
+    monitor = pool_monitor
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.monitor.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.monitor.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class MonitoredQueuePool(_MonitoredCheckout, QueuePool):
+    pass
+
+
+class MonitoredAsyncQueuePool(_MonitoredCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Pool settings for create_engine/create_async_engine; SQLite keeps SQLAlchemy's defaults"""
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": MonitoredAsyncQueuePool if is_async else MonitoredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def enable_sqlite_foreign_keys(engine: Engine) -> None:
+    """Have SQLite enforce foreign keys, and with them ON DELETE CASCADE, like Postgres does"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
@@ -1,17 +1,27 @@
 import os
 import logging
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set
 from fastapi import UploadFile
+from sqlalchemy.orm import Session
 import shutil
 from datetime import datetime
 import string
 import random
 
+from config import settings
+from models.models import Candidate, VideoResponse
+from utils.task_queue import enqueue
+
 logger = logging.getLogger(__name__)
 
 # Directory constants
+UPLOAD_ROOT = "uploads"
 LOGO_DIR = "uploads/logos"
 RESUME_DIR = "uploads/resumes"
+VIDEO_DIR = "uploads/videos"
+
+# Directories whose file names the server generates; nothing outside them is ever cleaned up
+MANAGED_UPLOAD_DIRS = (RESUME_DIR, VIDEO_DIR)
 
 # Ensure directories exist
 os.makedirs(LOGO_DIR, exist_ok=True)
@@ -39,4 +49,65 @@ async def save_upload_file(upload_file: UploadFile, directory: str) -> str:
         return f"/{os.path.relpath(file_path, 'uploads')}"
     except Exception as e:
         logger.error(f"Error saving file: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+def upload_path(url: Optional[str]) -> Optional[str]:
+    """Local path of a stored resume or video URL such as `/uploads/videos/x.mp4` or `/resumes/x.pdf`"""
+    if not url or "://" in url:
+        return None
+    relative = url.lstrip("/")
+    if relative.startswith(f"{UPLOAD_ROOT}/"):
+        relative = relative[len(UPLOAD_ROOT) + 1:]
+    root = os.path.realpath(UPLOAD_ROOT)
+    path = os.path.realpath(os.path.join(root, relative))
+    # Never follow a stored URL out of the resume and video directories
+    for directory in MANAGED_UPLOAD_DIRS:
+        managed = os.path.realpath(directory)
+        if path != managed and os.path.commonpath([managed, path]) == managed:
+            return path
+    return None
+
+def _url_spellings(path: str) -> List[str]:
+    """The ways a row can refer to the upload at `path`"""
+    relative = os.path.relpath(path, os.path.realpath(UPLOAD_ROOT)).replace(os.sep, "/")
+    return [f"/{UPLOAD_ROOT}/{relative}", f"{UPLOAD_ROOT}/{relative}", f"/{relative}"]
+
+def referenced_upload_paths(db: Session, paths: Iterable[str]) -> Set[str]:
+    """Paths among `paths` that a candidate resume or video response still points at"""
+    spellings = {url: path for path in set(paths) for url in _url_spellings(path)}
+    if not spellings:
+        return set()
+    urls = list(spellings)
+    rows = db.query(Candidate.resume_url).filter(Candidate.resume_url.in_(urls)).union(
+        db.query(VideoResponse.video_url).filter(VideoResponse.video_url.in_(urls))
+    )
+    return {spellings[url] for (url,) in rows}
+
+def delete_upload_files(db: Session, urls: Iterable[str]) -> Dict[str, int]:
+    """Remove stored uploads nothing references any more; files that are already gone are counted, not errors"""
+    paths = {url: upload_path(url) for url in urls}
+    in_use = referenced_upload_paths(db, [path for path in paths.values() if path])
+    removed = missing = skipped = 0
+    for path in paths.values():
+        if path is None or path in in_use:
+            skipped += 1
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            missing += 1
+    return {"removed": removed, "missing": missing, "skipped": skipped}
+
+def schedule_upload_cleanup(db: Session, urls: List[str]) -> None:
+    """Queue the removal of the resumes and videos of deleted rows that no other row still uses
+
+    Runs after the delete is committed, in batches of UPLOAD_CLEANUP_BATCH_SIZE; the
+    task checks the references again before removing anything.
+    """
+    paths = {url: upload_path(url) for url in set(urls)}
+    in_use = referenced_upload_paths(db, [path for path in paths.values() if path])
+    urls = sorted(url for url, path in paths.items() if path and path not in in_use)
+    batch_size = settings.UPLOAD_CLEANUP_BATCH_SIZE
+    for start in range(0, len(urls), batch_size):
+        enqueue(db, "upload_cleanup", {"urls": urls[start:start + batch_size]})
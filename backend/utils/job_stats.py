@@ -0,0 +1,166 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import delete, event, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from models.models import Candidate, Interview, JobStats
+
+CANDIDATE_STATUSES = ("new", "reviewing", "interviewing", "hired", "rejected")
+INTERVIEW_STATUSES = ("pending", "completed")
+
+# model -> (column prefix, statuses with their own counter, status a new row defaults to)
+TRACKED_MODELS = {
+    Candidate: ("candidates", CANDIDATE_STATUSES, "new"),
+    Interview: ("interviews", INTERVIEW_STATUSES, "pending"),
+}
+
+STAT_COLUMNS = [
+    f"{prefix}_{name}"
+    for prefix, statuses, _ in TRACKED_MODELS.values()
+    for name in ("total",) + statuses
+]
+
+_UNKNOWN = object()
+
+
+def _stat_columns(prefix: str, statuses: Iterable[str], status: str) -> List[str]:
+    return [f"{prefix}_total"] + ([f"{prefix}_{status}"] if status in statuses else [])
+
+
+def aggregate_job_stats(db: Session, job_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """Count candidates and interviews per job and status with one GROUP BY query each"""
+    counts = {job_id: dict.fromkeys(STAT_COLUMNS, 0) for job_id in job_ids}
+    if not job_ids:
+        return counts
+    for model, (prefix, statuses, _) in TRACKED_MODELS.items():
+        rows = db.query(model.job_id, model.status, func.count(model.id)).filter(
+            model.job_id.in_(job_ids)
+        ).group_by(model.job_id, model.status)
+        for job_id, status, count in rows:
+            for column in _stat_columns(prefix, statuses, status):
+                counts[job_id][column] += count
+    return counts
+
+
+def stats_dict(row: JobStats) -> Dict[str, Dict[str, int]]:
+    return {
+        prefix: {
+            name: getattr(row, f"{prefix}_{name}")
+            for name in ("total",) + statuses
+        }
+        for prefix, statuses, _ in TRACKED_MODELS.values()
+    }
+
+
+def job_stats_for(db: Session, jobs: Iterable[Any], refresh: bool = False) -> Dict[int, JobStats]:
+    """Stats rows for jobs (anything with `id` and `company_id`), recomputing missing ones
+
+    Rows are kept current by the flush listener below; a job without a row
+    (new table, or invalidated after a bulk write) is recomputed from the
+    source tables once and then maintained incrementally again. Recomputed
+    rows are written in a session of their own instead of committing the
+    caller's, which is usually serving a read.
+    """
+    jobs = list(jobs)
+    job_ids = [job.id for job in jobs]
+    rows = {} if refresh else {row.job_id: row for row in db.query(JobStats).filter(JobStats.job_id.in_(job_ids))}
+    missing = [job for job in jobs if job.id not in rows]
+    if not missing:
+        return rows
+
+    counts = aggregate_job_stats(db, [job.id for job in missing])
+    with Session(bind=db.get_bind(), expire_on_commit=False) as stats_db:
+        if refresh:
+            invalidate_job_stats(stats_db, job_ids)
+        for job in missing:
+            rows[job.id] = JobStats(job_id=job.id, company_id=job.company_id, **counts[job.id])
+            stats_db.add(rows[job.id])
+        try:
+            stats_db.commit()
+        except IntegrityError:
+            # Another request recomputed the same job concurrently
+            stats_db.rollback()
+            rows = {row.job_id: row for row in db.query(JobStats).filter(JobStats.job_id.in_(job_ids))}
+    return rows
+
+
+def invalidate_job_stats(db: Session, job_ids: Iterable[int]) -> None:
+    """Drop stats rows after writes the flush listener cannot see, such as bulk deletes
+
+    Part of the caller's transaction; the rows are recomputed on next read.
+    """
+    job_ids = [job_id for job_id in set(job_ids) if job_id is not None]
+    if job_ids:
+        db.execute(delete(JobStats).where(JobStats.job_id.in_(job_ids)))
+
+
+def _old_and_new(obj: Any, key: str):
+    """An attribute's persisted value and the value about to be flushed"""
+    history = get_history(obj, key)
+    if history.added:
+        return (history.deleted[0] if history.deleted else _UNKNOWN), history.added[0]
+    value = history.unchanged[0] if history.unchanged else None
+    return value, value
+
+
+@event.listens_for(Session, "before_flush")
+def _track_status_changes(session: Session, flush_context, instances) -> None:
+    """Turn candidate and interview inserts, deletes and status/job moves into counter deltas"""
+    deltas: Dict[int, Counter] = defaultdict(Counter)
+    stale: Set[int] = set()
+
+    def count(job_id, prefix, statuses, status, n):
+        if job_id is not None:
+            for column in _stat_columns(prefix, statuses, status):
+                deltas[job_id][column] += n
+
+    for obj in session.new:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            prefix, statuses, default = tracked
+            count(obj.job_id, prefix, statuses, obj.status or default, 1)
+
+    for obj in session.deleted:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            prefix, statuses, _ = tracked
+            job_id, _ = _old_and_new(obj, "job_id")
+            status, _ = _old_and_new(obj, "status")
+            if job_id is _UNKNOWN or status is _UNKNOWN:
+                stale.add(obj.job_id)
+            else:
+                count(job_id, prefix, statuses, status, -1)
+
+    for obj in session.dirty:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if not tracked or not session.is_modified(obj):
+            continue
+        prefix, statuses, _ = tracked
+        old_job_id, new_job_id = _old_and_new(obj, "job_id")
+        old_status, new_status = _old_and_new(obj, "status")
+        if old_job_id == new_job_id and old_status == new_status:
+            continue
+        if old_job_id is _UNKNOWN or old_status is _UNKNOWN:
+            # The previous value was never loaded, so recompute instead
+            stale.update(job_id for job_id in (old_job_id, new_job_id) if job_id is not _UNKNOWN)
+            continue
+        count(old_job_id, prefix, statuses, old_status, -1)
+        count(new_job_id, prefix, statuses, new_status, 1)
+
+    if not deltas and not stale:
+        return
+    connection = session.connection()
+    for job_id, changes in deltas.items():
+        changes = {column: n for column, n in changes.items() if n}
+        if changes and job_id not in stale:
+            # A job without a stats row yet is recomputed on first read instead
+            connection.execute(update(JobStats).where(JobStats.job_id == job_id).values(
+                {**{column: getattr(JobStats, column) + n for column, n in changes.items()},
+                 "updated_at": func.now()}
+            ))
+    stale.discard(None)
+    if stale:
+        connection.execute(delete(JobStats).where(JobStats.job_id.in_(stale)))
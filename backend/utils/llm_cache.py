@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """Content-address a chat completion request by model, messages and parameters"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int], model: str = "") -> int:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLCacheBackend:
+    """Cache stored in the application database (SQLite or Postgres)"""
+
+    # Trimming the table needs a COUNT, so only do it every few writes
+    EVICTION_INTERVAL = 50
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def _get(self, key: str) -> Optional[str]:
+        from database import SessionLocal
+        from models.models import LLMCacheEntry
+
+        db = SessionLocal()
+        try:
+            entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).first()
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at < datetime.utcnow():
+                db.delete(entry)
+                db.commit()
+                return None
+            entry.last_accessed_at = datetime.utcnow()
+            db.commit()
+            return entry.response
+        finally:
+            db.close()
+
+    def _set(self, key: str, value: str, model: str, ttl: Optional[int], trim: bool) -> int:
+        from database import SessionLocal
+        from models.models import LLMCacheEntry
+
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).first()
+            if entry is None:
+                entry = LLMCacheEntry(key=key, model=model)
+                db.add(entry)
+            entry.response = value
+            entry.created_at = now
+            entry.last_accessed_at = now
+            entry.expires_at = now + timedelta(seconds=ttl) if ttl else None
+            db.commit()
+
+            evicted = 0
+            if trim:
+                db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at < now).delete(synchronize_session=False)
+                excess = db.query(LLMCacheEntry).count() - self.max_entries
+                if excess > 0:
+                    stale_keys = db.query(LLMCacheEntry.key).order_by(
+                        LLMCacheEntry.last_accessed_at
+                    ).limit(excess).scalar_subquery()
+                    evicted = db.query(LLMCacheEntry).filter(
+                        LLMCacheEntry.key.in_(stale_keys)
+                    ).delete(synchronize_session=False)
+                db.commit()
+            return evicted
+        finally:
+            db.close()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int], model: str = "") -> int:
+        self._writes += 1
+        trim = self._writes % self.EVICTION_INTERVAL == 0
+        return await asyncio.to_thread(self._set, key, value, model, ttl, trim)
+
+    async def clear(self) -> None:
+        from database import SessionLocal
+        from models.models import LLMCacheEntry
+
+        def _clear():
+            db = SessionLocal()
+            try:
+                db.query(LLMCacheEntry).delete(synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+
+        await asyncio.to_thread(_clear)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RedisCacheBackend:
+    """Cache stored in Redis or any Redis-compatible server
+
+    Size-based eviction is delegated to the server's maxmemory policy
+    (configure ``allkeys-lru``); entries still expire after the TTL.
+    """
+
+    PREFIX = "llm-cache:"
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for LLM_CACHE_BACKEND=redis")
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(self.PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: Optional[int], model: str = "") -> int:
+        await self._redis.set(self.PREFIX + key, value, ex=ttl or None)
+        return 0
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.PREFIX + "*"):
+            await self._redis.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class LLMCache:
+    """Cache for deterministic LLM responses with hit/miss accounting"""
+
+    def __init__(self, backend, ttl: Optional[int]):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            # A broken cache must never fail the request; fall through to the API
+            self.errors += 1
+            logger.warning(f"LLM cache lookup failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, model: str = "") -> None:
+        try:
+            evicted = await self.backend.set(key, value, self.ttl, model=model)
+            self.sets += 1
+            self.evictions += evicted
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": self.backend.size(),
+        }
+
+
+def create_cache() -> Optional[LLMCache]:
+    """Build the cache configured by LLM_CACHE_BACKEND, or None when disabled"""
+    backend_name = settings.LLM_CACHE_BACKEND.lower()
+    if backend_name in ("", "none", "off"):
+        return None
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+    elif backend_name in ("sql", "database", "db"):
+        backend = SQLCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+    elif backend_name == "redis":
+        backend = RedisCacheBackend(settings.LLM_CACHE_REDIS_URL)
+    else:
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {settings.LLM_CACHE_BACKEND}")
+    return LLMCache(backend, settings.LLM_CACHE_TTL_SECONDS or None)
+
+
+llm_cache = create_cache()
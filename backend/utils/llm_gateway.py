@@ -0,0 +1,125 @@
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import openai
+
+from config import settings
+from utils.llm_cache import llm_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Shared, pooled HTTP client for every OpenAI call made by this worker.
+# A single AsyncOpenAI instance lets hundreds of concurrent requests reuse
+# keep-alive connections instead of opening a new TLS session per call.
+_http_client: Optional[httpx.AsyncClient] = None
+_client: Optional[openai.AsyncOpenAI] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS),
+    )
+
+
+def get_client() -> openai.AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use"""
+    global _http_client, _client
+    if _client is None:
+        _http_client = _build_http_client()
+        _client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=_http_client,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+        )
+        logger.info("Async OpenAI client initialized")
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and release pooled connections"""
+    global _http_client, _client
+    if _client is not None:
+        await _client.close()
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
+
+
+async def chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    cache: bool = False,
+    **params: Any
+) -> str:
+    """Run a chat completion and return the content of the first choice
+
+    Pass ``cache=True`` for deterministic prompts (low temperature, JSON
+    output) so identical requests are answered from the LLM response cache.
+    """
+    key = None
+    if cache and llm_cache is not None:
+        key = make_cache_key(model, messages, params)
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = await get_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        **params
+    )
+    content = response.choices[0].message.content
+
+    if key is not None and content:
+        await llm_cache.set(key, content, model=model)
+    return content
+
+
+async def stream_speech(
+    text: str,
+    model: str,
+    voice: str,
+    instructions: Optional[str] = None,
+    response_format: str = "mp3"
+) -> AsyncIterator[bytes]:
+    """Yield synthesized speech chunks as they arrive from the TTS service"""
+    params: Dict[str, Any] = {
+        "model": model,
+        "voice": voice,
+        "input": text,
+        "response_format": response_format,
+    }
+    if instructions:
+        params["instructions"] = instructions
+    async with get_client().audio.speech.with_streaming_response.create(**params) as response:
+        async for chunk in response.iter_bytes():
+            yield chunk
+
+
+async def synthesize_speech(
+    text: str,
+    model: str,
+    voice: str,
+    instructions: Optional[str] = None,
+    response_format: str = "mp3"
+) -> bytes:
+    """Synthesize speech and return the complete audio clip"""
+    chunks = []
+    async for chunk in stream_speech(text, model, voice, instructions, response_format):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def transcribe(audio_file, model: str = "whisper-1", language: Optional[str] = "en"):
+    """Transcribe a file-like audio object with Whisper"""
+    params: Dict[str, Any] = {"model": model, "file": audio_file}
+    if language:
+        params["language"] = language
+    return await get_client().audio.transcriptions.create(**params)
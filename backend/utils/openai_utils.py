@@ -1,24 +1,63 @@
 import io
 import os
-import openai
-from typing import List, Dict, Any, Optional
-from config import settings
-from PyPDF2 import PdfReader
+import asyncio
+import functools
+import hashlib
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from fastapi import HTTPException, status
 import json
 import logging
 
+from utils import llm_gateway
+from utils.tts_cache import tts_cache
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-try:
-    client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-    logger.info("OpenAI client initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize OpenAI client: {e}")
-    raise
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one upstream call
+
+    The first caller (the leader) starts the work as its own task; callers
+    arriving with the same key while it is running await that task instead
+    of issuing a duplicate request. A caller being cancelled does not cancel
+    the shared work for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+single_flight = SingleFlight()
 
+def coalesce(func):
+    """Share one in-flight call between concurrent identical invocations of func"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        payload = json.dumps([func.__qualname__, args, kwargs], sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return await single_flight.do(key, lambda: func(*args, **kwargs))
+    return wrapper
+
+@coalesce
 async def generate_job_description(title: str, department: str, location: str) -> str:
     """Generate a job description using OpenAI"""
     prompt = f"""
@@ -35,7 +74,7 @@ async def generate_job_description(title: str, department: str, location: str) -
 
     try:
         print(f"Making OpenAI API call with model: gpt-4")
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a professional HR assistant specializing in creating compelling job descriptions."},
@@ -44,20 +83,15 @@ async def generate_job_description(title: str, department: str, location: str) -
             temperature=0.7,
             max_tokens=1000
         )
-        return response.choices[0].message.content
+        return response
     except Exception as e:
         print(f"Error generating job description: {e}")
         return f"Failed to generate job description. Please try again. Error: {str(e)}"
 
-async def extract_resume_details(resume_path: str) -> str:
-    """Extract structured information from a resume using AI"""
+@coalesce
+async def structure_resume_text(text: str) -> str:
+    """Turn already-extracted resume text into structured JSON using AI"""
     try:
-        # Read the PDF file
-        reader = PdfReader(resume_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        
         if not text:
             raise ValueError("No text could be extracted from the PDF")
         
@@ -89,18 +123,19 @@ async def extract_resume_details(resume_path: str) -> str:
         """
         
         # Call OpenAI API using the new client format
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that extracts structured information from resumes. You must return a valid JSON object."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.1,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            cache=True
         )
         
         # Extract the response content
-        return response.choices[0].message.content
+        return response
         
     except Exception as e:
         print(f"Error extracting resume details: {str(e)}")
@@ -109,6 +144,7 @@ async def extract_resume_details(resume_path: str) -> str:
             detail=f"Failed to extract resume details: {str(e)}"
         )
 
+@coalesce
 async def analyze_resume_match(
     resume_text: str,
     job_description: str,
@@ -144,18 +180,19 @@ async def analyze_resume_match(
         """
         
         # Call OpenAI API using the new client format
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that analyzes resume-job matches. You must return a valid JSON object."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.1,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            cache=True
         )
         
         # Extract the response content
-        return response.choices[0].message.content
+        return response
         
     except Exception as e:
         print(f"Error analyzing resume match: {str(e)}")
@@ -164,7 +201,8 @@ async def analyze_resume_match(
             detail=f"Failed to analyze resume match: {str(e)}"
         )
 
-def generate_interview_questions(
+@coalesce
+async def generate_interview_questions(
     job_title: str,
     job_description: str,
     resume_text: str,
@@ -214,7 +252,7 @@ If no resume text or job description is provided, generate a basic question abou
 Return the questions as a JSON array of objects with "question" and "type" fields."""
 
         logger.info(f"Making OpenAI API call with model: gpt-4")
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -226,13 +264,13 @@ Return the questions as a JSON array of objects with "question" and "type" field
         
         # Parse the response
         try:
-            questions = json.loads(response.choices[0].message.content)
+            questions = json.loads(response)
             if not isinstance(questions, list):
-                questions = [{"question": response.choices[0].message.content, "type": "general"}]
+                questions = [{"question": response, "type": "general"}]
             return questions
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse OpenAI response: {e}")
-            return [{"question": response.choices[0].message.content, "type": "general"}]
+            return [{"question": response, "type": "general"}]
             
     except Exception as e:
         logger.error(f"Error generating interview questions: {e}")
@@ -241,7 +279,8 @@ Return the questions as a JSON array of objects with "question" and "type" field
             detail=f"Failed to generate interview questions: {str(e)}"
         )
 
-def process_interview_response(
+@coalesce
+async def process_interview_response(
     response: str,
     job_title: str,
     job_description: str,
@@ -272,7 +311,7 @@ Candidate's Response:
 Provide feedback on the response and suggest areas for improvement."""
 
     try:
-        response = client.chat.completions.create(
+        feedback = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": system_prompt}
@@ -280,7 +319,7 @@ Provide feedback on the response and suggest areas for improvement."""
             temperature=0.7,
             max_tokens=300
         )
-        return {"feedback": response.choices[0].message.content.strip()}
+        return {"feedback": feedback.strip()}
     except Exception as e:
         print(f"Error processing response: {str(e)}")
         raise
@@ -297,7 +336,8 @@ def format_conversation_history(history: List[Dict[str, str]]) -> str:
     
     return "\n".join(formatted)
 
-def evaluate_interview_response(question: str, response_text: str, job_title: str) -> Dict[str, Any]:
+@coalesce
+async def evaluate_interview_response(question: str, response_text: str, job_title: str) -> Dict[str, Any]:
     """Evaluate a candidate's response to an interview question"""
     prompt = f"""
     Evaluate the following candidate response to an interview question for a {job_title} position.
@@ -322,7 +362,7 @@ def evaluate_interview_response(question: str, response_text: str, job_title: st
     """
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are an expert interviewer who evaluates candidate responses objectively."},
@@ -332,7 +372,7 @@ def evaluate_interview_response(question: str, response_text: str, job_title: st
             response_format={"type": "json_object"}
         )
         
-        result = response.choices[0].message.content
+        result = response
         parsed_result = json.loads(result)
         
         return {
@@ -346,15 +386,15 @@ def evaluate_interview_response(question: str, response_text: str, job_title: st
             "feedback": f"Failed to evaluate response. Error: {str(e)}"
         }
 
-def transcribe_audio(audio_file_path: str) -> Dict[str, Any]:
+async def transcribe_audio(audio_file_path: str) -> Dict[str, Any]:
     """Transcribe audio using OpenAI Whisper API"""
     try:
         with open(audio_file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create("whisper-1", audio_file)
+            transcript = await llm_gateway.transcribe(audio_file, language=None)
         return {
              "success": True,
              "text": transcript.text,
-             "language": transcript.get("language", "en")
+             "language": getattr(transcript, "language", "en")
         }
     except Exception as e:
         print(f"Error transcribing audio: {e}")
@@ -364,23 +404,72 @@ def transcribe_audio(audio_file_path: str) -> Dict[str, Any]:
              "text": "Failed to transcribe audio."
          }
 
-def text_to_speech(text: str):
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_VOICE = "coral"
+TTS_INSTRUCTIONS = "Speak as an interviewer"
+
+@coalesce
+async def _synthesize_speech(text: str, voice: str, model: str, instructions: Optional[str]) -> bytes:
+    key = tts_cache.make_key(text, voice, model, instructions)
+    audio = await tts_cache.get(key)
+    if audio is None:
+        audio = await llm_gateway.synthesize_speech(
+            text=text,
+            model=model,
+            voice=voice,
+            instructions=instructions
+        )
+        await tts_cache.put(key, audio)
+    return audio
+
+async def text_to_speech(
+    text: str,
+    voice: str = TTS_VOICE,
+    model: str = TTS_MODEL,
+    instructions: Optional[str] = TTS_INSTRUCTIONS
+):
     try:
-        with client.audio.speech.with_streaming_response.create(model="gpt-4o-mini-tts", voice="coral", input=text, instructions="Speak as an interviewer") as response:
+        # Coalesced callers share the raw bytes; each gets its own file object
+        speech_file = io.BytesIO(await _synthesize_speech(text, voice, model, instructions))
 
-            speech_file = io.BytesIO()
-
-            for chunk in response.iter_bytes():
-                speech_file.write(chunk)
-
-            speech_file.seek(0)
-
-            return speech_file
+        return speech_file
     except Exception as e:
         print(f"Error converting text to audio: {e}")
         return None
 
-def analyze_video_response(question: str, transcript: str, job_description: str) -> Dict[str, Any]:
+async def stream_text_to_speech(
+    text: str,
+    voice: str = TTS_VOICE,
+    model: str = TTS_MODEL,
+    instructions: Optional[str] = TTS_INSTRUCTIONS,
+    response_format: str = "mp3"
+):
+    """Yield speech audio chunks as soon as the TTS service produces them
+
+    Cached clips are served straight from disk. Freshly synthesized audio is
+    forwarded chunk by chunk and only written to the cache once the whole
+    clip has arrived, so an aborted stream never leaves a truncated entry.
+    """
+    key = tts_cache.make_key(text, voice, model, instructions, response_format)
+    audio = await tts_cache.get(key, response_format)
+    if audio is not None:
+        yield audio
+        return
+
+    chunks = []
+    async for chunk in llm_gateway.stream_speech(
+        text=text,
+        model=model,
+        voice=voice,
+        instructions=instructions,
+        response_format=response_format
+    ):
+        chunks.append(chunk)
+        yield chunk
+    await tts_cache.put(key, b"".join(chunks), response_format)
+
+@coalesce
+async def analyze_video_response(question: str, transcript: str, job_description: str) -> Dict[str, Any]:
     """Analyze a video response and provide feedback"""
     prompt = f"""
     Analyze the following video interview response for a job position.
@@ -412,7 +501,7 @@ def analyze_video_response(question: str, transcript: str, job_description: str)
     """
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are an expert interviewer who evaluates video responses objectively."},
@@ -422,7 +511,7 @@ def analyze_video_response(question: str, transcript: str, job_description: str)
             response_format={"type": "json_object"}
         )
         
-        result = response.choices[0].message.content
+        result = response
         parsed_result = json.loads(result)
 
         key_points = {"- " + "\n- ".join(parsed_result.get('key_points', ['No key points identified']))}
@@ -476,7 +565,8 @@ def analyze_video_response(question: str, transcript: str, job_description: str)
              "outstanding_qualities": []
         }
 
-def generate_followup_question(
+@coalesce
+async def generate_followup_question(
      question: str, 
      response: str, 
      job_title: str,
@@ -501,7 +591,7 @@ def generate_followup_question(
      """
  
      try:
-         response = client.chat.completions.create(
+         response = await llm_gateway.chat_completion(
              model="gpt-4",
              messages=[
                  {"role": "system", "content": "You are an expert interviewer who asks insightful follow-up questions."},
@@ -511,7 +601,7 @@ def generate_followup_question(
              max_tokens=150
          )
          
-         return response.choices[0].message.content
+         return response
      except Exception as e:
         print(f"Error generating follow-up question: {e}")
         if is_last_question:
@@ -520,6 +610,7 @@ def generate_followup_question(
             return "Thank you for sharing that. Let's move on to the next question."
          
 
+@coalesce
 async def generate_job_requirements(title: str, department: str, location: str, keywords: str = "") -> str:
     """Generate job requirements using OpenAI"""
     prompt = f"""
@@ -538,7 +629,7 @@ async def generate_job_requirements(title: str, department: str, location: str,
     """
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a professional HR assistant specializing in creating detailed job requirements."},
@@ -547,11 +638,12 @@ async def generate_job_requirements(title: str, department: str, location: str,
             temperature=0.7,
             max_tokens=1000
         )
-        return response.choices[0].message.content
+        return response
     except Exception as e:
         print(f"Error generating job requirements: {e}")
         return f"Failed to generate job requirements. Please try again. Error: {str(e)}"
 
+@coalesce
 async def generate_job_benefits(title: str, department: str, location: str, keywords: str = "") -> str:
     """Generate job benefits using OpenAI"""
     prompt = f"""
@@ -571,7 +663,7 @@ async def generate_job_benefits(title: str, department: str, location: str, keyw
     """
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat_completion(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a professional HR assistant specializing in creating compelling benefits packages."},
@@ -580,7 +672,7 @@ async def generate_job_benefits(title: str, department: str, location: str, keyw
             temperature=0.7,
             max_tokens=1000
         )
-        return response.choices[0].message.content
+        return response
     except Exception as e:
         print(f"Error generating job benefits: {e}")
         return f"Failed to generate job benefits. Please try again. Error: {str(e)}"
@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, load_only
+
+from config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_limit(limit: Optional[int]) -> int:
+    """Requested page size, defaulted and capped by settings"""
+    return min(limit or settings.DEFAULT_PAGE_SIZE, settings.MAX_PAGE_SIZE)
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def paginate(query: Query, key_column, limit: Optional[int], cursor: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+    """Keyset pagination on a unique, increasing key column
+
+    Each page is an index range scan after the previous page's last key, so
+    deep pages cost the same as the first one. Without a limit or cursor
+    every row is returned, in key order.
+    """
+    if limit is None and not cursor:
+        # Clients that predate pagination expect the full list
+        return query.order_by(key_column).all(), None
+    limit = page_limit(limit)
+    if cursor:
+        query = query.filter(key_column > decode_cursor(cursor))
+    rows = query.order_by(key_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], key_column.key))
+
+
+def select_fields(
+    model,
+    schema: Type[BaseModel],
+    fields: Optional[str],
+    computed: Sequence[str] = ()
+) -> Optional[List[str]]:
+    """Fields requested through a comma-separated `fields=` parameter, always including `id`
+
+    Only model columns of the response schema can be requested, plus any
+    `computed` fields the endpoint derives itself. Returns None when no
+    projection was requested.
+    """
+    if not fields:
+        return None
+    allowed = [
+        name for name in schema.model_fields
+        if name in model.__table__.columns or name in computed
+    ]
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}"
+        )
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+
+def load_columns(model, columns: List[str]):
+    """Loader option that fetches only these columns and defers the rest"""
+    return load_only(*[getattr(model, column) for column in columns])
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> List[str]:
+    """The model columns a response schema reads, so unused large columns are never loaded"""
+    return [name for name in schema.model_fields if name in model.__table__.columns]
+
+
+def projected_response(items: List[Dict[str, Any]], next_cursor: Optional[str]) -> JSONResponse:
+    response = JSONResponse(content=jsonable_encoder(items))
+    set_next_cursor(response, next_cursor)
+    return response
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Pools torn down by _recycle_executor; their other in-flight calls are retried
+_recycled: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def _extract_pdf_text(path: str, max_pages: int) -> str:
+    """Extract text from a PDF; runs inside a worker process"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    parts = []
+    for index, page in enumerate(reader.pages):
+        if max_pages and index >= max_pages:
+            break
+        parts.append(page.extract_text() or "")
+    return "".join(parts)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.PDF_EXTRACTION_WORKERS)
+        return _executor
+
+
+def _recycle_executor(executor: ProcessPoolExecutor) -> None:
+    """Tear down a pool whose worker is stuck or dead so the next call gets a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+        _recycled.add(executor)
+    # ProcessPoolExecutor cannot cancel a running task, so terminate its workers;
+    # every other call still on the pool then fails with BrokenProcessPool
+    for process in list(getattr(executor, "_processes", {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_pdf_text(path: str) -> str:
+    """Extract text from a PDF in the process pool without blocking the event loop
+
+    Parsing is limited to PDF_MAX_PAGES pages and PDF_EXTRACTION_TIMEOUT_SECONDS;
+    a timeout raises asyncio.TimeoutError. An extraction whose pool was recycled
+    because of another file is retried once on the fresh pool.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = get_executor()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, _extract_pdf_text, path, settings.PDF_MAX_PAGES),
+                timeout=settings.PDF_EXTRACTION_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"PDF extraction timed out after {settings.PDF_EXTRACTION_TIMEOUT_SECONDS}s: {path}")
+            _recycle_executor(executor)
+            raise
+        except BrokenProcessPool:
+            with _executor_lock:
+                recycled = executor in _recycled
+            if recycled and attempt == 0:
+                logger.info(f"PDF extraction pool was restarted during {path}; retrying")
+                continue
+            logger.error("PDF extraction pool broke; restarting it")
+            _recycle_executor(executor)
+            raise
@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from models.models import Job, PublicInterviewLink
+from utils.counters import link_counters
+from utils.ttl_cache import response_cache
+
+LINK_FIELDS = ("id", "job_id", "name", "access_code", "is_active", "expires_at", "created_at", "updated_at")
+
+
+def public_link_tag(link_id: int) -> str:
+    return f"public_link:{link_id}"
+
+
+def public_link_job_tag(job_id: int) -> str:
+    return f"public_link_job:{job_id}"
+
+
+def invalidate_public_link(link_id: int) -> None:
+    response_cache.invalidate(public_link_tag(link_id))
+
+
+def invalidate_job_public_links(job_id: int) -> None:
+    """Drop cached links of a job, whose payload embeds the job details"""
+    response_cache.invalidate(public_link_job_tag(job_id))
+
+
+def _invalidate_flushed_links(link_ids: List[int]) -> None:
+    # Cached payloads hold the stored counters, which a flush just changed
+    response_cache.invalidate(*[public_link_tag(link_id) for link_id in link_ids])
+
+
+link_counters.add_flush_listener(_invalidate_flushed_links)
+
+
+def format_compensation(job):
+    if not job.show_salary:
+        return "Not specified"
+    if job.salary_min and job.salary_max:
+        return f"${job.salary_min:,} - ${job.salary_max:,}"
+    elif job.salary_min:
+        return f"From ${job.salary_min:,}"
+    elif job.salary_max:
+        return f"Up to ${job.salary_max:,}"
+    return "Not specified"
+
+
+def format_job_details(job):
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": {
+            "id": job.company.id,
+            "name": job.company.company_name,
+            "logo": job.company.company_logo
+        },
+        "location": job.location or "Not specified",
+        "type": job.type or "Not specified",
+        "description": job.description or "No description available",
+        "requirements": job.requirements or "No specific requirements listed",
+        "benefits": job.benefits or "No benefits listed",
+        "compensation": format_compensation(job),
+        "created_at": job.created_at
+    }
+
+
+async def resolve_public_link(db: AsyncSession, access_code: str) -> Dict[str, Any]:
+    """Link fields, stored counters and formatted job details for an access code
+
+    Loaded with one joined query and cached until the link, its job or its
+    counters change; callers still check `is_active` and `expires_at`.
+    """
+    cache_key = ("public_link", access_code)
+    payload = response_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    result = await db.execute(
+        select(PublicInterviewLink).options(
+            joinedload(PublicInterviewLink.job).joinedload(Job.company)
+        ).where(PublicInterviewLink.access_code == access_code)
+    )
+    link = result.scalars().first()
+    if not link:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Link not found"
+        )
+    if not link.job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    if not link.job.company:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found"
+        )
+
+    payload = {field: getattr(link, field) for field in LINK_FIELDS + link_counters.fields}
+    payload["job"] = format_job_details(link.job)
+    response_cache.set(cache_key, payload, tags=[public_link_tag(link.id), public_link_job_tag(link.job_id)])
+    return payload
+
+
+async def resolve_active_public_link(db: AsyncSession, access_code: str) -> Dict[str, Any]:
+    """Public link for an access code, rejecting inactive and expired links"""
+    link = await resolve_public_link(db, access_code)
+
+    # Check if link is active
+    if not link["is_active"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Link is inactive"
+        )
+
+    # Check if link has expired
+    if link["expires_at"] and link["expires_at"] < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Link has expired"
+        )
+    return link
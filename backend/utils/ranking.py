@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Candidate, Job
+from utils.openai_utils import analyze_resume_match
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]
+
+
+def _features(text: str) -> Counter:
+    """Word unigrams and bigrams of a text"""
+    tokens = tokenize(text)
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return features
+
+
+# Sorted bucket indices and their weights; only non-zero buckets are kept
+SparseVector = Tuple[np.ndarray, np.ndarray]
+
+
+def sparse_hash_vector(text: str, dim: Optional[int] = None) -> SparseVector:
+    """Hashed n-gram term frequencies of a text as (buckets, weights) arrays
+
+    Features are hashed into `dim` buckets with a sign bit so collisions tend
+    to cancel out rather than accumulate; counts are log-scaled.
+    """
+    dim = dim or settings.RANKING_VECTOR_DIM
+    features = _features(text)
+    if not features:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    counts = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    buckets, inverse = np.unique(hashes % dim, return_inverse=True)
+    weights = np.bincount(inverse, weights=signs * (1.0 + np.log(counts)), minlength=len(buckets)).astype(np.float32)
+    kept = weights != 0
+    return buckets[kept].astype(np.int32), weights[kept]
+
+
+def hash_vector(text: str, dim: Optional[int] = None) -> np.ndarray:
+    """Dense form of `sparse_hash_vector`"""
+    dim = dim or settings.RANKING_VECTOR_DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    buckets, weights = sparse_hash_vector(text, dim)
+    vector[buckets] = weights
+    return vector
+
+
+def pack_rows(vectors: List[SparseVector]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate sparse vectors into CSR arrays (indptr, buckets, weights)"""
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    np.cumsum([len(buckets) for buckets, _ in vectors], out=indptr[1:])
+    if not vectors:
+        return indptr, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    return (
+        indptr,
+        np.concatenate([buckets for buckets, _ in vectors]),
+        np.concatenate([weights for _, weights in vectors])
+    )
+
+
+def score_rows(
+    indptr: np.ndarray,
+    buckets: np.ndarray,
+    weights: np.ndarray,
+    query_vector: SparseVector,
+    dim: Optional[int] = None
+) -> np.ndarray:
+    """TF-IDF cosine similarity (0-1) of each CSR row of term frequencies to the query
+
+    IDF weights are derived from the rows being scored, so the same stored
+    vectors rank sensibly against any pool of documents.
+    """
+    dim = dim or settings.RANKING_VECTOR_DIM
+    rows = len(indptr) - 1
+    if rows <= 0:
+        return np.zeros(0, dtype=np.float32)
+
+    # Buckets that appear in most documents carry little signal
+    document_frequency = np.bincount(buckets, minlength=dim)
+    idf = np.log((1 + rows) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+    row_of = np.repeat(np.arange(rows), np.diff(indptr))
+    weighted = weights.astype(np.float32) * idf[buckets]
+    norms = np.sqrt(np.bincount(row_of, weights=weighted * weighted, minlength=rows))
+
+    query_buckets, query_weights = query_vector
+    query = np.zeros(dim, dtype=np.float32)
+    query[query_buckets] = query_weights * idf[query_buckets]
+    dots = np.bincount(row_of, weights=weighted * query[buckets], minlength=rows)
+
+    denominator = norms * np.linalg.norm(query)
+    scores = np.divide(dots, denominator, out=np.zeros(rows), where=denominator > 0)
+    return np.clip(scores, 0.0, 1.0).astype(np.float32)
+
+
+def rank_texts(query: str, texts: List[str]) -> np.ndarray:
+    """TF-IDF cosine similarity (0-1) of each text to the query, in one vectorized pass"""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+
+    indptr, buckets, weights = pack_rows([sparse_hash_vector(text) for text in texts])
+    return score_rows(indptr, buckets, weights, sparse_hash_vector(query))
+
+
+def job_text(job: Job) -> str:
+    return " ".join(part for part in (job.title, job.description, job.requirements) if part)
+
+
+def candidate_text(candidate: Candidate) -> str:
+    if candidate.resume_text:
+        return candidate.resume_text
+    return " ".join(part for part in (candidate.skills, candidate.work_experience, candidate.education) if part)
+
+
+def rank_job_candidates(db: Session, job: Job, limit: Optional[int] = None) -> List[Tuple[Candidate, float]]:
+    """All candidates of a job ordered by local relevance, scored 0-100
+
+    Uses the stored vectors of the vector index, so resumes are not
+    re-vectorized on every request.
+    """
+    from utils.vector_index import best_candidates_for_job  # vector_index builds on this module
+
+    return best_candidates_for_job(db, job, k=limit, applicants_only=True)
+
+
+def ranked_candidate_dict(candidate: Candidate, relevance_score: float) -> Dict[str, Any]:
+    return {
+        "candidate_id": candidate.id,
+        "name": f"{candidate.first_name} {candidate.last_name}",
+        "email": candidate.email,
+        "status": candidate.status,
+        "relevance_score": relevance_score,
+        "resume_match_score": candidate.resume_match_score
+    }
+
+
+async def shortlist_job_candidates(db: Session, job: Job, top_k: Optional[int] = None) -> Dict[str, Any]:
+    """Run the LLM resume match only on the top-K locally ranked candidates"""
+    top_k = top_k or settings.RANKING_SHORTLIST_SIZE
+    ranked = [
+        (candidate, score) for candidate, score in rank_job_candidates(db, job)
+        if candidate.resume_text
+    ]
+    shortlist = ranked[:top_k]
+    semaphore = asyncio.Semaphore(settings.RANKING_MATCH_CONCURRENCY)
+
+    async def match(candidate: Candidate) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                analysis = await analyze_resume_match(
+                    resume_text=candidate.resume_text,
+                    job_description=job.description,
+                    job_requirements=job.requirements
+                )
+                return json.loads(analysis)
+            except Exception as e:
+                logger.error(f"Resume match failed for candidate {candidate.id}: {e}")
+                return None
+
+    matches = await asyncio.gather(*[match(candidate) for candidate, _ in shortlist])
+
+    results = []
+    for (candidate, relevance_score), match_data in zip(shortlist, matches):
+        entry = ranked_candidate_dict(candidate, relevance_score)
+        if match_data is not None:
+            candidate.resume_match_score = match_data.get("match_score", 0)
+            candidate.resume_match_feedback = match_data.get("feedback", "")
+            entry.update({
+                "resume_match_score": candidate.resume_match_score,
+                "strengths": match_data.get("strengths", []),
+                "improvements": match_data.get("improvements", []),
+                "feedback": candidate.resume_match_feedback
+            })
+        else:
+            entry["error"] = "Resume match failed"
+        results.append(entry)
+    db.commit()
+
+    return {
+        "job_id": job.id,
+        "ranked": len(ranked),
+        "shortlisted": len(shortlist),
+        "shortlist": results
+    }
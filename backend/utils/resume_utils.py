@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.models import Candidate, ResumeDocument
+from utils.openai_utils import structure_resume_text
+from utils.pdf_utils import extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def get_resume_document(db: Session, resume_path: str) -> ResumeDocument:
+    """Return the stored extraction for a resume file, parsing it only the first time it is seen"""
+    content_hash = await asyncio.to_thread(hash_file, resume_path)
+
+    document = db.query(ResumeDocument).filter(ResumeDocument.content_hash == content_hash).first()
+    if document:
+        return document
+
+    text = await extract_pdf_text(resume_path)
+    if not text:
+        raise ValueError("No text could be extracted from the PDF")
+
+    document = ResumeDocument(content_hash=content_hash, extracted_text=text)
+    db.add(document)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request stored the same file first
+        db.rollback()
+        document = db.query(ResumeDocument).filter(ResumeDocument.content_hash == content_hash).first()
+    db.refresh(document)
+    return document
+
+
+async def get_resume_details(db: Session, resume_path: str) -> Tuple[str, ResumeDocument]:
+    """Return structured resume JSON, reusing stored text and structuring results
+
+    Repeat analyses of a file that was already ingested skip both PDF parsing
+    and the extraction LLM call.
+    """
+    document = await get_resume_document(db, resume_path)
+    if document.structured_data:
+        return document.structured_data, document
+
+    details = await structure_resume_text(document.extracted_text)
+    document.structured_data = details
+    db.commit()
+    return details, document
+
+
+def candidate_from_analysis(
+    resume_url: str,
+    resume_data: Dict[str, Any],
+    match_data: Optional[Dict[str, Any]],
+    job_id: int,
+    company_id: int
+) -> Candidate:
+    """Build a candidate from structured resume data and its job match analysis, if any"""
+    # Split name into first and last name
+    name_parts = resume_data.get("name", "").split(" ", 1)
+    return Candidate(
+        first_name=name_parts[0] if name_parts else "",
+        last_name=name_parts[1] if len(name_parts) > 1 else "",
+        email=resume_data.get("email", ""),
+        phone=resume_data.get("phone", ""),
+        location=resume_data.get("location", ""),
+        linkedin_url=resume_data.get("linkedin", ""),
+        portfolio_url=resume_data.get("portfolio", ""),
+        resume_url=resume_url,
+        resume_text=resume_data.get("resume_text", ""),
+        work_experience=json.dumps(resume_data.get("work_experience", [])),
+        education=json.dumps(resume_data.get("education", [])),
+        skills=json.dumps(resume_data.get("skills", {})),
+        resume_match_score=match_data.get("match_score", 0) if match_data is not None else None,
+        resume_match_feedback=match_data.get("feedback", "") if match_data is not None else None,
+        job_id=job_id,
+        company_id=company_id,
+        status="new",
+        created_at=datetime.utcnow()
+    )
+
+
+def resume_analysis_response(candidate: Candidate, match_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "candidate": {
+            "id": candidate.id,
+            "name": f"{candidate.first_name} {candidate.last_name}",
+            "email": candidate.email,
+            "phone": candidate.phone,
+            "location": candidate.location,
+            "linkedin_url": candidate.linkedin_url,
+            "portfolio_url": candidate.portfolio_url,
+            "resume_url": candidate.resume_url,
+            "work_experience": json.loads(candidate.work_experience),
+            "education": json.loads(candidate.education),
+            "skills": json.loads(candidate.skills),
+            "resume_match_score": candidate.resume_match_score,
+            "resume_match_feedback": candidate.resume_match_feedback,
+            "status": candidate.status,
+            "created_at": candidate.created_at
+        },
+        "match_analysis": {
+            "match_score": match_data.get("match_score", 0),
+            "strengths": match_data.get("strengths", []),
+            "improvements": match_data.get("improvements", []),
+            "feedback": match_data.get("feedback", "")
+        }
+    }
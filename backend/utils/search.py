@@ -0,0 +1,177 @@
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Float, Integer, func, literal_column, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Candidate
+
+# SQLite: external-content FTS5 table mirrored from candidates by triggers
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+        INSERT INTO candidates_fts(rowid, resume_text, skills, work_experience, education)
+        VALUES (new.id, new.resume_text, new.skills, new.work_experience, new.education);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+        INSERT INTO candidates_fts(candidates_fts, rowid, resume_text, skills, work_experience, education)
+        VALUES ('delete', old.id, old.resume_text, old.skills, old.work_experience, old.education);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE ON candidates BEGIN
+        INSERT INTO candidates_fts(candidates_fts, rowid, resume_text, skills, work_experience, education)
+        VALUES ('delete', old.id, old.resume_text, old.skills, old.work_experience, old.education);
+        INSERT INTO candidates_fts(rowid, resume_text, skills, work_experience, education)
+        VALUES (new.id, new.resume_text, new.skills, new.work_experience, new.education);
+    END
+    """,
+]
+
+QUERY_TOKEN_RE = re.compile(r'-?"[^"]*"|\S+')
+WORD_RE = re.compile(r"\w+")
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS5 candidate index of a SQLite database built by create_all, if missing
+
+    Postgres gets its search column and index from migration 5d1f3b8e2c64 only.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as connection:
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates_fts'"
+        )).first()
+        if not exists:
+            connection.execute(text(
+                "CREATE VIRTUAL TABLE candidates_fts USING fts5("
+                "resume_text, skills, work_experience, education, "
+                "content='candidates', content_rowid='id')"
+            ))
+            connection.execute(text("INSERT INTO candidates_fts(candidates_fts) VALUES ('rebuild')"))
+        for statement in SQLITE_SEARCH_DDL:
+            connection.execute(text(statement))
+
+
+def to_fts5_query(query: str) -> str:
+    """Translate web-search style syntax ("exact phrase", OR, -exclude) to an FTS5 MATCH expression
+
+    Every term is quoted so punctuation such as `+` or `.` can never produce
+    an FTS5 syntax error.
+    """
+    positives: List[str] = []
+    negatives: List[str] = []
+    use_or = False
+    for token in QUERY_TOKEN_RE.findall(query):
+        if token == "OR":
+            use_or = bool(positives)
+            continue
+        negate = token.startswith("-") and len(token) > 1
+        words = WORD_RE.findall(token[1:] if negate else token)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        if negate:
+            negatives.append(term)
+        elif use_or:
+            positives[-1] = f"{positives[-1]} OR {term}"
+            use_or = False
+        else:
+            positives.append(term)
+
+    if not positives:
+        return ""
+    expression = " AND ".join(f"({p})" if " OR " in p else p for p in positives)
+    for term in negatives:
+        expression = f"{expression} NOT {term}"
+    return expression
+
+
+def _skill_names(skills: Optional[str]) -> List[str]:
+    """Flatten a stored skills JSON value (list, or dict of lists) to lowercase names"""
+    if not skills:
+        return []
+    try:
+        data = json.loads(skills)
+    except (TypeError, ValueError):
+        return []
+    values = data.values() if isinstance(data, dict) else [data]
+    names = []
+    for value in values:
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str) and item.strip():
+                names.append(item.strip().lower())
+    return names
+
+
+def search_candidates(
+    db: Session,
+    company_id: int,
+    query: str,
+    job_id: Optional[int] = None,
+    status: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    page: int = 1,
+    page_size: int = 20
+) -> Dict[str, Any]:
+    """Ranked full-text search over candidate resumes with skill facets"""
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", query)
+        search_vector = literal_column("candidates.search_vector")
+        score = func.ts_rank_cd(search_vector, ts_query).label("score")
+        base = db.query(Candidate, score).filter(search_vector.op("@@")(ts_query))
+    else:
+        match = to_fts5_query(query)
+        if not match:
+            return {"query": query, "total": 0, "page": page, "page_size": page_size,
+                    "results": [], "facets": {"skills": []}}
+        # bm25 is lower-is-better; skills are weighted above the free text columns
+        matches = text(
+            "SELECT rowid AS candidate_id, bm25(candidates_fts, 1.0, 2.0, 1.0, 0.5) AS rank "
+            "FROM candidates_fts WHERE candidates_fts MATCH :match"
+        ).bindparams(match=match).columns(candidate_id=Integer, rank=Float).subquery()
+        score = (-matches.c.rank).label("score")
+        base = db.query(Candidate, score).join(matches, matches.c.candidate_id == Candidate.id)
+
+    base = base.filter(Candidate.company_id == company_id)
+    if job_id:
+        base = base.filter(Candidate.job_id == job_id)
+    if status:
+        base = base.filter(Candidate.status == status)
+    for skill in skills or []:
+        # Skills are stored as JSON, so a quoted value matches one whole skill
+        base = base.filter(Candidate.skills.icontains(f'"{skill}"', autoescape=True))
+
+    total = base.count()
+    rows = base.order_by(score.desc(), Candidate.id).offset((page - 1) * page_size).limit(page_size).all()
+
+    # Facets are counted over the best-ranked matches, not just the current page
+    skill_counts: Counter = Counter()
+    facet_rows = base.with_entities(Candidate.skills).order_by(score.desc()).limit(settings.SEARCH_FACET_SCAN_LIMIT)
+    for (candidate_skills,) in facet_rows:
+        skill_counts.update(set(_skill_names(candidate_skills)))
+
+    return {
+        "query": query,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "results": [
+            {**{c.name: getattr(candidate, c.name) for c in Candidate.__table__.columns}, "score": float(value or 0)}
+            for candidate, value in rows
+        ],
+        "facets": {
+            "skills": [
+                {"value": name, "count": count}
+                for name, count in skill_counts.most_common(settings.SEARCH_FACET_LIMIT)
+            ]
+        }
+    }
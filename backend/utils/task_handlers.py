@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict
+
+from database import SessionLocal
+from models.models import InterviewQuestion, Job, VideoResponse
+from utils import openai_utils
+from utils.bulk_ingest import ingest_files
+from utils.file_utils import delete_upload_files
+from utils.ranking import shortlist_job_candidates
+from utils.resume_utils import candidate_from_analysis, get_resume_details, resume_analysis_response
+from utils.task_queue import task_handler
+from utils.tts_presynthesis import presynthesize_interview_audio
+from utils.vector_index import index_candidate
+
+
+@task_handler("resume_analysis")
+async def run_resume_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Structure a resume, match it against a job and store the candidate"""
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == payload["job_id"]).first()
+        if not job:
+            raise ValueError("Job not found")
+
+        resume_path = os.path.join(os.getcwd(), payload["resume_url"].lstrip('/'))
+        if not os.path.exists(resume_path):
+            raise ValueError("Resume file not found")
+
+        resume_details, _ = await get_resume_details(db, resume_path)
+        resume_data = json.loads(resume_details)
+        match_analysis = await openai_utils.analyze_resume_match(
+            resume_text=resume_data["resume_text"],
+            job_description=job.description,
+            job_requirements=job.requirements
+        )
+        match_data = json.loads(match_analysis)
+
+        candidate = candidate_from_analysis(
+            payload["resume_url"], resume_data, match_data, job.id, payload["company_id"]
+        )
+        db.add(candidate)
+        db.flush()
+        index_candidate(db, candidate)
+        db.commit()
+        db.refresh(candidate)
+        return resume_analysis_response(candidate, match_data)
+    finally:
+        db.close()
+
+
+@task_handler("job_shortlist")
+async def run_job_shortlist(payload: Dict[str, Any]) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == payload["job_id"]).first()
+        if not job:
+            raise ValueError("Job not found")
+        return await shortlist_job_candidates(db, job, payload.get("top_k"))
+    finally:
+        db.close()
+
+
+@task_handler("video_analysis")
+async def run_video_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze a transcript; stores the feedback when the answer belongs to a stored question"""
+    analysis = await openai_utils.analyze_video_response(
+        question=payload["question"],
+        transcript=payload["transcript"],
+        job_description=payload.get("job_description", "")
+    )
+
+    question_id = payload.get("question_id")
+    if question_id is None:
+        return analysis
+
+    db = SessionLocal()
+    try:
+        question = db.query(InterviewQuestion).filter(InterviewQuestion.id == question_id).first()
+        if not question:
+            raise ValueError("Question not found")
+
+        response = db.query(VideoResponse).filter(VideoResponse.question_id == question_id).first()
+        if not response:
+            response = VideoResponse(
+                interview_id=question.interview_id,
+                question_id=question_id,
+                video_url=payload.get("video_url")
+            )
+            db.add(response)
+        response.transcript = payload["transcript"]
+        response.score = analysis.get("score")
+        response.feedback = analysis.get("formatted_feedback")
+        db.commit()
+        db.refresh(response)
+        return {"response_id": response.id, **analysis}
+    finally:
+        db.close()
+
+
+@task_handler("bulk_ingest")
+async def run_bulk_ingest(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn every resume of a bulk upload into a candidate"""
+    return await ingest_files(payload)
+
+
+@task_handler("upload_cleanup")
+async def run_upload_cleanup(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the files of deleted candidates and video responses"""
+    def cleanup() -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            return delete_upload_files(db, payload["urls"])
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(cleanup)
+
+
+@task_handler("interview_audio")
+async def run_interview_audio(payload: Dict[str, Any]) -> Dict[str, Any]:
+    await presynthesize_interview_audio(payload["interview_id"])
+    return {"interview_id": payload["interview_id"]}
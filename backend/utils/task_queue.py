@@ -0,0 +1,315 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+_handlers: Dict[str, TaskHandler] = {}
+
+
+def _default_session_factory():
+    # Imported lazily so the queue can be used with other engines (e.g. in tests)
+    from database import SessionLocal
+    return SessionLocal
+
+
+def task_handler(kind: str):
+    """Register an async function as the handler for a task kind"""
+    def decorator(func: TaskHandler) -> TaskHandler:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def _new_task(
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int],
+    run_after: Optional[datetime],
+    company_id: Optional[int]
+) -> QueuedTask:
+    return QueuedTask(
+        kind=kind,
+        payload=payload,
+        company_id=company_id,
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+        run_after=run_after or datetime.utcnow()
+    )
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+    company_id: Optional[int] = None
+) -> QueuedTask:
+    """Persist a task for the workers to pick up
+
+    Only `company_id` can read the task back through the status endpoint.
+    """
+    task = _new_task(kind, payload, max_attempts, run_after, company_id)
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+async def enqueue_async(
+    db: AsyncSession,
+    kind: str,
+    payload: Dict[str, Any],
+    max_attempts: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+    company_id: Optional[int] = None
+) -> QueuedTask:
+    """`enqueue` for async sessions"""
+    task = _new_task(kind, payload, max_attempts, run_after, company_id)
+    db.add(task)
+    await db.commit()
+    await db.refresh(task)
+    return task
+
+
+def task_to_dict(task: QueuedTask) -> Dict[str, Any]:
+    return {
+        "id": task.id,
+        "kind": task.kind,
+        "status": task.status,
+        "attempts": task.attempts,
+        "max_attempts": task.max_attempts,
+        "result": task.result,
+        "error": task.error,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "finished_at": task.finished_at
+    }
+
+
+def task_accepted(task: QueuedTask) -> JSONResponse:
+    """202 response pointing the client at the task status endpoint"""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "task_id": task.id,
+            "status": task.status,
+            "status_url": f"/api/tasks/{task.id}"
+        }
+    )
+
+
+def queue_stats(session_factory=None) -> Dict[str, int]:
+    """Number of tasks in each status"""
+    db = (session_factory or _default_session_factory())()
+    try:
+        rows = db.query(QueuedTask.status, func.count(QueuedTask.id)).group_by(QueuedTask.status).all()
+        return {task_status: count for task_status, count in rows}
+    finally:
+        db.close()
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(settings.TASK_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), settings.TASK_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.9, 1.1)
+
+
+def _claim_next(session_factory, worker_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically move the oldest due task to running and return it"""
+    db = session_factory()
+    try:
+        now = datetime.utcnow()
+
+        # Requeue tasks whose worker died without finishing them, unless they
+        # have used up their attempts (e.g. a task that keeps killing its worker)
+        expired = [
+            QueuedTask.status == "running",
+            QueuedTask.locked_at < now - timedelta(seconds=settings.TASK_LEASE_SECONDS)
+        ]
+        db.query(QueuedTask).filter(*expired, QueuedTask.attempts >= QueuedTask.max_attempts).update({
+            "status": "failed",
+            "error": "Worker lease expired on the final attempt",
+            "locked_by": None,
+            "locked_at": None,
+            "finished_at": now
+        }, synchronize_session=False)
+        db.query(QueuedTask).filter(*expired).update(
+            {"status": "queued", "locked_by": None, "locked_at": None}, synchronize_session=False
+        )
+        db.commit()
+
+        # SKIP LOCKED lets concurrent workers on Postgres pass over each other's
+        # candidates; the conditional UPDATE below is what guarantees exclusivity
+        candidate = db.query(QueuedTask.id).filter(
+            QueuedTask.status == "queued",
+            QueuedTask.run_after <= now
+        ).order_by(QueuedTask.run_after, QueuedTask.created_at).with_for_update(skip_locked=True).first()
+        if not candidate:
+            db.commit()
+            return None
+
+        claimed = db.query(QueuedTask).filter(
+            QueuedTask.id == candidate.id,
+            QueuedTask.status == "queued"
+        ).update({
+            "status": "running",
+            "locked_by": worker_id,
+            "locked_at": now,
+            "attempts": QueuedTask.attempts + 1
+        }, synchronize_session=False)
+        db.commit()
+        if not claimed:
+            return None
+
+        task = db.query(QueuedTask).filter(QueuedTask.id == candidate.id).first()
+        return {"id": task.id, "kind": task.kind, "payload": task.payload or {},
+                "attempts": task.attempts, "max_attempts": task.max_attempts}
+    finally:
+        db.close()
+
+
+def _renew_lease(session_factory, task_id: str, worker_id: str) -> bool:
+    db = session_factory()
+    try:
+        renewed = db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.status == "running",
+            QueuedTask.locked_by == worker_id
+        ).update({"locked_at": datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+        return bool(renewed)
+    finally:
+        db.close()
+
+
+def _finish(session_factory, task_id: str, result: Optional[Dict[str, Any]]) -> None:
+    db = session_factory()
+    try:
+        db.query(QueuedTask).filter(QueuedTask.id == task_id).update({
+            "status": "succeeded",
+            "result": result,
+            "error": None,
+            "locked_by": None,
+            "locked_at": None,
+            "finished_at": datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fail(session_factory, task_id: str, attempts: int, max_attempts: int, error: str) -> None:
+    db = session_factory()
+    try:
+        values: Dict[str, Any] = {"error": error, "locked_by": None, "locked_at": None}
+        if attempts < max_attempts:
+            values["status"] = "queued"
+            values["run_after"] = datetime.utcnow() + timedelta(seconds=retry_delay(attempts))
+        else:
+            values["status"] = "failed"
+            values["finished_at"] = datetime.utcnow()
+        db.query(QueuedTask).filter(QueuedTask.id == task_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+class TaskWorker:
+    """Polls the task table and runs due tasks, up to `concurrency` at a time"""
+
+    def __init__(self, concurrency: int = 1, name: Optional[str] = None, session_factory=None):
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._loops = []
+
+    async def run_one(self, worker_id: str) -> bool:
+        """Claim and run a single task; returns False when nothing was due"""
+        if self.session_factory is None:
+            self.session_factory = _default_session_factory()
+        task = await asyncio.to_thread(_claim_next, self.session_factory, worker_id)
+        if task is None:
+            return False
+
+        handler = _handlers.get(task["kind"])
+        if handler is None:
+            await asyncio.to_thread(
+                _fail, self.session_factory, task["id"], task["max_attempts"], task["max_attempts"],
+                f"No handler registered for task kind '{task['kind']}'"
+            )
+            return True
+
+        heartbeat = asyncio.create_task(self._heartbeat(task["id"], worker_id))
+        try:
+            result = await handler(task["payload"])
+        except Exception as e:
+            logger.error(f"Task {task['id']} ({task['kind']}) attempt {task['attempts']} failed: {e}")
+            await asyncio.to_thread(
+                _fail, self.session_factory, task["id"], task["attempts"], task["max_attempts"],
+                f"{e}\n{traceback.format_exc(limit=5)}"
+            )
+        else:
+            await asyncio.to_thread(_finish, self.session_factory, task["id"], jsonable_encoder(result))
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _heartbeat(self, task_id: str, worker_id: str) -> None:
+        """Keep the lease of a running task fresh so long handlers are not run twice"""
+        while True:
+            await asyncio.sleep(settings.TASK_LEASE_SECONDS / 3)
+            try:
+                if not await asyncio.to_thread(_renew_lease, self.session_factory, task_id, worker_id):
+                    logger.warning(f"Task worker {worker_id} lost the lease on task {task_id}")
+                    return
+            except Exception as e:
+                logger.error(f"Task worker {worker_id} could not renew the lease on task {task_id}: {e}")
+
+    async def _loop(self, index: int) -> None:
+        worker_id = f"{self.name}#{index}"
+        while not self._stopping.is_set():
+            try:
+                ran = await self.run_one(worker_id)
+            except Exception as e:
+                logger.error(f"Task worker {worker_id} error: {e}")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=settings.TASK_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        self._loops = [asyncio.create_task(self._loop(i)) for i in range(self.concurrency)]
+        logger.info(f"Task worker {self.name} started with concurrency {self.concurrency}")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._loops:
+            await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+    async def run_forever(self) -> None:
+        self.start()
+        await asyncio.gather(*self._loops)
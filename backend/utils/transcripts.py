@@ -0,0 +1,117 @@
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Candidate, Interview, InterviewQuestion, VideoResponse
+
+STREAM_BATCH_SIZE = 500
+
+
+def _transcript_rows(*criteria):
+    """Questions with their responses for the matching interviews, as one ordered query"""
+    return select(
+        Interview.id.label("interview_id"),
+        Interview.candidate_id,
+        Interview.status,
+        Candidate.first_name,
+        Candidate.last_name,
+        InterviewQuestion.id.label("question_id"),
+        InterviewQuestion.question,
+        InterviewQuestion.order_number,
+        VideoResponse.transcript,
+        VideoResponse.score,
+        VideoResponse.feedback
+    ).outerjoin(
+        Candidate, Candidate.id == Interview.candidate_id
+    ).outerjoin(
+        InterviewQuestion, InterviewQuestion.interview_id == Interview.id
+    ).outerjoin(
+        VideoResponse, VideoResponse.question_id == InterviewQuestion.id
+    ).where(*criteria).order_by(
+        Interview.id, InterviewQuestion.order_number, InterviewQuestion.id, VideoResponse.id
+    ).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+
+def _entry(row) -> Dict[str, Any]:
+    return {
+        "question_id": row.question_id,
+        "question": row.question,
+        "order": row.order_number,
+        "response_text": row.transcript,
+        "score": row.score,
+        "feedback": row.feedback
+    }
+
+
+class _TranscriptBuilder:
+    """Folds ordered transcript rows into per-question entries and per-interview transcripts
+
+    A question with several responses keeps its first one.
+    """
+
+    def __init__(self):
+        self._interview = None
+        self._transcript: List[Dict[str, Any]] = []
+        self._seen_question_ids = set()
+
+    def entries(self, rows: Iterable) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            if row.question_id is None or row.question_id in self._seen_question_ids:
+                continue
+            self._seen_question_ids.add(row.question_id)
+            yield {"interview_id": row.interview_id, **_entry(row)}
+
+    def interviews(self, rows: Iterable) -> Iterator[Dict[str, Any]]:
+        for row in rows:
+            if self._interview is not None and row.interview_id != self._interview.interview_id:
+                yield self._finish()
+            if self._interview is None:
+                self._interview = row
+            if row.question_id is not None and row.question_id not in self._seen_question_ids:
+                self._seen_question_ids.add(row.question_id)
+                self._transcript.append(_entry(row))
+
+    def _finish(self) -> Dict[str, Any]:
+        interview = self._interview
+        item = {
+            "interview_id": interview.interview_id,
+            "candidate_id": interview.candidate_id,
+            "candidate_name": " ".join(part for part in (interview.first_name, interview.last_name) if part),
+            "status": interview.status,
+            "transcript": self._transcript
+        }
+        self._interview = None
+        self._transcript = []
+        self._seen_question_ids = set()
+        return item
+
+    def remaining(self) -> Optional[Dict[str, Any]]:
+        return self._finish() if self._interview is not None else None
+
+
+async def stream_transcript_entries(db: AsyncSession, *criteria) -> AsyncIterator[Dict[str, Any]]:
+    """One entry per question, streamed from the database"""
+    builder = _TranscriptBuilder()
+    result = await db.stream(_transcript_rows(*criteria))
+    async for rows in result.partitions():
+        for entry in builder.entries(rows):
+            yield entry
+
+
+async def stream_interview_transcripts(db: AsyncSession, *criteria) -> AsyncIterator[Dict[str, Any]]:
+    """One complete transcript per interview, streamed from the database"""
+    builder = _TranscriptBuilder()
+    result = await db.stream(_transcript_rows(*criteria))
+    async for rows in result.partitions():
+        for item in builder.interviews(rows):
+            yield item
+    last = builder.remaining()
+    if last is not None:
+        yield last
+
+
+async def to_ndjson_async(items: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for item in items:
+        yield json.dumps(item, default=str) + "\n"
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.models import InterviewQuestion
+from utils import openai_utils
+from utils.tts_cache import tts_cache
+
+logger = logging.getLogger(__name__)
+
+# Opening line of every interview; the frontend fetches it from /api/interviews/greeting
+INTERVIEW_GREETING = (
+    "Hello! I'm Alex, your AI interviewer. Could you please introduce yourself "
+    "and tell me a bit about your background?"
+)
+
+
+def _audio_key(text: str) -> str:
+    return tts_cache.make_key(
+        text,
+        openai_utils.TTS_VOICE,
+        openai_utils.TTS_MODEL,
+        openai_utils.TTS_INSTRUCTIONS
+    )
+
+
+def _interview_texts(db: Session, interview_id: int) -> List[Dict[str, Any]]:
+    questions = db.query(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview_id
+    ).order_by(InterviewQuestion.order_number).all()
+
+    items = [{"question_id": None, "order_number": 0, "type": "greeting", "text": INTERVIEW_GREETING}]
+    for question in questions:
+        items.append({
+            "question_id": question.id,
+            "order_number": question.order_number,
+            "type": question.question_type,
+            "text": question.question
+        })
+    return items
+
+
+async def presynthesize_interview_audio(interview_id: int) -> None:
+    """Synthesize and cache audio for the greeting and every stored question"""
+    db = SessionLocal()
+    try:
+        texts = [item["text"] for item in _interview_texts(db, interview_id) if item["text"]]
+    finally:
+        db.close()
+
+    semaphore = asyncio.Semaphore(settings.TTS_PRESYNTHESIS_CONCURRENCY)
+
+    async def synthesize(text: str) -> bool:
+        if tts_cache.contains(_audio_key(text)):
+            return True
+        async with semaphore:
+            return await openai_utils.text_to_speech(text) is not None
+
+    results = await asyncio.gather(*[synthesize(text) for text in dict.fromkeys(texts)])
+
+    failed = results.count(False)
+    if failed:
+        logger.warning(f"Audio pre-synthesis for interview {interview_id} failed for {failed} item(s)")
+    else:
+        logger.info(f"Audio pre-synthesis for interview {interview_id} complete ({len(texts)} item(s))")
+
+
+def get_interview_audio_status(db: Session, interview_id: int) -> Dict[str, Any]:
+    """Report whether synthesized audio is ready for each item of an interview
+
+    Read from the shared TTS cache, so every API process reports the same.
+    """
+    items = [
+        {
+            "question_id": item["question_id"],
+            "order_number": item["order_number"],
+            "type": item["type"],
+            "audio_status": "ready" if tts_cache.contains(_audio_key(item["text"])) else "pending"
+        }
+        for item in _interview_texts(db, interview_id)
+    ]
+
+    return {
+        "interview_id": interview_id,
+        "ready": all(item["audio_status"] == "ready" for item in items),
+        "items": items
+    }
@@ -0,0 +1,273 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Candidate, Job, TextVector
+from utils.ranking import SparseVector, candidate_text, job_text, pack_rows, score_rows, sparse_hash_vector
+
+logger = logging.getLogger(__name__)
+
+
+def encode_vector(vector: SparseVector) -> bytes:
+    """Stored form: int32 buckets followed by float16 weights"""
+    buckets, weights = vector
+    return buckets.astype("<i4").tobytes() + weights.astype("<f2").tobytes()
+
+
+def decode_vector(data: bytes) -> SparseVector:
+    size = len(data) // 6
+    return np.frombuffer(data, dtype="<i4", count=size), np.frombuffer(data, dtype="<f2", count=size, offset=4 * size)
+
+
+class _CompanyVectors:
+    """One company's vectors, packed into CSR arrays on the first search after a change"""
+
+    def __init__(self):
+        self.rows: Dict[int, SparseVector] = {}
+        self.watermark: Optional[datetime] = None
+        self._packed = None
+
+    def put(self, entity_id: int, vector: SparseVector) -> None:
+        self.rows[entity_id] = vector
+        self._packed = None
+
+    def remove(self, entity_id: int) -> None:
+        if self.rows.pop(entity_id, None) is not None:
+            self._packed = None
+
+    def packed(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if self._packed is None:
+            ids = np.fromiter(self.rows.keys(), dtype=np.int64, count=len(self.rows))
+            self._packed = (ids, *pack_rows(list(self.rows.values())))
+        return self._packed
+
+
+class VectorIndex:
+    """Sparse vectors of one entity type, mirrored per company from the text_vectors table
+
+    A company's vectors are loaded by its first `sync` and kept for the
+    `RANKING_INDEX_MAX_COMPANIES` most recently used companies. Later syncs
+    only read rows updated since the previous one; when the stored row count
+    no longer matches (e.g. another process deleted vectors) the company is
+    reloaded, so deletions are never served from a stale copy.
+    """
+
+    def __init__(self, entity_type: str, dim: Optional[int] = None, max_companies: Optional[int] = None):
+        self.entity_type = entity_type
+        self.dim = dim or settings.RANKING_VECTOR_DIM
+        self.max_companies = max_companies or settings.RANKING_INDEX_MAX_COMPANIES
+        self._companies: "OrderedDict[int, _CompanyVectors]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(company.rows) for company in self._companies.values())
+
+    def _company(self, company_id: int) -> _CompanyVectors:
+        # Caller holds the lock
+        company = self._companies.get(company_id)
+        if company is None:
+            company = self._companies[company_id] = _CompanyVectors()
+            while len(self._companies) > self.max_companies:
+                self._companies.popitem(last=False)
+        self._companies.move_to_end(company_id)
+        return company
+
+    def put(self, entity_id: int, company_id: int, vector: SparseVector) -> None:
+        with self._lock:
+            for other_id, company in self._companies.items():
+                if other_id != company_id:
+                    company.remove(entity_id)
+            self._company(company_id).put(entity_id, vector)
+
+    def remove(self, entity_id: int) -> None:
+        with self._lock:
+            for company in self._companies.values():
+                company.remove(entity_id)
+
+    def _stored(self, db: Session, company_id: int):
+        return db.query(TextVector).filter(
+            TextVector.entity_type == self.entity_type,
+            TextVector.company_id == company_id,
+            TextVector.dim == self.dim
+        )
+
+    def _load(self, db: Session, company_id: int, company: _CompanyVectors) -> None:
+        query = self._stored(db, company_id).with_entities(
+            TextVector.entity_id, TextVector.vector, TextVector.updated_at
+        )
+        if company.watermark is not None:
+            query = query.filter(TextVector.updated_at >= company.watermark)
+        for entity_id, vector, updated_at in query.order_by(TextVector.updated_at).yield_per(500):
+            with self._lock:
+                company.put(entity_id, decode_vector(vector))
+                company.watermark = updated_at
+
+    def sync(self, db: Session, company_id: int) -> None:
+        """Bring a company's vectors up to date with the table, loading them on first use"""
+        with self._lock:
+            company = self._company(company_id)
+        self._load(db, company_id, company)
+
+        stored = self._stored(db, company_id).with_entities(func.count(TextVector.id)).scalar()
+        if stored != len(company.rows):
+            company = _CompanyVectors()
+            self._load(db, company_id, company)
+            with self._lock:
+                self._companies[company_id] = company
+                self._companies.move_to_end(company_id)
+
+    def search(
+        self,
+        company_id: int,
+        query_vector: SparseVector,
+        k: Optional[int] = None,
+        entity_ids: Optional[Iterable[int]] = None,
+        exclude_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Top-k (entity_id, similarity) pairs among a company's vectors"""
+        with self._lock:
+            company = self._companies.get(company_id)
+            if company is None:
+                return []
+            ids, indptr, buckets, weights = company.packed()
+
+        mask = np.ones(len(ids), dtype=bool)
+        if entity_ids is not None:
+            mask &= np.isin(ids, np.fromiter(entity_ids, dtype=np.int64))
+        if exclude_id is not None:
+            mask &= ids != exclude_id
+        if not mask.all():
+            # Keep only the selected rows, so IDF is computed over the scored pool
+            rows = np.flatnonzero(mask)
+            starts, lengths = indptr[rows], np.diff(indptr)[rows]
+            ids, indptr = ids[rows], np.concatenate(([0], np.cumsum(lengths)))
+            positions = np.arange(indptr[-1]) + np.repeat(starts - indptr[:-1], lengths)
+            buckets, weights = buckets[positions], weights[positions]
+
+        scores = score_rows(indptr, buckets, weights, query_vector, self.dim)
+        if k is not None and k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+candidate_index = VectorIndex("candidate")
+job_index = VectorIndex("job")
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _upsert(db: Session, index: VectorIndex, entity_id: int, company_id: int, text: str) -> SparseVector:
+    """Store an entity's vector unless its text is unchanged; the caller commits"""
+    text_hash = _text_hash(text)
+    row = db.query(TextVector).filter(
+        TextVector.entity_type == index.entity_type,
+        TextVector.entity_id == entity_id
+    ).first()
+
+    if row and row.text_hash == text_hash and row.dim == index.dim and row.company_id == company_id:
+        vector = decode_vector(row.vector)
+    else:
+        vector = sparse_hash_vector(text, index.dim)
+        if row is None:
+            row = TextVector(entity_type=index.entity_type, entity_id=entity_id)
+            db.add(row)
+        row.company_id = company_id
+        row.text_hash = text_hash
+        row.dim = index.dim
+        row.vector = encode_vector(vector)
+        row.updated_at = datetime.utcnow()
+
+    index.put(entity_id, company_id, vector)
+    return vector
+
+
+def index_candidate(db: Session, candidate: Candidate) -> SparseVector:
+    """Store a candidate's vector in the caller's transaction; the caller commits"""
+    return _upsert(db, candidate_index, candidate.id, candidate.company_id, candidate_text(candidate))
+
+
+def index_job(db: Session, job: Job) -> SparseVector:
+    """Store a job's vector in the caller's transaction; the caller commits"""
+    return _upsert(db, job_index, job.id, job.company_id, job_text(job))
+
+
+def remove_vectors(db: Session, entity_type: str, entity_ids: List[int]) -> None:
+    """Drop stored vectors; part of the caller's transaction"""
+    if not entity_ids:
+        return
+    db.query(TextVector).filter(
+        TextVector.entity_type == entity_type,
+        TextVector.entity_id.in_(entity_ids)
+    ).delete(synchronize_session=False)
+    index = candidate_index if entity_type == "candidate" else job_index
+    for entity_id in entity_ids:
+        index.remove(entity_id)
+
+
+def _backfill(db: Session, index: VectorIndex, model, text_fn: Callable, company_id: int) -> None:
+    """Index a company's entities that have no vector yet (e.g. created by bulk ingestion)
+
+    Vectors are derived data, so they are written in a session of their own
+    instead of committing the caller's, which may be serving a read.
+    """
+    missing = db.query(model).outerjoin(TextVector, and_(
+        TextVector.entity_type == index.entity_type,
+        TextVector.entity_id == model.id,
+        TextVector.dim == index.dim
+    )).filter(
+        model.company_id == company_id,
+        TextVector.id.is_(None)
+    ).all()
+    if not missing:
+        return
+    with Session(bind=db.get_bind()) as vector_db:
+        for entity in missing:
+            _upsert(vector_db, index, entity.id, entity.company_id, text_fn(entity))
+        vector_db.commit()
+    logger.info(f"Indexed {len(missing)} {index.entity_type} vector(s) for company {company_id}")
+
+
+def best_candidates_for_job(
+    db: Session,
+    job: Job,
+    k: Optional[int] = None,
+    applicants_only: bool = False
+) -> List[Tuple[Candidate, float]]:
+    """The company's candidates most similar to a job, scored 0-100"""
+    candidate_index.sync(db, job.company_id)
+    _backfill(db, candidate_index, Candidate, candidate_text, job.company_id)
+    query_vector = sparse_hash_vector(job_text(job), candidate_index.dim)
+
+    entity_ids = None
+    if applicants_only:
+        entity_ids = [candidate_id for (candidate_id,) in db.query(Candidate.id).filter(Candidate.job_id == job.id)]
+    hits = candidate_index.search(job.company_id, query_vector, k, entity_ids=entity_ids)
+
+    candidates = {
+        c.id: c for c in db.query(Candidate).filter(Candidate.id.in_([entity_id for entity_id, _ in hits]))
+    }
+    return [(candidates[entity_id], round(score * 100, 1)) for entity_id, score in hits if entity_id in candidates]
+
+
+def best_jobs_for_candidate(db: Session, candidate: Candidate, k: Optional[int] = None) -> List[Tuple[Job, float]]:
+    """The company's jobs most similar to a candidate's resume, scored 0-100"""
+    job_index.sync(db, candidate.company_id)
+    _backfill(db, job_index, Job, job_text, candidate.company_id)
+    query_vector = sparse_hash_vector(candidate_text(candidate), job_index.dim)
+
+    hits = job_index.search(candidate.company_id, query_vector, k)
+    jobs = {j.id: j for j in db.query(Job).filter(Job.id.in_([entity_id for entity_id, _ in hits]))}
+    return [(jobs[entity_id], round(score * 100, 1)) for entity_id, score in hits if entity_id in jobs]
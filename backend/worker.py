@@ -0,0 +1,41 @@
+"""Dedicated task queue worker
+
+Runs queued AI work (resume and video analysis, question generation, speech
+synthesis) outside the API process. Start as many of these as needed:
+
+    python worker.py
+
+and set TASK_QUEUE_INPROCESS_WORKERS=0 for the API so it only enqueues.
+"""
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import settings
+from utils import llm_gateway
+from utils.pdf_utils import shutdown_executor
+from utils.task_queue import TaskWorker
+import utils.task_handlers  # registers task handlers
+import utils.job_stats  # keeps job stats current for candidates created by tasks
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def main():
+    worker = TaskWorker(concurrency=settings.TASK_WORKER_CONCURRENCY)
+    try:
+        await worker.run_forever()
+    finally:
+        await worker.stop()
+        await llm_gateway.close_client()
+        shutdown_executor()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
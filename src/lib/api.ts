@@ -240,6 +240,10 @@ export const interviewAPI = {
     return response.data;
   },
   getByAccessCode: (accessCode: string) => api.get(`/interviews/by-access-code/${accessCode}`),
+  getGreeting: async () => {
+    const response = await api.get('/interviews/greeting');
+    return response.data.text as string;
+  },
 };
 
 export const videoAPI = {
@@ -253,6 +257,66 @@ export const videoAPI = {
     });
     return response.data;
   },
+
+  // Resumable upload of a candidate's answer: sends the video in checksummed
+  // chunks and, after a dropped connection or a page reload, continues from
+  // the server's offset. Candidates authenticate with their access code.
+  uploadResumable: async (
+    file: Blob,
+    accessCode: string,
+    onProgress?: (sent: number, total: number) => void
+  ) => {
+    const headers = { 'Interview-Access-Code': accessCode };
+    // Only files can be picked again after a reload; recorded blobs resume in-page
+    const storageKey = file instanceof File
+      ? `video-upload:${accessCode}:${file.size}:${file.name}:${file.lastModified}`
+      : null;
+    let upload = null;
+    const storedId = storageKey && localStorage.getItem(storageKey);
+    if (storedId) {
+      try {
+        upload = (await api.get(`/videos/uploads/${storedId}`, { headers })).data;
+      } catch {
+        localStorage.removeItem(storageKey);
+      }
+    }
+    if (!upload) {
+      upload = (await api.post('/videos/uploads', {
+        length: file.size,
+        filename: file instanceof File ? file.name : 'answer.webm',
+      }, { headers })).data;
+      if (storageKey) localStorage.setItem(storageKey, upload.upload_id);
+    }
+
+    let offset = upload.offset;
+    let failures = 0;
+    while (offset < file.size) {
+      const chunk = await file.slice(offset, offset + upload.chunk_size).arrayBuffer();
+      const digest = await crypto.subtle.digest('SHA-256', chunk);
+      const checksum = btoa(String.fromCharCode(...new Uint8Array(digest)));
+      try {
+        await api.patch(`/videos/uploads/${upload.upload_id}`, chunk, {
+          headers: {
+            ...headers,
+            'Content-Type': 'application/offset+octet-stream',
+            'Upload-Offset': String(offset),
+            'Upload-Checksum': `sha256 ${checksum}`,
+          },
+        });
+        offset += chunk.byteLength;
+        failures = 0;
+        onProgress?.(offset, file.size);
+      } catch (error) {
+        if (++failures > 5) throw error;
+        await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** failures));
+        offset = (await api.get(`/videos/uploads/${upload.upload_id}`, { headers })).data.offset;
+      }
+    }
+
+    const response = await api.post(`/videos/uploads/${upload.upload_id}/finalize`, null, { headers });
+    if (storageKey) localStorage.removeItem(storageKey);
+    return response.data;
+  },
 };
 
 // Interview API
@@ -369,6 +433,8 @@ export const publicInterviewApi = {
     api.patch(`/interviews/public/${jobId}/${linkId}`, { is_active: isActive }),
   getByAccessCode: (accessCode: string) =>
     api.get(`/interviews/public/access/${accessCode}`),
+  recordStarted: (accessCode: string) =>
+    api.post(`/interviews/public/access/${accessCode}/started`),
   getJobDetails: (jobId: number) =>
     api.get(`/jobs/${jobId}`)
 };
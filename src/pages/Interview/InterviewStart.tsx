@@ -36,6 +36,18 @@ const InterviewStart = () => {
           return;
         }
         
+        // Count the start once per browser session, not on every reload
+        const startedKey = `interview-started:${accessCode}`;
+        if (!sessionStorage.getItem(startedKey)) {
+          try {
+            await publicInterviewApi.recordStarted(accessCode);
+            sessionStorage.setItem(startedKey, "1");
+          } catch (err) {
+            // Analytics only; never keep the candidate from starting
+            console.error("Error recording interview start:", err);
+          }
+        }
+        
         // If everything is valid, navigate to the compatibility check
         navigate(`/interview/${accessCode}/compatibility`);
       } catch (err) {
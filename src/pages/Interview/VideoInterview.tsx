@@ -33,7 +33,7 @@ import { toast } from "sonner";
 import AIAvatar from "../../components/interview/AIAvatar";
 import RecordingButton from "../../components/interview/RecordingButton";
 import { useInterviewResponseProcessor } from "../../components/interview/InterviewResponseProcessor";
-import api from "@/lib/api";
+import api, { interviewAPI, videoAPI } from "@/lib/api";
 import axios from "axios";
 
 interface VideoInterviewProps {
@@ -76,7 +76,7 @@ export default function VideoInterview({
   const [isRecording, setIsRecording] = useState(false);
   const [recordingTime, setRecordingTime] = useState(0);
   const [recordedVideos, setRecordedVideos] = useState<
-    { questionId: string; blob: Blob }[]
+    { questionId: string; blob: Blob; videoUrl?: string }[]
   >([]);
   const [isProcessingResponse, setIsProcessingResponse] = useState(false);
   const [hasRecordedCurrentQuestion, setHasRecordedCurrentQuestion] =
@@ -202,6 +202,7 @@ export default function VideoInterview({
                 blob: videoBlob,
               },
             ]);
+            uploadAnswerVideo(videoBlob);
             
             transcribeVideo(videoBlob)
               .then((transcript) => {
@@ -361,6 +362,21 @@ export default function VideoInterview({
     }
   };
 
+  // Resumable, so a dropped connection or a reload does not lose the answer
+  const uploadAnswerVideo = async (videoBlob: Blob) => {
+    try {
+      const upload = await videoAPI.uploadResumable(videoBlob, accessCode!);
+      setRecordedVideos((prev) =>
+        prev.map((video) =>
+          video.blob === videoBlob ? { ...video, videoUrl: upload.video_url } : video
+        )
+      );
+    } catch (error) {
+      console.error("Error uploading video:", error);
+      toast.error("Failed to upload your answer video");
+    }
+  };
+
   const transcribeVideo = async (videoBlob: Blob): Promise<string | null> => {
     try {
       setIsProcessingResponse(true);
@@ -586,15 +602,19 @@ export default function VideoInterview({
     setIsPreparing(true);
 
     try {
-      // Generate all questions during preparation
-      const questions = await generateQuestion({
-        jobDescription,
-        resumeText,
-        questionTypes: ["behavioral", "resume", "job"],
-        maxQuestions: 8,
-        interviewId,
-        conversationHistory: [],
-      });
+      // Generate all questions during preparation; the greeting comes from
+      // the backend, which pre-synthesizes its audio
+      const [greeting, questions] = await Promise.all([
+        interviewAPI.getGreeting(),
+        generateQuestion({
+          jobDescription,
+          resumeText,
+          questionTypes: ["behavioral", "resume", "job"],
+          maxQuestions: 8,
+          interviewId,
+          conversationHistory: [],
+        }),
+      ]);
 
       // Handle both single question and array responses
       const questionArray = Array.isArray(questions)
@@ -607,11 +627,7 @@ export default function VideoInterview({
 
       // Set up the interview flow with proper question types
       const interviewFlow = [
-        {
-          type: "greeting",
-          question:
-            "Hello! I'm Alex, your AI interviewer. Could you please introduce yourself and tell me a bit about your background?",
-        },
+        { type: "greeting", question: greeting },
         { type: "behavioral", question: questionArray[0] },
         { type: "behavioral", question: questionArray[1] },
         { type: "resume", question: questionArray[2] },
@@ -715,6 +731,7 @@ export default function VideoInterview({
               blob: videoBlob,
             },
           ]);
+          uploadAnswerVideo(videoBlob);
           
           transcribeVideo(videoBlob)
             .then((transcript) => {